@@ -4,6 +4,7 @@ from airport.models import (
     Crew,
     Airport,
     Route,
+    RouteAvailability,
     Flight,
     AirplaneType,
     Airplane,
@@ -15,3 +16,4 @@ admin.site.register(Airplane)
 admin.site.register(Airport)
 admin.site.register(Route)
 admin.site.register(Flight)
+admin.site.register(RouteAvailability)
@@ -0,0 +1,220 @@
+"""Async-native read endpoints for ASGI deployments.
+
+DRF views are synchronous, so under ASGI every request to the viewsets
+occupies a worker thread until the response is sent. These plain Django
+``async def`` views serve the same read-only data with the async ORM, so
+one event loop can keep many slow clients waiting on I/O at once. They
+mirror the output, filters and throttling of the matching viewset actions,
+but use a simpler forward-only cursor and skip the response cache.
+"""
+import base64
+import binascii
+import json
+import math
+from datetime import datetime
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db.models import Q, prefetch_related_objects
+from django.http import HttpRequest, JsonResponse
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
+
+from airport.models import Airport, Flight, Route
+from airport.replicas import pinned_to_primary, use_replica
+from airport.serializers import (
+    AirportSerializer,
+    FlightDetailSerializer,
+    FlightListSerializer,
+    RouteListSerializer,
+)
+from airport.views import AirportViewSet, FlightViewSet, RouteViewSet
+from user.authentication import StatelessJWTAuthentication
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+_jwt = StatelessJWTAuthentication()
+
+
+def _error(detail, status: int) -> JsonResponse:
+    response = JsonResponse(
+        {"detail": detail} if isinstance(detail, str) else detail,
+        status=status,
+        safe=False,
+    )
+    if status == 401:
+        response["WWW-Authenticate"] = _jwt.authenticate_header(None)
+    return response
+
+
+async def _authenticate(request: HttpRequest):
+    """Return the active user of the JWT of the request, or None"""
+    header = _jwt.get_header(request)
+    raw_token = header and _jwt.get_raw_token(header)
+    if not raw_token:
+        return None
+    token = _jwt.get_validated_token(raw_token)
+    # Usually answered from the token and the token version cache
+    return await sync_to_async(_jwt.get_user)(token)
+
+
+class ThrottledAction:
+    """Stands in for a viewset action to the throttles"""
+
+    def __init__(self, viewset, action: str, request: HttpRequest) -> None:
+        self.throttle_scope = viewset.throttle_scope
+        self.action = action
+        self.request = request
+
+
+def _throttle_wait(request: HttpRequest, viewset, action: str) -> float | None:
+    """Seconds to wait when a throttle of the viewset denies the request"""
+    view = ThrottledAction(viewset, action, request)
+    waits = [
+        throttle.wait()
+        for throttle in (cls() for cls in viewset.throttle_classes)
+        if not throttle.allow_request(request, view)
+    ]
+    if waits:
+        return max(wait or 0 for wait in waits)
+    return None
+
+
+def authenticated_read(viewset, action: str):
+    """Allow GET requests of authenticated users, throttled as the viewset"""
+
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request: HttpRequest, *args, **kwargs) -> JsonResponse:
+            if request.method != "GET":
+                return _error(f'Method "{request.method}" not allowed.', 405)
+            try:
+                user = await _authenticate(request)
+            except AuthenticationFailed as error:
+                return _error(error.detail, 401)
+            if user is None:
+                return _error("Authentication credentials were not provided.", 401)
+            request.user = user
+            wait = await sync_to_async(_throttle_wait)(request, viewset, action)
+            if wait is not None:
+                response = _error("Request was throttled.", 429)
+                response["Retry-After"] = str(math.ceil(wait))
+                return response
+            return await _read(view, request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+async def _read(view, request: HttpRequest, *args, **kwargs) -> JsonResponse:
+    if not await sync_to_async(pinned_to_primary)(request.user):
+        use_replica()
+    try:
+        return await view(request, *args, **kwargs)
+    except ValidationError as error:
+        return _error(error.detail, 400)
+
+
+def _page_size(request: HttpRequest) -> int:
+    try:
+        size = int(request.GET.get("page_size", PAGE_SIZE))
+    except ValueError:
+        return PAGE_SIZE
+    return min(max(size, 1), MAX_PAGE_SIZE)
+
+
+def _decode_cursor(request: HttpRequest) -> list | None:
+    cursor = request.GET.get("cursor")
+    if not cursor:
+        return None
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError):
+        raise ValidationError({"cursor": "Invalid cursor."})
+
+
+def _next_url(request: HttpRequest, position: list) -> str:
+    params = request.GET.copy()
+    params["cursor"] = base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+    return request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+
+
+async def _page(request: HttpRequest, queryset, serializer_class, position) -> dict:
+    """Fetch one page in queryset order, reading one extra row to find the next"""
+    size = _page_size(request)
+    rows = [row async for row in queryset[:size + 1].aiterator()]
+    more = len(rows) > size
+    rows = rows[:size]
+    return {
+        "next": _next_url(request, position(rows[-1])) if more else None,
+        "previous": None,
+        "results": serializer_class(rows, many=True).data,
+    }
+
+
+@authenticated_read(FlightViewSet, "list")
+async def flight_list(request: HttpRequest) -> JsonResponse:
+    params = request.GET
+    queryset = FlightViewSet.queryset.order_by("departure_time", "id")
+
+    for side in ("source", "destination"):
+        name, city = params.get(f"{side}_airport"), params.get(f"{side}_city")
+        if name or city:
+            airport_ids = [
+                pk async for pk in FlightViewSet._airports_matching(name, city).aiterator()
+            ]
+            queryset = queryset.filter(**{f"route__{side}_id__in": airport_ids})
+    queryset = queryset.filter(*FlightViewSet._departure_filters(params))
+
+    cursor = _decode_cursor(request)
+    if cursor:
+        try:
+            departure, pk = datetime.fromisoformat(cursor[0]), int(cursor[1])
+        except (IndexError, TypeError, ValueError):
+            raise ValidationError({"cursor": "Invalid cursor."})
+        queryset = queryset.filter(
+            Q(departure_time__gt=departure) | Q(departure_time=departure, id__gt=pk)
+        )
+
+    page = await _page(
+        request,
+        queryset,
+        FlightListSerializer,
+        lambda flight: [flight.departure_time.isoformat(), flight.pk],
+    )
+    if params.get("with_count"):
+        page["count"] = await queryset.acount()
+    return JsonResponse(page)
+
+
+@authenticated_read(FlightViewSet, "retrieve")
+async def flight_detail(request: HttpRequest, pk: int) -> JsonResponse:
+    try:
+        flight = await FlightViewSet.queryset.select_related(
+            "airplane__airplane_type"
+        ).aget(pk=pk)
+    except Flight.DoesNotExist:
+        return _error("Not found.", 404)
+    await sync_to_async(prefetch_related_objects)([flight], "crew")
+    return JsonResponse(FlightDetailSerializer(flight).data)
+
+
+@authenticated_read(RouteViewSet, "list")
+async def route_list(request: HttpRequest) -> JsonResponse:
+    queryset = Route.objects.select_related("source", "destination").order_by("id")
+    cursor = _decode_cursor(request)
+    if cursor:
+        try:
+            queryset = queryset.filter(id__gt=int(cursor[0]))
+        except (IndexError, TypeError, ValueError):
+            raise ValidationError({"cursor": "Invalid cursor."})
+    return JsonResponse(
+        await _page(request, queryset, RouteListSerializer, lambda route: [route.pk])
+    )
+
+
+@authenticated_read(AirportViewSet, "list")
+async def airport_list(request: HttpRequest) -> JsonResponse:
+    airports = [airport async for airport in Airport.objects.order_by("id").aiterator()]
+    return JsonResponse(AirportSerializer(airports, many=True).data, safe=False)
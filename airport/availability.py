@@ -0,0 +1,137 @@
+"""Per route and departure day seat summary kept in ``RouteAvailability``.
+
+Seat sales adjust the ``sold`` counter in place; flight, airplane and
+seat map rebuilds recompute the affected (route, day) rows from
+``Flight`` joined with the seat maps of the orders app.
+"""
+import threading
+from datetime import date, datetime, timedelta
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Count, F, Q, QuerySet, Sum
+from django.db.models.functions import Coalesce, TruncDate
+
+from airport.models import Flight, RouteAvailability
+
+REFRESH_BATCH_SIZE = 500
+
+_departure_field = Flight._meta.get_field("departure_time")
+_dirty = threading.local()
+
+
+def day_key(flight) -> tuple[int, date]:
+    """(route id, departure date) of a flight, also before it is reloaded"""
+    departure = _departure_field.to_python(flight.departure_time)
+    return flight.route_id, departure.date()
+
+
+def _summaries(flights: QuerySet) -> QuerySet:
+    return (
+        flights.order_by()
+        .annotate(date=TruncDate("departure_time"))
+        .values("route_id", "date")
+        .annotate(
+            flights=Count("id"),
+            capacity=Sum(F("airplane__rows") * F("airplane__seats_in_row")),
+            sold=Sum(Coalesce(F("seat_map__sold"), 0)),
+        )
+    )
+
+
+def _store(summaries: Iterable[dict]) -> list[tuple[int, date]]:
+    rows = [RouteAvailability(**summary) for summary in summaries]
+    RouteAvailability.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["route", "date"],
+        update_fields=["flights", "capacity", "sold"],
+    )
+    return [(row.route_id, row.date) for row in rows]
+
+
+def refresh_availability(keys: Iterable[tuple[int, date]]) -> None:
+    """Recompute the summary rows of the given (route id, date) keys"""
+    keys = list(set(keys))
+    for start in range(0, len(keys), REFRESH_BATCH_SIZE):
+        batch = keys[start:start + REFRESH_BATCH_SIZE]
+        days = Q()
+        for route_id, day in batch:
+            start_of_day = datetime.combine(day, datetime.min.time())
+            days |= Q(
+                route_id=route_id,
+                departure_time__gte=start_of_day,
+                departure_time__lt=start_of_day + timedelta(days=1),
+            )
+        with transaction.atomic():
+            found = set(_store(_summaries(Flight.objects.filter(days))))
+            empty = Q()
+            for route_id, day in batch:
+                if (route_id, day) not in found:
+                    empty |= Q(route_id=route_id, date=day)
+            if empty:
+                RouteAvailability.objects.filter(empty).delete()
+
+
+def refresh_flights(flights: QuerySet) -> None:
+    """Recompute the summary rows of the days the flights depart on"""
+    refresh_availability(
+        flights.order_by()
+        .annotate(date=TruncDate("departure_time"))
+        .values_list("route_id", "date")
+        .distinct()
+    )
+
+
+def _flush_dirty() -> None:
+    keys = getattr(_dirty, "keys", None)
+    if keys:
+        _dirty.keys = set()
+        refresh_availability(keys)
+
+
+def schedule_refresh(keys: Iterable[tuple[int, date]]) -> None:
+    """Recompute the keys once, when the current transaction commits.
+
+    Keys are collected per thread, so deleting or saving many flights in
+    one transaction refreshes each day once. Keys left behind by a
+    rollback are refreshed with the next commit.
+    """
+    if not hasattr(_dirty, "keys"):
+        _dirty.keys = set()
+    _dirty.keys.update(keys)
+    transaction.on_commit(_flush_dirty)
+
+
+def adjust_sold(flight, delta: int) -> None:
+    """Add ``delta`` sold seats to the day summary of the flight"""
+    route_id, day = day_key(flight)
+    updated = RouteAvailability.objects.filter(route_id=route_id, date=day).update(
+        sold=F("sold") + delta
+    )
+    if not updated:
+        refresh_availability([(route_id, day)])
+
+
+@transaction.atomic
+def rebuild_availability(
+    routes: Iterable[int] | None = None, batch_size: int = 2000
+) -> int:
+    """Recreate all summary rows, or those of some routes, from flights"""
+    flights = Flight.objects.all()
+    existing = RouteAvailability.objects.all()
+    if routes is not None:
+        flights = flights.filter(route_id__in=routes)
+        existing = existing.filter(route_id__in=routes)
+    existing.delete()
+
+    stored = 0
+    batch = []
+    for summary in _summaries(flights).iterator(chunk_size=batch_size):
+        batch.append(summary)
+        if len(batch) == batch_size:
+            stored += len(_store(batch))
+            batch = []
+    if batch:
+        stored += len(_store(batch))
+    return stored
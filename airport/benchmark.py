@@ -0,0 +1,186 @@
+"""Data generation and timing helpers shared by the benchmark commands.
+
+Generated rows are named with the ``bench-`` prefix so that
+``delete_benchmark_data`` can remove them again without touching real
+data. Run benchmarks against a dedicated database.
+"""
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from airport.models import Airplane, AirplaneType, Airport, Flight, Route
+from airport.views import AirportViewSet, FlightViewSet, RouteViewSet
+from orders.models import Order, SeatMap, Ticket
+
+PREFIX = "bench-"
+
+
+def generate_flights(
+    count: int,
+    airports: int = 100,
+    routes: int = 500,
+    start: datetime = datetime(2024, 1, 1),
+    days: int = 365,
+    batch_size: int = 10_000,
+    seed: int = 0,
+) -> list[int]:
+    """Create a synthetic network with `count` flights, returning route ids"""
+    rng = random.Random(seed)
+    with transaction.atomic():
+        airplane_type = AirplaneType.objects.create(name=f"{PREFIX}type")
+        airplanes = Airplane.objects.bulk_create(
+            Airplane(
+                name=f"{PREFIX}airplane-{index}",
+                rows=rng.randint(20, 60),
+                seats_in_row=rng.choice((4, 6, 9)),
+                airplane_type=airplane_type,
+            )
+            for index in range(20)
+        )
+        airport_objs = Airport.objects.bulk_create(
+            Airport(
+                name=f"{PREFIX}airport-{index}",
+                closest_big_city=f"{PREFIX}city-{index % max(airports // 3, 1)}",
+            )
+            for index in range(airports)
+        )
+        pairs = set()
+        while len(pairs) < min(routes, airports * (airports - 1)):
+            source, destination = rng.sample(airport_objs, 2)
+            pairs.add((source, destination))
+        route_objs = Route.objects.bulk_create(
+            Route(source=source, destination=destination, distance=rng.randint(200, 9000))
+            for source, destination in pairs
+        )
+
+    seconds = days * 24 * 3600
+    created = 0
+    while created < count:
+        batch = []
+        for _ in range(min(batch_size, count - created)):
+            departure = start + timedelta(seconds=rng.randrange(seconds))
+            batch.append(
+                Flight(
+                    route=rng.choice(route_objs),
+                    airplane=rng.choice(airplanes),
+                    departure_time=departure,
+                    arrival_time=departure + timedelta(minutes=rng.randint(40, 900)),
+                )
+            )
+        Flight.objects.bulk_create(batch)
+        created += len(batch)
+    return [route.pk for route in route_objs]
+
+
+def generate_tickets(
+    count: int,
+    users: int = 100,
+    tickets_per_order: int = 3,
+    batch_size: int = 10_000,
+    seed: int = 0,
+) -> list[int]:
+    """Create flights sold to `count` tickets in all, returning user ids.
+
+    Every flight sells between 20 and 60 seats, front rows first, in
+    orders of `tickets_per_order` tickets spread over `users` users.
+    Seat maps and route availability are rebuilt afterwards.
+    """
+    rng = random.Random(seed)
+    generate_flights(count // 30 + 100, seed=seed)
+    user_ids = [
+        get_user_model().objects.create_user(email=f"{PREFIX}user-{index}@example.com").pk
+        for index in range(users)
+    ]
+    flights = (
+        Flight.objects.filter(airplane__name__startswith=PREFIX)
+        .order_by("pk")
+        .values_list("pk", "airplane__rows", "airplane__seats_in_row")
+    )
+
+    def create(seats: list[tuple[int, int, int]]) -> None:
+        orders = Order.objects.bulk_create(
+            Order(user_id=rng.choice(user_ids))
+            for _ in range(0, len(seats), tickets_per_order)
+        )
+        Ticket.objects.bulk_create(
+            Ticket(
+                flight_id=flight_id,
+                row=row,
+                seat=seat,
+                order=orders[index // tickets_per_order],
+            )
+            for index, (flight_id, row, seat) in enumerate(seats)
+        )
+
+    created = 0
+    batch = []
+    for flight_id, rows, seats_in_row in flights.iterator(chunk_size=batch_size):
+        if created >= count:
+            break
+        sold = min(rng.randint(20, 60), rows * seats_in_row, count - created)
+        batch.extend(
+            (flight_id, index // seats_in_row + 1, index % seats_in_row + 1)
+            for index in range(sold)
+        )
+        created += sold
+        if len(batch) >= batch_size:
+            create(batch)
+            batch = []
+    if batch:
+        create(batch)
+
+    SeatMap.objects.rebuild(
+        Flight.objects.filter(airplane__name__startswith=PREFIX), batch_size=1000
+    )
+    return user_ids
+
+
+def delete_benchmark_data() -> None:
+    """Remove everything created by the generators of this module"""
+    # Signals of tickets would only free seats of flights deleted below
+    tickets = Ticket.objects.filter(flight__airplane__name__startswith=PREFIX)
+    tickets._raw_delete(tickets.db)
+    with transaction.atomic():
+        Order.objects.filter(user__email__startswith=PREFIX).delete()
+        get_user_model().objects.filter(email__startswith=PREFIX).delete()
+        Flight.objects.filter(airplane__name__startswith=PREFIX).delete()
+        Route.objects.filter(source__name__startswith=PREFIX).delete()
+        Airport.objects.filter(name__startswith=PREFIX).delete()
+        AirplaneType.objects.filter(name__startswith=PREFIX).delete()
+
+
+def measure(func, repeat: int = 10, warmup: int = 1) -> dict[str, float]:
+    """Call func repeatedly and return latency statistics in milliseconds"""
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "min_ms": timings[0],
+        "p50_ms": statistics.median(timings),
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        "p99_ms": timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+        "max_ms": timings[-1],
+    }
+
+
+@contextmanager
+def without_throttling(viewsets=(AirportViewSet, FlightViewSet, RouteViewSet)):
+    """Let the viewsets answer any number of benchmark requests"""
+    saved = [viewset.throttle_classes for viewset in viewsets]
+    for viewset in viewsets:
+        viewset.throttle_classes = ()
+    try:
+        yield
+    finally:
+        for viewset, throttle_classes in zip(viewsets, saved):
+            viewset.throttle_classes = throttle_classes
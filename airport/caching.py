@@ -0,0 +1,289 @@
+"""Versioned response cache for the read endpoints of the airport app.
+
+Every cacheable viewset declares the entities its output depends on.
+Saving or deleting any of them bumps a version counter, and the counters
+are part of the cache key, so stale entries are simply never read again
+and age out of the backend.
+
+The backend is chosen with ``settings.AIRPORT_RESPONSE_CACHE``:
+``DjangoCacheBackend`` stores entries and versions in a Django cache, by
+default the ``"shared"`` one, so that all worker processes, and with a
+networked cache all nodes, see every bump. ``LocMemLRUBackend`` keeps a
+size-capped LRU in the process. Writes handled by other processes do not
+bump its counters, so its entries and versions expire after ``timeout``
+seconds, which bounds how long other processes serve stale responses.
+
+The same key doubles as a strong ETag and the newest version timestamp
+as Last-Modified, so conditional GETs are answered with 304 before any
+database query runs.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.utils.module_loading import import_string
+from rest_framework.response import Response
+
+from airport.replicas import read_from_replica
+
+ENTITIES = (
+    "airplane_type",
+    "airplane",
+    "airport",
+    "crew",
+    "route",
+    "flight",
+    "ticket",
+)
+
+
+class LocMemLRUBackend:
+    """Process-local LRU of responses with expiring in-process versions"""
+
+    def __init__(self, max_entries: int = 1024, timeout: float = 5) -> None:
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def versions(self, entities) -> dict[str, tuple[int, float]]:
+        now = time.monotonic()
+        with self._lock:
+            versions = {}
+            for entity in entities:
+                version = self._versions.get(entity)
+                if version is None or version[2] <= now:
+                    # Also expired, so that validators of writes in other
+                    # processes change within the timeout
+                    version = self._new_version()
+                    self._versions[entity] = version
+                versions[entity] = version[:2]
+            return versions
+
+    def bump(self, entity: str) -> None:
+        with self._lock:
+            self._versions[entity] = self._new_version()
+
+    def _new_version(self) -> tuple[int, float, float]:
+        return time.time_ns(), time.time(), time.monotonic() + self.timeout
+
+
+class DjangoCacheBackend:
+    """Responses and version counters shared through a Django cache"""
+
+    def __init__(self, alias: str = "default", timeout: int = 300) -> None:
+        self.alias = alias
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get(self, key: str):
+        return self.cache.get(f"airport:response:{key}")
+
+    def set(self, key: str, value) -> None:
+        self.cache.set(f"airport:response:{key}", value, self.timeout)
+
+    def clear(self) -> None:
+        for entity in ENTITIES:
+            self.bump(entity)
+
+    def versions(self, entities) -> dict[str, tuple[int, float]]:
+        keys = [f"airport:version:{entity}" for entity in entities]
+        stored = self.cache.get_many(keys)
+        versions = {}
+        for entity, key in zip(entities, keys):
+            if key not in stored:
+                # A random start keeps evicted counters from reusing old keys
+                self.cache.add(key, (time.time_ns(), time.time()), None)
+                stored[key] = self.cache.get(key)
+            versions[entity] = tuple(stored[key])
+        return versions
+
+    def bump(self, entity: str) -> None:
+        self.cache.set(
+            f"airport:version:{entity}", (time.time_ns(), time.time()), None
+        )
+
+
+class ResponseCache:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self._backend = None
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            config = getattr(settings, "AIRPORT_RESPONSE_CACHE", {})
+            backend_class = import_string(
+                config.get("BACKEND", "airport.caching.LocMemLRUBackend")
+            )
+            self._backend = backend_class(**config.get("OPTIONS", {}))
+        return self._backend
+
+    def versions(self, entities) -> dict[str, tuple[int, float]]:
+        return self.backend.versions(entities)
+
+    def bump(self, entity: str) -> None:
+        """Invalidate responses depending on entity, now and after commit"""
+        self.backend.bump(entity)
+        transaction.on_commit(lambda: self.backend.bump(entity))
+
+    def get(self, key: str):
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value) -> None:
+        self.backend.set(key, value)
+
+    def clear(self) -> None:
+        self.backend.clear()
+        self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": (
+                len(self.backend) if hasattr(self.backend, "__len__") else None
+            ),
+        }
+
+
+response_cache = ResponseCache()
+
+
+class CachedResponseMixin:
+    """Serve list and retrieve responses from the response cache.
+
+    Authentication, permissions and throttling run before the lookup,
+    only rendered 200 responses are stored, and the browsable API is
+    never cached because its HTML contains user-specific content.
+    Responses read from a replica are not stored either: the measured lag
+    may be seconds old, so they can predate the versions in their key.
+    Responses carry ETag and Last-Modified validators derived from the
+    version counters, and matching If-None-Match or If-Modified-Since
+    requests get a 304 without touching the database.
+    """
+
+    cache_dependencies: tuple[str, ...] = ()
+
+    def list(self, request, *args, **kwargs):
+        return self._cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached_response(super().retrieve, request, *args, **kwargs)
+
+    def get_response_cache_key(self, request, versions) -> str:
+        params = sorted(request.query_params.lists())
+        raw = repr(
+            (
+                self.basename,
+                self.action,
+                sorted(self.kwargs.items()),
+                params,
+                # Bodies hold absolute URLs, such as the next page
+                request.scheme,
+                request.get_host(),
+                request.accepted_media_type,
+                sorted(versions.items()),
+            )
+        )
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def _set_validators(self, response) -> None:
+        etag, last_modified = self._response_validators
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+
+    def _cached_response(self, handler, request, *args, **kwargs):
+        self._response_cache_key = None
+        self._response_validators = None
+        if request.accepted_renderer.format == "api":
+            return handler(request, *args, **kwargs)
+
+        versions = response_cache.versions(self.cache_dependencies)
+        key = self.get_response_cache_key(request, versions)
+        newest = int(max((modified for _, modified in versions.values()), default=0))
+        # Last-Modified has whole seconds: until the second of the newest
+        # version is over, a later write could carry the same value
+        last_modified = newest if newest < int(time.time()) else None
+        self._response_validators = (f'"{key}"', last_modified)
+
+        not_modified = get_conditional_response(
+            request._request,
+            etag=self._response_validators[0],
+            last_modified=self._response_validators[1],
+        )
+        if not_modified is not None:
+            self._set_validators(not_modified)
+            return not_modified
+
+        cached = response_cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+            response["X-Cache"] = "HIT"
+            self._set_validators(response)
+            return response
+
+        self._response_cache_key = key
+        return handler(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        key = getattr(self, "_response_cache_key", None)
+        if (
+            key
+            and isinstance(response, Response)
+            and response.status_code == 200
+            and not read_from_replica()
+        ):
+            response.render()
+            response_cache.set(key, (response.content, response["Content-Type"]))
+            response["X-Cache"] = "MISS"
+            self._set_validators(response)
+        return response
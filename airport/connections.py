@@ -0,0 +1,218 @@
+"""Multi-leg itinerary search over an in-memory graph of upcoming flights.
+
+The graph indexes flights by source airport, sorted by departure time.
+A search is a time-dependent Dijkstra: partial itineraries are expanded
+in order of arrival time, and from an airport reached at ``t`` only the
+flights leaving between ``t + min_layover`` and ``t + max_layover`` are
+considered, located by bisection.
+
+Flights saved or deleted in this process are patched into the graph on
+the next search, and again once their transaction commits. Changes made
+by other processes are picked up by a full reload once the graph is
+older than ``settings.CONNECTION_GRAPH_TTL`` seconds.
+"""
+import heapq
+import threading
+import time as clock
+from bisect import bisect_left, insort
+from datetime import date, datetime, time, timedelta
+from operator import itemgetter
+from typing import Iterable, NamedTuple
+
+from django.conf import settings
+from django.db import transaction
+
+from airport.models import Airport, Flight
+
+_departure = itemgetter(0)
+
+
+class Leg(NamedTuple):
+    flight: int
+    route: int
+    source: int
+    destination: int
+    departure_time: datetime
+    arrival_time: datetime
+
+
+class FlightGraph:
+    def __init__(
+        self, since: datetime | None = None, ttl: float | None = None
+    ) -> None:
+        """Index flights departing from ``since`` on, by default from yesterday"""
+        self.since = since
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._legs = {}
+        self._departures = {}
+        self._airports = {}
+        self._dirty = set()
+        self._loaded_at = None
+
+    @property
+    def window_start(self) -> datetime:
+        if self.since is not None:
+            return self.since
+        return datetime.combine(date.today() - timedelta(days=1), time.min)
+
+    def _flights(self):
+        flights = Flight.objects.filter(departure_time__gte=self.window_start)
+        return flights.values_list(
+            "id",
+            "route_id",
+            "route__source_id",
+            "route__destination_id",
+            "departure_time",
+            "arrival_time",
+        )
+
+    def _add(self, leg: Leg) -> None:
+        self._legs[leg.flight] = leg
+        insort(
+            self._departures.setdefault(leg.source, []),
+            (leg.departure_time, leg.flight),
+        )
+
+    def _remove(self, flight_id: int) -> None:
+        leg = self._legs.pop(flight_id, None)
+        if leg is None:
+            return
+        departures = self._departures[leg.source]
+        departures.pop(bisect_left(departures, (leg.departure_time, flight_id)))
+
+    def load(self) -> None:
+        """Rebuild the whole graph from the database"""
+        with self._lock:
+            self._legs, self._departures = {}, {}
+            self._dirty.clear()
+            for row in self._flights().order_by("departure_time", "id").iterator(
+                chunk_size=5000
+            ):
+                leg = Leg(*row)
+                self._legs[leg.flight] = leg
+                self._departures.setdefault(leg.source, []).append(
+                    (leg.departure_time, leg.flight)
+                )
+            self._airports = dict(Airport.objects.values_list("id", "name"))
+            self._loaded_at = clock.monotonic()
+
+    def mark_dirty(self, flight_ids: Iterable[int]) -> None:
+        """Reload these flights before the next search, now and after commit
+
+        A search before the commit would read the old rows and clear them.
+        """
+        flight_ids = set(flight_ids)
+        self._mark_dirty(flight_ids)
+        transaction.on_commit(lambda: self._mark_dirty(flight_ids))
+
+    def _mark_dirty(self, flight_ids: set[int]) -> None:
+        with self._lock:
+            self._dirty.update(flight_ids)
+
+    def invalidate(self) -> None:
+        """Reload the whole graph before the next search"""
+        with self._lock:
+            self._loaded_at = None
+
+    def refresh(self) -> None:
+        """Load the graph if needed, otherwise patch in the changed flights"""
+        ttl = self.ttl
+        if ttl is None:
+            ttl = getattr(settings, "CONNECTION_GRAPH_TTL", 60)
+        with self._lock:
+            if self._loaded_at is None or clock.monotonic() - self._loaded_at > ttl:
+                self.load()
+                return
+            if not self._dirty:
+                return
+            dirty, self._dirty = self._dirty, set()
+            for flight_id in dirty:
+                self._remove(flight_id)
+            airports = set()
+            for row in self._flights().filter(pk__in=dirty):
+                leg = Leg(*row)
+                self._add(leg)
+                airports.update((leg.source, leg.destination))
+            missing = airports - self._airports.keys()
+            if missing:
+                self._airports.update(
+                    Airport.objects.filter(pk__in=missing).values_list("id", "name")
+                )
+
+    def airport_name(self, airport_id: int) -> str:
+        return self._airports.get(airport_id, "")
+
+    def __len__(self) -> int:
+        return len(self._legs)
+
+    def search(
+        self,
+        source: int,
+        destination: int,
+        day: date,
+        max_legs: int = 2,
+        min_layover: timedelta = timedelta(minutes=60),
+        max_layover: timedelta = timedelta(hours=24),
+        limit: int = 5,
+    ) -> list[list[Leg]]:
+        """Itineraries leaving ``source`` on ``day``, earliest arrival first.
+
+        Every airport is expanded at most ``limit`` times per number of
+        legs flown, and no itinerary visits an airport twice.
+        """
+        self.refresh()
+        with self._lock:
+            return self._search(
+                source, destination, day, max_legs, min_layover, max_layover, limit
+            )
+
+    def _search(
+        self, source, destination, day, max_legs, min_layover, max_layover, limit
+    ) -> list[list[Leg]]:
+        legs, departures = self._legs, self._departures
+        start = datetime.combine(day, time.min)
+        end = start + timedelta(days=1)
+
+        queue, order = [], 0
+        first = departures.get(source, [])
+        for index in range(bisect_left(first, start, key=_departure), len(first)):
+            departure, flight_id = first[index]
+            if departure >= end:
+                break
+            queue.append((legs[flight_id].arrival_time, order, (flight_id,)))
+            order += 1
+        heapq.heapify(queue)
+
+        expanded = {}
+        itineraries = []
+        while queue and len(itineraries) < limit:
+            arrival, _, path = heapq.heappop(queue)
+            airport = legs[path[-1]].destination
+            if airport == destination:
+                itineraries.append([legs[flight_id] for flight_id in path])
+                continue
+            if len(path) >= max_legs:
+                continue
+            node = (airport, len(path))
+            if expanded.get(node, 0) >= limit:
+                continue
+            expanded[node] = expanded.get(node, 0) + 1
+
+            visited = {source} | {legs[flight_id].destination for flight_id in path}
+            outgoing = departures.get(airport, [])
+            latest = arrival + max_layover
+            ready = bisect_left(outgoing, arrival + min_layover, key=_departure)
+            for index in range(ready, len(outgoing)):
+                departure, flight_id = outgoing[index]
+                if departure > latest:
+                    break
+                leg = legs[flight_id]
+                if leg.destination in visited:
+                    continue
+                heapq.heappush(queue, (leg.arrival_time, order, path + (flight_id,)))
+                order += 1
+        return itineraries
+
+
+connection_graph = FlightGraph()
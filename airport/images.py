@@ -0,0 +1,150 @@
+"""Thumbnails of crew images, made by a pool of background threads.
+
+An uploaded crew image is stored as it is and the request returns right
+away. Once the transaction commits, a job in a pool of
+``settings.IMAGE_PROCESSING_WORKERS`` threads re-encodes it as WebP
+thumbnails, one per entry of ``settings.CREW_THUMBNAIL_SIZES``, whose
+longest side fits the given number of pixels. The job records them in
+``Crew.thumbnails`` together with the image they were made from, so
+thumbnails of a replaced image are never shown. Pillow releases the GIL
+while decoding, resizing and encoding, so the threads work in parallel.
+With ``IMAGE_PROCESSING_WORKERS = 0`` images are processed in the
+request instead.
+"""
+import hashlib
+import io
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.signals import setting_changed
+from django.db import connections, transaction
+from django.dispatch import receiver
+from PIL import Image, ImageOps
+
+from airport.caching import response_cache
+from airport.models import Crew
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_FOLDER = "uploads/crew/thumbnails/"
+THUMBNAIL_FORMAT = "WEBP"
+THUMBNAIL_QUALITY = 80
+
+_executor = None
+_lock = threading.Lock()
+
+
+def processing_workers() -> int:
+    workers = getattr(settings, "IMAGE_PROCESSING_WORKERS", None)
+    if workers is None:
+        return os.cpu_count() or 1
+    return workers
+
+
+def executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=processing_workers(),
+                    thread_name_prefix="image-processing",
+                )
+    return _executor
+
+
+@receiver(setting_changed)
+def reset_executor(*, setting, **kwargs) -> None:
+    global _executor
+    if setting == "IMAGE_PROCESSING_WORKERS":
+        with _lock:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = None
+
+
+def thumbnail_name(image_name: str, size_name: str, content: bytes) -> str:
+    """Name ending in a hash of the content, so it can be cached for good"""
+    stem, _ = os.path.splitext(os.path.basename(image_name))
+    digest = hashlib.sha256(content).hexdigest()[:16]
+    return f"{THUMBNAIL_FOLDER}{stem}-{size_name}-{digest}.{THUMBNAIL_FORMAT.lower()}"
+
+
+def make_thumbnails(image_name: str) -> dict[str, str]:
+    """Store the thumbnails of an image, returning their names by size"""
+    storage = Crew._meta.get_field("image").storage
+    sizes = sorted(
+        settings.CREW_THUMBNAIL_SIZES.items(), key=lambda item: item[1], reverse=True
+    )
+    with storage.open(image_name) as file, Image.open(file) as original:
+        # JPEGs decode straight to the scale the largest thumbnail needs
+        original.draft("RGB", (sizes[0][1], sizes[0][1]))
+        image = ImageOps.exif_transpose(original)
+        transparent = image.mode in ("RGBA", "LA", "PA") or (
+            image.mode == "P" and "transparency" in image.info
+        )
+        image = image.convert("RGBA" if transparent else "RGB")
+
+        thumbnails = {}
+        # Each size is scaled down from the next larger one
+        for size_name, size in sizes:
+            image.thumbnail((size, size))
+            buffer = io.BytesIO()
+            image.save(buffer, THUMBNAIL_FORMAT, quality=THUMBNAIL_QUALITY)
+            content = buffer.getvalue()
+            name = thumbnail_name(image_name, size_name, content)
+            if not storage.exists(name):
+                name = storage.save(name, ContentFile(content))
+            thumbnails[size_name] = name
+    return thumbnails
+
+
+def process_crew_image(crew_id: int, image_name: str) -> None:
+    """Make the thumbnails of a crew image and record them on the crew"""
+    storage = Crew._meta.get_field("image").storage
+    previous = (
+        Crew.objects.filter(pk=crew_id).values_list("thumbnails", flat=True).first()
+    )
+    thumbnails = make_thumbnails(image_name)
+    # An update, so that saving does not queue the image again
+    updated = Crew.objects.filter(pk=crew_id, image=image_name).update(
+        thumbnails={"source": image_name, "sizes": thumbnails}
+    )
+    if not updated:
+        # Replaced or deleted in the meantime
+        stale = thumbnails.values()
+    else:
+        response_cache.bump("crew")
+        stale = set((previous or {}).get("sizes", {}).values()) - set(
+            thumbnails.values()
+        )
+    for name in stale:
+        storage.delete(name)
+
+
+def _process_in_pool(crew_id: int, image_name: str) -> None:
+    try:
+        process_crew_image(crew_id, image_name)
+    except Exception:
+        logger.exception("Making thumbnails of %s failed", image_name)
+        raise
+    finally:
+        # Pool threads outlive the requests that close connections
+        connections.close_all()
+
+
+def queue_thumbnails(crew: Crew) -> None:
+    """Make the thumbnails of the crew image once the transaction commits"""
+    crew_id, image_name = crew.pk, crew.image.name
+
+    def submit() -> Future | None:
+        if processing_workers() == 0:
+            process_crew_image(crew_id, image_name)
+            return None
+        return executor().submit(_process_in_pool, crew_id, image_name)
+
+    transaction.on_commit(submit)
@@ -0,0 +1,227 @@
+"""Bulk import of flight schedules with crew assignments.
+
+Rows are plain mappings with ``route``, ``airplane``, ``departure_time``,
+``arrival_time`` and ``crew`` (a list of ids, or ids separated by spaces,
+commas or semicolons in CSV). Entries of ``dumpdata`` style fixtures
+such as ``sample_data.json`` are accepted too.
+"""
+import csv
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, time
+from itertools import islice
+from typing import IO, Iterable, Iterator
+
+from django.db import transaction
+from django.utils.dateparse import parse_date, parse_datetime
+
+from airport.availability import day_key, refresh_availability
+from airport.caching import response_cache
+from airport.connections import connection_graph
+from airport.models import Airplane, Crew, Flight, Route
+
+IMPORT_BATCH_SIZE = 1000
+IMPORT_FORMATS = ("csv", "json", "ndjson")
+
+
+@dataclass
+class ImportReport:
+    created: int = 0
+    skipped: int = 0
+    errors: list[dict] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return {
+            "created": self.created,
+            "skipped": self.skipped,
+            "errors": self.errors,
+        }
+
+
+@dataclass
+class InvalidRow:
+    """A row that could not be read, reported as an error of its own"""
+
+    message: str
+
+
+def read_rows(source: IO[str], fmt: str) -> Iterator[dict]:
+    """Read schedule rows from a text stream.
+
+    CSV and NDJSON are read lazily; a JSON document is loaded at once.
+    """
+    if fmt == "csv":
+        yield from csv.DictReader(source)
+    elif fmt == "ndjson":
+        for line in source:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as error:
+                    # Reported with the row, earlier batches are committed
+                    yield InvalidRow(f"Invalid JSON: {error}")
+    elif fmt == "json":
+        # Loaded before any row is imported, so errors reject the file
+        try:
+            rows = json.load(source)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"Invalid JSON: {error}")
+        if not isinstance(rows, list):
+            raise ValueError("Expected a JSON list of rows.")
+        yield from rows
+    else:
+        raise ValueError(f"Unknown format {fmt!r}, expected csv, json or ndjson.")
+
+
+def _parse_id(value) -> int:
+    if isinstance(value, bool):
+        raise ValueError
+    return int(value)
+
+
+def _parse_ids(value) -> list[int]:
+    if value in (None, ""):
+        return []
+    if isinstance(value, (list, tuple)):
+        return [_parse_id(item) for item in value]
+    if isinstance(value, int):
+        return [_parse_id(value)]
+    return [_parse_id(item) for item in re.split(r"[\s,;]+", str(value).strip())]
+
+
+def _parse_moment(value):
+    if not isinstance(value, str):
+        return None
+    try:
+        moment = parse_datetime(value)
+        if moment is None:
+            # parse_datetime only takes plain dates where fromisoformat does
+            day = parse_date(value)
+            moment = day and datetime.combine(day, time.min)
+        return moment
+    except ValueError:
+        return None
+
+
+def _parse_row(row: dict) -> tuple[dict, dict]:
+    """Convert raw values, returning the parsed row and field errors"""
+    parsed, errors = {}, {}
+    for name in ("route", "airplane"):
+        try:
+            parsed[name] = _parse_id(row.get(name))
+        except (TypeError, ValueError):
+            errors[name] = "A valid integer id is required."
+    for name in ("departure_time", "arrival_time"):
+        parsed[name] = _parse_moment(row.get(name))
+        if parsed[name] is None:
+            errors[name] = "Enter a date (YYYY-MM-DD) or datetime (YYYY-MM-DDThh:mm)."
+    try:
+        parsed["crew"] = _parse_ids(row.get("crew"))
+    except (TypeError, ValueError):
+        errors["crew"] = "Expected a list of integer ids."
+    return parsed, errors
+
+
+def _import_batch(rows: list[tuple[int, dict]], report: ImportReport) -> None:
+    parsed_rows = []
+    for line, row in rows:
+        parsed, errors = _parse_row(row)
+        if errors:
+            report.errors.append({"row": line, "errors": errors})
+        else:
+            parsed_rows.append((line, parsed))
+
+    routes = set(
+        Route.objects.filter(
+            pk__in={parsed["route"] for _, parsed in parsed_rows}
+        ).values_list("pk", flat=True)
+    )
+    airplanes = set(
+        Airplane.objects.filter(
+            pk__in={parsed["airplane"] for _, parsed in parsed_rows}
+        ).values_list("pk", flat=True)
+    )
+    crew = set(
+        Crew.objects.filter(
+            pk__in={pk for _, parsed in parsed_rows for pk in parsed["crew"]}
+        ).values_list("pk", flat=True)
+    )
+
+    flights, assignments = [], []
+    for line, parsed in parsed_rows:
+        errors = {}
+        if parsed["route"] not in routes:
+            errors["route"] = f"Route {parsed['route']} does not exist."
+        if parsed["airplane"] not in airplanes:
+            errors["airplane"] = f"Airplane {parsed['airplane']} does not exist."
+        missing = [pk for pk in parsed["crew"] if pk not in crew]
+        if missing:
+            errors["crew"] = f"Crew {missing} do not exist."
+        if errors:
+            report.errors.append({"row": line, "errors": errors})
+            continue
+        flights.append(
+            Flight(
+                route_id=parsed["route"],
+                airplane_id=parsed["airplane"],
+                departure_time=parsed["departure_time"],
+                arrival_time=parsed["arrival_time"],
+            )
+        )
+        assignments.append(dict.fromkeys(parsed["crew"]))
+
+    if not flights:
+        return
+
+    with transaction.atomic():
+        Flight.objects.bulk_create(flights)
+        Flight.crew.through.objects.bulk_create(
+            Flight.crew.through(flight_id=flight.pk, crew_id=crew_id)
+            for flight, crew_ids in zip(flights, assignments)
+            for crew_id in crew_ids
+        )
+        refresh_availability(day_key(flight) for flight in flights)
+    connection_graph.mark_dirty(flight.pk for flight in flights)
+    report.created += len(flights)
+
+
+def import_schedule(
+    rows: Iterable[dict], batch_size: int = IMPORT_BATCH_SIZE
+) -> ImportReport:
+    """Create flights and crew assignments from schedule rows in batches.
+
+    References of each batch are resolved with one query per model and
+    rows are inserted with ``bulk_create``. Invalid rows are reported by
+    their 1-based position and do not stop the import.
+    """
+    report = ImportReport()
+    rows = iter(rows)
+    line = 0
+    while chunk := list(islice(rows, batch_size)):
+        batch = []
+        for row in chunk:
+            line += 1
+            if isinstance(row, InvalidRow):
+                report.errors.append(
+                    {"row": line, "errors": {"non_field_errors": row.message}}
+                )
+                continue
+            if isinstance(row, dict) and "fields" in row:
+                if row.get("model") != "airport.flight":
+                    report.skipped += 1
+                    continue
+                row = row["fields"]
+            if not isinstance(row, dict):
+                report.errors.append(
+                    {"row": line, "errors": {"non_field_errors": "Expected an object."}}
+                )
+                continue
+            batch.append((line, row))
+        if batch:
+            _import_batch(batch, report)
+
+    report.errors.sort(key=lambda error: error["row"])
+    if report.created:
+        response_cache.bump("flight")
+    return report
@@ -0,0 +1,223 @@
+"""Per-request SQL and timing instrumentation.
+
+``InstrumentationMiddleware`` measures every request: the number of SQL
+queries and the time spent in them, the time spent rendering the
+response body (``TimedJSONRenderer``), the remaining application time and
+the response size. The numbers are sent back in a ``Server-Timing``
+header and aggregated in this process per view and action, such as
+``FlightViewSet.list``, keeping the last
+``settings.INSTRUMENTATION_SAMPLES`` samples of each for percentiles.
+
+Queries slower than ``settings.SLOW_QUERY_THRESHOLD_MS`` are logged as
+warnings to the ``airport.instrumentation`` logger.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from rest_framework.renderers import JSONRenderer
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 95, 99)
+METRICS = ("duration_ms", "queries", "db_ms", "render_ms", "response_bytes")
+
+
+@dataclass
+class RequestMetrics:
+    view: str = ""
+    started: float = field(default_factory=time.perf_counter)
+    queries: int = 0
+    db_ms: float = 0.0
+    render_ms: float = 0.0
+
+
+_current: ContextVar[RequestMetrics | None] = ContextVar(
+    "request_metrics", default=None
+)
+
+
+def current_metrics() -> RequestMetrics | None:
+    return _current.get()
+
+
+def view_name(view_func, method: str) -> str:
+    """``ViewSet.action`` for viewsets, ``View.method`` for class views"""
+    view_class = getattr(view_func, "cls", None) or getattr(
+        view_func, "view_class", None
+    )
+    if view_class is None:
+        return f"{view_func.__module__}.{view_func.__name__}"
+    actions = getattr(view_func, "actions", None) or {}
+    return f"{view_class.__name__}.{actions.get(method.lower(), method.lower())}"
+
+
+class QueryTimer:
+    """Database execute wrapper adding up the queries of a request"""
+
+    def __init__(self, metrics: RequestMetrics, alias: str) -> None:
+        self.metrics = metrics
+        self.alias = alias
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            self.metrics.queries += 1
+            self.metrics.db_ms += elapsed
+            threshold = getattr(settings, "SLOW_QUERY_THRESHOLD_MS", None)
+            if threshold is not None and elapsed >= threshold:
+                logger.warning(
+                    "Slow query (%.1f ms) on %s in %s: %s",
+                    elapsed,
+                    self.alias,
+                    self.metrics.view or "unknown view",
+                    sql,
+                )
+
+
+def _wrap_connections(metrics: RequestMetrics) -> ExitStack:
+    stack = ExitStack()
+    for connection in connections.all():
+        stack.enter_context(
+            connection.execute_wrapper(QueryTimer(metrics, connection.alias))
+        )
+    return stack
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """JSON renderer recording its time in the metrics of the request"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        metrics = _current.get()
+        if metrics is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        started = time.perf_counter()
+        try:
+            return super().render(data, accepted_media_type, renderer_context)
+        finally:
+            metrics.render_ms += (time.perf_counter() - started) * 1000
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def record(self, metrics: RequestMetrics, duration_ms: float, size) -> None:
+        samples = getattr(settings, "INSTRUMENTATION_SAMPLES", 1000)
+        values = {
+            "duration_ms": duration_ms,
+            "queries": metrics.queries,
+            "db_ms": metrics.db_ms,
+            "render_ms": metrics.render_ms,
+            "response_bytes": size,
+        }
+        with self._lock:
+            view = self._views.get(metrics.view)
+            if view is None:
+                view = self._views[metrics.view] = {
+                    "count": 0,
+                    **{name: deque(maxlen=samples) for name in METRICS},
+                }
+            view["count"] += 1
+            for name, value in values.items():
+                if value is not None:
+                    view[name].append(value)
+
+    def snapshot(self) -> dict:
+        """Request count and percentiles of every metric, per view"""
+        with self._lock:
+            views = {
+                name: (view["count"], {metric: list(view[metric]) for metric in METRICS})
+                for name, view in self._views.items()
+            }
+        return {
+            name: {
+                "count": count,
+                **{metric: percentiles(values) for metric, values in samples.items()},
+            }
+            for name, (count, samples) in sorted(views.items())
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._views.clear()
+
+
+def percentiles(values: list) -> dict:
+    if not values:
+        return {}
+    values = sorted(values)
+    last = len(values) - 1
+    return {
+        f"p{percentile}": round(values[min(last, len(values) * percentile // 100)], 3)
+        for percentile in PERCENTILES
+    }
+
+
+metrics_registry = MetricsRegistry()
+
+
+class InstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            with _wrap_connections(metrics):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        # Queries of async views run in the request's thread-sensitive thread
+        stack = await sync_to_async(_wrap_connections)(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    def process_view(self, request, view_func, view_args, view_kwargs) -> None:
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.view = view_name(view_func, request.method)
+
+    def finish(self, request, response, metrics: RequestMetrics):
+        duration_ms = (time.perf_counter() - metrics.started) * 1000
+        size = None if response.streaming else len(response.content)
+        app_ms = max(duration_ms - metrics.db_ms - metrics.render_ms, 0)
+        response["Server-Timing"] = ", ".join(
+            (
+                f'db;dur={metrics.db_ms:.1f};desc="{metrics.queries} queries"',
+                f"render;dur={metrics.render_ms:.1f}",
+                f"app;dur={app_ms:.1f}",
+                f"total;dur={duration_ms:.1f}",
+            )
+        )
+        if metrics.view:
+            metrics_registry.record(metrics, duration_ms, size)
+        return response
@@ -0,0 +1,232 @@
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airport.benchmark import (
+    PREFIX,
+    delete_benchmark_data,
+    generate_tickets,
+    measure,
+    without_throttling,
+)
+from airport.models import Airplane, Flight
+from airport.views import FlightViewSet
+from orders.models import Order, Ticket
+from orders.views import OrderViewSet
+from user.tokens import add_claims
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the API hot paths through the full Django stack: the "
+        "flight list with each filter, flight detail, order creation and "
+        "order listing. Generates --tickets tickets with their flights, "
+        "orders and users, from 10k up to 10M, and prints latency "
+        "percentiles, queries per request and peak memory as JSON. Writes "
+        "to the configured database; use a dedicated one."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--tickets", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument(
+            "--order-sizes",
+            type=int,
+            nargs="+",
+            default=[1, 5, 20],
+            help="Tickets per created order",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--response-cache",
+            action="store_true",
+            help="Let repeated flight requests answer from the response cache",
+        )
+        parser.add_argument("--output", help="Write the JSON report to this file")
+        parser.add_argument(
+            "--reuse",
+            action="store_true",
+            help="Benchmark the data kept by an earlier --keep run",
+        )
+        parser.add_argument("--keep", action="store_true")
+
+    def request(self, client: Client, method: str, url: str, **kwargs):
+        response = getattr(client, method)(url, **kwargs)
+        assert response.status_code in (200, 201), response.content
+        return response
+
+    def scenario(self, call, repeat: int) -> dict:
+        """Latency of `call` and the queries and memory of one more call"""
+        stats = measure(call, repeat=repeat)
+        tracemalloc.start()
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                response = call()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return {
+            **{key: round(value, 3) for key, value in stats.items()},
+            "queries": len(queries),
+            "peak_memory_kib": round(peak / 1024, 1),
+            "response_bytes": len(response.content),
+        }
+
+    def flight_scenarios(self, client: Client, options: dict) -> dict:
+        flight = (
+            Flight.objects.filter(airplane__name__startswith=PREFIX)
+            .select_related("route__source", "route__destination")
+            .order_by("pk")
+            .first()
+        )
+        day = flight.departure_time.date().isoformat()
+        filters = {
+            "flight_list": {},
+            "flight_list_source_airport": {"source_airport": flight.route.source.name},
+            "flight_list_source_city": {
+                "source_city": flight.route.source.closest_big_city
+            },
+            "flight_list_destination_airport": {
+                "destination_airport": flight.route.destination.name
+            },
+            "flight_list_destination_city": {
+                "destination_city": flight.route.destination.closest_big_city
+            },
+            "flight_list_departure_time": {"departure_time": day},
+            "flight_list_departure_range": {
+                "departure_from": day,
+                "departure_to": day,
+            },
+        }
+        url = reverse("airport:flight-list")
+        counter = iter(range(sys.maxsize))
+
+        def params(values: dict) -> dict:
+            if options["response_cache"]:
+                return values
+            return {**values, "_": next(counter)}
+
+        results = {}
+        for name, values in filters.items():
+            results[name] = self.scenario(
+                lambda: self.request(client, "get", url, data=params(values)),
+                options["repeat"],
+            )
+        detail_url = reverse("airport:flight-detail", args=[flight.pk])
+        results["flight_detail"] = self.scenario(
+            lambda: self.request(client, "get", detail_url, data=params({})),
+            options["repeat"],
+        )
+        return results
+
+    def order_scenarios(self, client: Client, options: dict) -> dict:
+        url = reverse("orders:orders-list")
+        airplane = Airplane.objects.filter(name__startswith=PREFIX).latest("rows")
+        source = Flight.objects.filter(airplane__name__startswith=PREFIX).first()
+        capacity = airplane.rows * airplane.seats_in_row
+
+        results = {}
+        for size in options["order_sizes"]:
+            # Fresh flights, so that every order gets free seats
+            needed = (options["repeat"] + 2) * size
+            seats = []
+            for _ in range(-(-needed // capacity)):
+                flight = Flight.objects.create(
+                    route=source.route,
+                    airplane=airplane,
+                    departure_time=source.departure_time,
+                    arrival_time=source.arrival_time,
+                )
+                seats.extend(
+                    (flight.pk, row, seat)
+                    for row in range(1, airplane.rows + 1)
+                    for seat in range(1, airplane.seats_in_row + 1)
+                )
+            free = iter(seats)
+
+            def create_order():
+                tickets = [
+                    {"flight": flight_id, "row": row, "seat": seat}
+                    for flight_id, row, seat in (next(free) for _ in range(size))
+                ]
+                return self.request(
+                    client,
+                    "post",
+                    url,
+                    data={"tickets": tickets},
+                    content_type="application/json",
+                )
+
+            results[f"order_create_{size}_tickets"] = self.scenario(
+                create_order, options["repeat"]
+            )
+
+        results["order_list"] = self.scenario(
+            lambda: self.request(client, "get", url), options["repeat"]
+        )
+        return results
+
+    def handle(self, *args, **options) -> None:
+        if not options["reuse"]:
+            self.stderr.write(f"Generating {options['tickets']} tickets...")
+            started = time.perf_counter()
+            generate_tickets(options["tickets"], seed=options["seed"])
+            self.stderr.write(f"Generated in {time.perf_counter() - started:.1f}s")
+
+        # The user with the most orders, for a full order list page
+        user = get_user_model().objects.get(
+            pk=Order.objects.filter(user__email__startswith=PREFIX)
+            .values("user")
+            .order_by()
+            .annotate(orders=Count("id"))
+            .order_by("-orders")
+            .values_list("user", flat=True)[0]
+        )
+        # With the claims issued at login, as clients authenticate
+        token = add_claims(AccessToken.for_user(user), user)
+        client = Client(headers={"Authorization": f"Bearer {token}"})
+
+        report = {
+            "meta": {
+                "started_at": datetime.now().isoformat(timespec="seconds"),
+                "tickets": Ticket.objects.filter(
+                    flight__airplane__name__startswith=PREFIX
+                ).count(),
+                "flights": Flight.objects.filter(
+                    airplane__name__startswith=PREFIX
+                ).count(),
+                "repeat": options["repeat"],
+                "response_cache": options["response_cache"],
+                "database": connection.vendor,
+                "python": platform.python_version(),
+            },
+            "scenarios": {},
+        }
+        try:
+            with without_throttling((FlightViewSet, OrderViewSet)), override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]
+            ):
+                report["scenarios"].update(self.flight_scenarios(client, options))
+                report["scenarios"].update(self.order_scenarios(client, options))
+        finally:
+            if not options["keep"]:
+                delete_benchmark_data()
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output + "\n")
+        self.stdout.write(output)
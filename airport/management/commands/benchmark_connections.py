@@ -0,0 +1,97 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import Client, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airport.benchmark import PREFIX, without_throttling
+from airport_service.database import POOL_ENGINE
+
+POSTGRESQL_ENGINES = ("django.db.backends.postgresql", POOL_ENGINE)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare requests per second of a read endpoint when every request "
+        "opens a new database connection, with persistent connections and "
+        "with the connection pool. The pool requires PostgreSQL. Each "
+        "request goes through the full Django handler stack, which opens "
+        "and closes connections as a server would."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--concurrency", type=int, default=10)
+        parser.add_argument("--pool-size", type=int, default=10)
+
+    def scenarios(self, database: dict, pool_size: int) -> dict[str, dict]:
+        direct = database["ENGINE"]
+        if direct == POOL_ENGINE:
+            direct = "django.db.backends.postgresql"
+        scenarios = {
+            "new connection per request": {"ENGINE": direct, "CONN_MAX_AGE": 0},
+            "persistent connections": {
+                "ENGINE": direct,
+                "CONN_MAX_AGE": 600,
+                "CONN_HEALTH_CHECKS": True,
+            },
+        }
+        if direct in POSTGRESQL_ENGINES:
+            options = dict(database["OPTIONS"])
+            options["pool"] = {"max_size": pool_size, "timeout": 30}
+            scenarios["connection pool"] = {
+                "ENGINE": POOL_ENGINE,
+                "CONN_MAX_AGE": 0,
+                "CONN_HEALTH_CHECKS": True,
+                "OPTIONS": options,
+            }
+        return scenarios
+
+    def run(self, url: str, headers: dict, options: dict) -> float:
+        def client_loop(worker: int) -> int:
+            client = Client(headers=headers)
+            for _ in range(worker, options["requests"], options["concurrency"]):
+                response = client.get(url)
+                assert response.status_code == 200, response.content
+            # Threads of the executor do not end requests of their own
+            connections.close_all()
+            return worker
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            list(pool.map(client_loop, range(options["concurrency"])))
+        return options["requests"] / (time.perf_counter() - started)
+
+    def handle(self, *args, **options) -> None:
+        database = connections.settings[DEFAULT_DB_ALIAS]
+        saved = dict(database)
+        user, _ = get_user_model().objects.get_or_create(
+            email=f"{PREFIX}connections@example.com"
+        )
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+        url = reverse("airport:airport-list")
+        scenarios = self.scenarios(saved, options["pool_size"])
+        connections.close_all()
+
+        try:
+            with without_throttling(), override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]
+            ):
+                for name, overrides in scenarios.items():
+                    database.update(overrides)
+                    rate = self.run(url, headers, options)
+                    self.stdout.write(f"{name:<28}{rate:8.1f} req/s")
+                    database.clear()
+                    database.update(saved)
+        finally:
+            database.clear()
+            database.update(saved)
+            connections.close_all()
+            user.delete()
+        if "connection pool" not in scenarios:
+            self.stdout.write("connection pool             skipped, requires PostgreSQL")
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+
+from airport.benchmark import delete_benchmark_data, generate_flights, measure
+from airport.models import Flight
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the old icontains departure filter with indexed range "
+        "queries on generated flights. Writes to the configured database."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--flights", type=int, default=1_000_000)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument(
+            "--keep", action="store_true", help="Keep the generated flights"
+        )
+
+    def handle(self, *args, **options) -> None:
+        self.stdout.write(f"Generating {options['flights']} flights...")
+        route_ids = generate_flights(options["flights"])
+        day = datetime(2024, 6, 15)
+        route_id = route_ids[0]
+
+        queries = {
+            "icontains (old)": Flight.objects.filter(
+                departure_time__icontains=day.date()
+            ),
+            "day range": Flight.objects.filter(
+                departure_time__gte=day, departure_time__lt=day + timedelta(days=1)
+            ),
+            "route + day range": Flight.objects.filter(
+                route_id=route_id,
+                departure_time__gte=day,
+                departure_time__lt=day + timedelta(days=1),
+            ),
+            "week range": Flight.objects.filter(
+                departure_time__gte=day, departure_time__lt=day + timedelta(days=7)
+            ),
+        }
+
+        try:
+            for name, queryset in queries.items():
+                queryset = queryset.values_list("id", flat=True)
+                stats = measure(lambda: list(queryset.all()), repeat=options["repeat"])
+                self.stdout.write(self.style.MIGRATE_HEADING(name))
+                self.stdout.write(queryset.explain())
+                self.stdout.write(
+                    f"rows: {queryset.count()}  "
+                    + "  ".join(f"{key}: {value:.2f}" for key, value in stats.items())
+                )
+        finally:
+            if not options["keep"]:
+                delete_benchmark_data()
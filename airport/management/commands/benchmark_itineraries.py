@@ -0,0 +1,85 @@
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+
+from airport.benchmark import delete_benchmark_data, generate_flights, measure
+from airport.connections import FlightGraph
+from airport.models import Route
+
+
+class Command(BaseCommand):
+    help = (
+        "Time itinerary searches over a generated network. "
+        "Writes to the configured database."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--airports", type=int, default=1000)
+        parser.add_argument("--routes", type=int, default=20_000)
+        parser.add_argument("--flights", type=int, default=100_000)
+        parser.add_argument("--days", type=int, default=7)
+        parser.add_argument("--searches", type=int, default=200)
+        parser.add_argument("--max-legs", type=int, default=3)
+        parser.add_argument(
+            "--keep", action="store_true", help="Keep the generated flights"
+        )
+
+    def handle(self, *args, **options) -> None:
+        start = datetime(2024, 1, 1)
+        self.stdout.write(
+            f"Generating {options['flights']} flights between "
+            f"{options['airports']} airports..."
+        )
+        route_ids = generate_flights(
+            options["flights"],
+            airports=options["airports"],
+            routes=options["routes"],
+            start=start,
+            days=options["days"],
+        )
+
+        try:
+            graph = FlightGraph(since=start, ttl=float("inf"))
+            tracemalloc.start()
+            started = time.perf_counter()
+            graph.load()
+            load_ms = (time.perf_counter() - started) * 1000
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self.stdout.write(
+                f"graph: {len(graph)} flights, load {load_ms:.0f} ms, "
+                f"peak memory {peak / 2**20:.1f} MiB"
+            )
+
+            airports = list(
+                Route.objects.filter(pk__in=route_ids)
+                .values_list("source_id", flat=True)
+                .distinct()
+            )
+            rng = random.Random(0)
+            searches = [
+                (
+                    *rng.sample(airports, 2),
+                    (start + timedelta(days=rng.randrange(options["days"] - 1))).date(),
+                )
+                for _ in range(options["searches"])
+            ]
+            found = sum(
+                bool(graph.search(*search, max_legs=options["max_legs"]))
+                for search in searches
+            )
+            searches = iter(searches * 2)
+            stats = measure(
+                lambda: graph.search(*next(searches), max_legs=options["max_legs"]),
+                repeat=options["searches"] - 1,
+            )
+            self.stdout.write(
+                f"searches with results: {found}/{options['searches']}  "
+                + "  ".join(f"{key}: {value:.2f}" for key, value in stats.items())
+            )
+        finally:
+            if not options["keep"]:
+                delete_benchmark_data()
@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+from django.views.static import serve
+
+from airport_service.media import serve_media
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare media serving by django.views.static.serve, the DEBUG-only "
+        "view used before, with airport_service.media.serve_media when "
+        "Django streams the file, when it answers a byte range, when it "
+        "answers a revalidation and when it hands the file to the web "
+        "server with X-Accel-Redirect. Calls the views directly on a file "
+        "in a temporary MEDIA_ROOT and reads the whole response body. "
+        "Servers may send full FileResponses with sendfile through "
+        "wsgi.file_wrapper, which is not measured here."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--size", type=int, default=1024, help="File size in KiB")
+
+    def run(self, view, path: str, headers: dict, requests: int) -> str:
+        factory = RequestFactory(headers=headers)
+        sent = 0
+        started = time.perf_counter()
+        for _ in range(requests):
+            response = view(factory.get(f"/media/{path}"), path)
+            if response.streaming:
+                sent += sum(len(chunk) for chunk in response.streaming_content)
+            else:
+                sent += len(response.content)
+            response.close()
+        seconds = time.perf_counter() - started
+        return (
+            f"{requests / seconds:9.1f} req/s  "
+            f"{sent / seconds / 2**20:9.1f} MiB/s sent by Django"
+        )
+
+    def handle(self, *args, **options) -> None:
+        media_root = tempfile.mkdtemp()
+        path = f"uploads/crew/benchmark-{uuid.uuid4()}.jpg"
+        os.makedirs(os.path.join(media_root, "uploads/crew"))
+        with open(os.path.join(media_root, path), "wb") as file:
+            file.write(os.urandom(options["size"] * 1024))
+
+        def static_serve(request, path):
+            return serve(request, path, document_root=media_root)
+
+        try:
+            with override_settings(MEDIA_ROOT=media_root):
+                etag = serve_media(RequestFactory().get("/"), path)["ETag"]
+                scenarios = {
+                    "static.serve": (static_serve, {}, {}),
+                    "serve_media": (serve_media, {}, {}),
+                    "serve_media 64 KiB range": (
+                        serve_media,
+                        {"Range": "bytes=0-65535"},
+                        {},
+                    ),
+                    "serve_media revalidation": (
+                        serve_media,
+                        {"If-None-Match": etag},
+                        {},
+                    ),
+                    "serve_media x-accel-redirect": (
+                        serve_media,
+                        {},
+                        {"MEDIA_SERVING": "x-accel-redirect"},
+                    ),
+                }
+                for name, (view, headers, overrides) in scenarios.items():
+                    with override_settings(**overrides):
+                        result = self.run(view, path, headers, options["requests"])
+                    self.stdout.write(f"{name:<30}{result}")
+        finally:
+            shutil.rmtree(media_root)
@@ -0,0 +1,130 @@
+import sys
+import tracemalloc
+from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from rest_framework.pagination import Cursor, LimitOffsetPagination
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from airport.benchmark import (
+    PREFIX,
+    delete_benchmark_data,
+    generate_flights,
+    measure,
+    without_throttling,
+)
+from airport.models import Flight
+from airport.views import FlightPagination, FlightViewSet
+
+
+class OffsetFlightViewSet(FlightViewSet):
+    pagination_class = LimitOffsetPagination
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare deep OFFSET pages with cursor pages of the flight list and "
+        "the memory of paginated and unpaginated responses. Writes to the "
+        "configured database."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--flights", type=int, default=1_000_000)
+        parser.add_argument("--repeat", type=int, default=10)
+        parser.add_argument(
+            "--depths",
+            type=int,
+            nargs="+",
+            default=[0, 1_000, 100_000, 900_000],
+            help="Row positions of the measured pages",
+        )
+        parser.add_argument(
+            "--unpaginated-limit",
+            type=int,
+            default=100_000,
+            help="Rows serialized to estimate the unpaginated response memory",
+        )
+        parser.add_argument("--keep", action="store_true")
+
+    def handle(self, *args, **options) -> None:
+        self.stdout.write(f"Generating {options['flights']} flights...")
+        generate_flights(options["flights"])
+        user = get_user_model().objects.create_user(
+            email=f"{PREFIX}pagination@example.com", password=None
+        )
+        factory = APIRequestFactory()
+        offset_view = OffsetFlightViewSet.as_view({"get": "list"})
+        cursor_view = FlightViewSet.as_view({"get": "list"})
+        page_size = FlightPagination.page_size
+
+        counter = iter(range(sys.maxsize))
+
+        def call(view, params: dict) -> None:
+            # A new dummy parameter per call keeps the response cache out of
+            # the timings, which would otherwise compare cache hits
+            params = {**params, "_": next(counter)}
+            request = factory.get("/flight/", params, HTTP_HOST="localhost")
+            force_authenticate(request, user=user)
+            response = view(request)
+            response.render()
+            assert response.status_code == 200, response.content
+
+        try:
+            with without_throttling((FlightViewSet, OffsetFlightViewSet)):
+                ordered = Flight.objects.order_by("departure_time", "id")
+                for depth in options["depths"]:
+                    if depth >= options["flights"]:
+                        continue
+                    position = ordered.values_list("departure_time", flat=True)[depth]
+                    paginator = FlightPagination()
+                    paginator.base_url = "/flight/"
+                    url = paginator.encode_cursor(
+                        Cursor(offset=0, reverse=False, position=str(position))
+                    )
+                    # Unquoted, as the request factory quotes it again
+                    [cursor] = parse_qs(urlsplit(url).query)["cursor"]
+
+                    offset_stats = measure(
+                        lambda: call(
+                            offset_view, {"offset": depth, "limit": page_size}
+                        ),
+                        repeat=options["repeat"],
+                    )
+                    cursor_stats = measure(
+                        lambda: call(cursor_view, {"cursor": cursor}),
+                        repeat=options["repeat"],
+                    )
+                    self.stdout.write(
+                        self.style.MIGRATE_HEADING(f"page at row {depth}")
+                    )
+                    self.stdout.write("  offset  " + self._format(offset_stats))
+                    self.stdout.write("  cursor  " + self._format(cursor_stats))
+
+                self.stdout.write(self.style.MIGRATE_HEADING("peak memory"))
+                for name, view, params in (
+                    ("cursor page", cursor_view, {}),
+                    (
+                        f"{options['unpaginated_limit']} rows unpaginated",
+                        offset_view,
+                        {"offset": 0, "limit": options["unpaginated_limit"]},
+                    ),
+                ):
+                    tracemalloc.start()
+                    started = datetime.now()
+                    call(view, params)
+                    elapsed = (datetime.now() - started).total_seconds() * 1000
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+                    self.stdout.write(
+                        f"  {name}: {peak / 1024 / 1024:.1f} MiB, {elapsed:.0f} ms"
+                    )
+        finally:
+            user.delete()
+            if not options["keep"]:
+                delete_benchmark_data()
+
+    @staticmethod
+    def _format(stats: dict) -> str:
+        return "  ".join(f"{key}: {value:.2f}" for key, value in stats.items())
@@ -0,0 +1,50 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from airport.imports import (
+    IMPORT_BATCH_SIZE,
+    IMPORT_FORMATS,
+    import_schedule,
+    read_rows,
+)
+
+
+class Command(BaseCommand):
+    help = "Bulk import flights with crew assignments from CSV, JSON or NDJSON"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format",
+            dest="fmt",
+            choices=IMPORT_FORMATS,
+            help="File format, guessed from the extension by default",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help="Rows resolved and inserted per batch",
+        )
+
+    def handle(self, *args, **options) -> None:
+        fmt = options["fmt"] or os.path.splitext(options["path"])[1].lstrip(".")
+        if fmt not in IMPORT_FORMATS:
+            raise CommandError("Cannot guess the file format, pass --format.")
+
+        try:
+            with open(options["path"], encoding="utf-8", newline="") as source:
+                report = import_schedule(
+                    read_rows(source, fmt), batch_size=options["batch_size"]
+                )
+        except (OSError, ValueError) as error:
+            raise CommandError(error)
+
+        for error in report.errors:
+            self.stderr.write(f"Row {error['row']}: {json.dumps(error['errors'])}")
+        self.stdout.write(
+            f"Created {report.created} flights, skipped {report.skipped} entries, "
+            f"{len(report.errors)} rows with errors"
+        )
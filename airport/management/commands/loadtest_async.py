@@ -0,0 +1,129 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airport.benchmark import (
+    PREFIX,
+    delete_benchmark_data,
+    generate_flights,
+    without_throttling,
+)
+from airport.models import Flight
+
+
+def _summary(timings: list[float], seconds: float) -> str:
+    timings.sort()
+    return (
+        f"{len(timings) / seconds:8.1f} req/s  "
+        f"p50 {statistics.median(timings):7.2f} ms  "
+        f"p95 {timings[int(len(timings) * 0.95)]:7.2f} ms"
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare throughput of the sync (WSGI) viewsets and the async (ASGI) "
+        "read views in-process, through the full Django handler stack. "
+        "Writes to the configured database; use a server database such as "
+        "PostgreSQL, as in-memory sqlite is not shared between threads. "
+        "For numbers including the HTTP server, run the same URLs against "
+        "gunicorn airport_service.wsgi and uvicorn airport_service.asgi "
+        "with a load generator such as wrk."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--flights", type=int, default=10_000)
+        parser.add_argument("--requests", type=int, default=1000)
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument(
+            "--response-cache",
+            action="store_true",
+            help="Let the sync views answer from the response cache",
+        )
+        parser.add_argument(
+            "--keep", action="store_true", help="Keep the generated flights"
+        )
+
+    def run_wsgi(self, url: str, headers: dict, options: dict) -> str:
+        def client_loop(worker: int) -> list[float]:
+            client = Client(headers=headers)
+            timings = []
+            for index in range(worker, options["requests"], options["concurrency"]):
+                params = {} if options["response_cache"] else {"_": index}
+                started = time.perf_counter()
+                response = client.get(url, params)
+                timings.append((time.perf_counter() - started) * 1000)
+                assert response.status_code == 200, response.content
+            close_old_connections()
+            return timings
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            results = pool.map(client_loop, range(options["concurrency"]))
+            timings = [timing for result in results for timing in result]
+        return _summary(timings, time.perf_counter() - started)
+
+    def run_asgi(self, url: str, headers: dict, options: dict) -> str:
+        async def client_loop(worker: int) -> list[float]:
+            client = AsyncClient()
+            timings = []
+            for _ in range(worker, options["requests"], options["concurrency"]):
+                started = time.perf_counter()
+                response = await client.get(url, headers=headers)
+                timings.append((time.perf_counter() - started) * 1000)
+                assert response.status_code == 200, response.content
+            return timings
+
+        async def run() -> list[list[float]]:
+            return await asyncio.gather(
+                *(client_loop(worker) for worker in range(options["concurrency"]))
+            )
+
+        started = time.perf_counter()
+        timings = [timing for result in asyncio.run(run()) for timing in result]
+        return _summary(timings, time.perf_counter() - started)
+
+    def handle(self, *args, **options) -> None:
+        self.stdout.write(f"Generating {options['flights']} flights...")
+        generate_flights(options["flights"])
+        user, _ = get_user_model().objects.get_or_create(email=f"{PREFIX}user@example.com")
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+        flight_id = Flight.objects.values_list("id", flat=True).first()
+
+        scenarios = {
+            "flight list": ("airport:flight-list", "airport:async-flight-list", ()),
+            "flight detail": (
+                "airport:flight-detail",
+                "airport:async-flight-detail",
+                (flight_id,),
+            ),
+            "route list": ("airport:route-list", "airport:async-route-list", ()),
+            "airport list": ("airport:airport-list", "airport:async-airport-list", ()),
+        }
+        try:
+            with without_throttling(), override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]
+            ):
+                for name, (sync_name, async_name, args) in scenarios.items():
+                    self.stdout.write(self.style.MIGRATE_HEADING(name))
+                    self.stdout.write(
+                        "  wsgi  "
+                        + self.run_wsgi(reverse(sync_name, args=args), headers, options)
+                    )
+                    self.stdout.write(
+                        "  asgi  "
+                        + self.run_asgi(reverse(async_name, args=args), headers, options)
+                    )
+        finally:
+            user.delete()
+            if not options["keep"]:
+                delete_benchmark_data()
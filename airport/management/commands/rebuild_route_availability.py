@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from airport.availability import rebuild_availability
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per route and day seat availability summary from flights"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--route",
+            type=int,
+            action="append",
+            dest="routes",
+            help="Only process the route with this id (can be repeated)",
+        )
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options) -> None:
+        stored = rebuild_availability(
+            options["routes"], batch_size=options["batch_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {stored} route days"))
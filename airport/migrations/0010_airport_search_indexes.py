@@ -0,0 +1,52 @@
+# Generated by Django 4.2.6 on 2026-10-18 17:13
+
+from django.db import migrations
+from django.db.models.functions import Upper
+
+TRIGRAM_COLUMNS = ("name", "closest_big_city")
+
+
+def trigram_index(column: str):
+    from django.contrib.postgres.indexes import GinIndex, OpClass
+
+    return GinIndex(
+        OpClass(Upper(column), name="gin_trgm_ops"),
+        name=f"airport_{column}_trgm_idx",
+    )
+
+
+def create_trigram_indexes(apps, schema_editor) -> None:
+    """GIN trigram indexes matching the UPPER(col::text) LIKE of icontains.
+
+    Only PostgreSQL has pg_trgm, and django.contrib.postgres needs psycopg,
+    so both are only imported there. Other databases such as SQLite have
+    no index that serves LIKE '%...%'; the flight filters resolve the
+    matching airports once in a pre-query, a scan of the small airports
+    table, instead of matching strings in the flight join.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    from django.contrib.postgres.operations import TrigramExtension
+
+    TrigramExtension().database_forwards("airport", schema_editor, None, None)
+    airport = apps.get_model("airport", "Airport")
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.add_index(airport, trigram_index(column))
+
+
+def drop_trigram_indexes(apps, schema_editor) -> None:
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    airport = apps.get_model("airport", "Airport")
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.remove_index(airport, trigram_index(column))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("airport", "0009_flight_departure_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 4.2.6 on 2026-10-18 17:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Coalesce, TruncDate
+
+
+def build_route_availability(apps, schema_editor) -> None:
+    Flight = apps.get_model("airport", "Flight")
+    RouteAvailability = apps.get_model("airport", "RouteAvailability")
+
+    summaries = (
+        Flight.objects.order_by()
+        .annotate(date=TruncDate("departure_time"))
+        .values("route_id", "date")
+        .annotate(
+            flights=Count("id"),
+            capacity=Sum(F("airplane__rows") * F("airplane__seats_in_row")),
+            sold=Sum(Coalesce(F("seat_map__sold"), 0)),
+        )
+    )
+    RouteAvailability.objects.bulk_create(
+        (RouteAvailability(**summary) for summary in summaries.iterator(2000)),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("airport", "0010_airport_search_indexes"),
+        ("orders", "0002_seatmap"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RouteAvailability",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("flights", models.IntegerField(default=0)),
+                ("capacity", models.IntegerField(default=0)),
+                ("sold", models.IntegerField(default=0)),
+                (
+                    "route",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="availability",
+                        to="airport.route",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "route availability",
+                "ordering": ["date"],
+                "unique_together": {("route", "date")},
+            },
+        ),
+        migrations.RunPython(build_route_availability, migrations.RunPython.noop),
+    ]
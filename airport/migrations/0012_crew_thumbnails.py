@@ -0,0 +1,17 @@
+# Generated by Django 4.2.6 on 2026-10-18 18:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("airport", "0011_route_availability"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="crew",
+            name="thumbnails",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -1,4 +1,7 @@
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Coalesce
+
 from airport.utils import crew_image_file_path
 
 
@@ -27,6 +30,8 @@ class Crew(models.Model):
     first_name = models.CharField(max_length=255)
     last_name = models.CharField(max_length=255)
     image = models.ImageField(null=True, upload_to=crew_image_file_path)
+    # Made in the background from the image, see airport.images
+    thumbnails = models.JSONField(default=dict, blank=True, editable=False)
 
     def __str__(self) -> str:
         return f"{self.first_name} {self.last_name}"
@@ -49,6 +54,17 @@ class Route(models.Model):
         return f"Fly from {self.source} to {self.destination}. Distance: {self.distance}"
 
 
+class FlightQuerySet(models.QuerySet):
+    def with_tickets_available(self) -> "FlightQuerySet":
+        """Annotate free seats using the seat maps kept by the orders app"""
+        return self.annotate(
+            tickets_available=(
+                F("airplane__rows") * F("airplane__seats_in_row")
+                - Coalesce(F("seat_map__sold"), 0)
+            )
+        )
+
+
 class Flight(models.Model):
     route = models.ForeignKey(Route, on_delete=models.CASCADE, related_name="flight")
     airplane = models.ForeignKey(Airplane, on_delete=models.CASCADE, related_name="flight")
@@ -56,8 +72,35 @@ class Flight(models.Model):
     arrival_time = models.DateTimeField()
     crew = models.ManyToManyField(Crew, related_name="flight")
 
+    objects = FlightQuerySet.as_manager()
+
     def __str__(self) -> str:
         return f"Flight {self.route}. Departure: {self.departure_time}. Arrival: {self.arrival_time}"
 
     class Meta:
         ordering = ["departure_time"]
+        indexes = [
+            models.Index(fields=["departure_time"], name="flight_departure_idx"),
+            models.Index(fields=["route", "departure_time"], name="flight_route_departure_idx"),
+        ]
+
+
+class RouteAvailability(models.Model):
+    """Seats of all route flights departing on one day, kept by airport.availability"""
+    route = models.ForeignKey(Route, on_delete=models.CASCADE, related_name="availability")
+    date = models.DateField()
+    flights = models.IntegerField(default=0)
+    capacity = models.IntegerField(default=0)
+    sold = models.IntegerField(default=0)
+
+    @property
+    def available(self) -> int:
+        return self.capacity - self.sold
+
+    def __str__(self) -> str:
+        return f"{self.route} on {self.date}: {self.available} of {self.capacity} seats free"
+
+    class Meta:
+        unique_together = ("route", "date")
+        ordering = ["date"]
+        verbose_name_plural = "route availability"
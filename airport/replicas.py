@@ -0,0 +1,210 @@
+"""Route the reads of safe requests on the airport endpoints to replicas.
+
+``ReplicaRoutingMiddleware`` opens a routing state for every request.
+Views that opt in with ``ReplicaReadMixin`` mark GET, HEAD and OPTIONS
+requests as replica reads once the user is authenticated, and
+``ReplicaRouter`` then sends their queries to one of
+``settings.DATABASE_REPLICAS``. Everything else uses ``default``.
+
+Reads go back to the primary for the rest of the request after a write,
+including ``select_for_update``, and for ``settings.REPLICA_STICKY_SECONDS``
+after a request in which the user wrote, so that users see their own
+changes such as a fresh order. Stickiness is kept in the cache named by
+``settings.REPLICA_STICKY_CACHE``, which must be shared by all processes
+serving the user, or their next read may reach a lagging replica.
+
+The lag of every replica is measured at most every
+``settings.REPLICA_LAG_CHECK_INTERVAL`` seconds, and replicas more than
+``settings.REPLICA_MAX_LAG`` seconds behind, or unreachable, are skipped.
+"""
+import random
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+STICKY_KEY = "replicas:sticky:{}"
+
+LAG_QUERIES = {
+    "postgresql": (
+        "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+        "THEN 0 ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+    ),
+}
+
+
+@dataclass
+class RoutingState:
+    replica_reads: bool = False
+    wrote: bool = False
+    replica: str | None = None
+
+
+_state: ContextVar[RoutingState | None] = ContextVar("replica_routing", default=None)
+
+
+def routing_state() -> RoutingState | None:
+    return _state.get()
+
+
+def read_from_replica() -> bool:
+    """Whether the current request read from a replica"""
+    state = _state.get()
+    return state is not None and state.replica is not None
+
+
+def use_replica() -> None:
+    """Send the remaining reads of the current request to a replica"""
+    state = _state.get()
+    if state is not None:
+        state.replica_reads = True
+
+
+def replica_lag(alias: str) -> float:
+    """Seconds the replica is behind its primary, 0 for unknown vendors"""
+    connection = connections[alias]
+    query = LAG_QUERIES.get(connection.vendor)
+    if query is None:
+        return 0.0
+    with connection.cursor() as cursor:
+        cursor.execute(query)
+        (lag,) = cursor.fetchone()
+    return float(lag or 0)
+
+
+class ReplicaLag:
+    """Per-process cache of the measured lag of every replica"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._measured = {}
+
+    def get(self, alias: str) -> float:
+        interval = getattr(settings, "REPLICA_LAG_CHECK_INTERVAL", 5)
+        now = time.monotonic()
+        with self._lock:
+            measured = self._measured.get(alias)
+            if measured is not None and now - measured[0] < interval:
+                return measured[1]
+            # Other threads keep using the previous value meanwhile
+            self._measured[alias] = (now, measured[1] if measured else 0.0)
+        try:
+            lag = replica_lag(alias)
+        except DatabaseError:
+            lag = float("inf")
+        with self._lock:
+            self._measured[alias] = (time.monotonic(), lag)
+        return lag
+
+    def clear(self) -> None:
+        with self._lock:
+            self._measured.clear()
+
+
+replica_lag_cache = ReplicaLag()
+
+
+def pick_replica() -> str | None:
+    """Return a random replica within the lag limit"""
+    max_lag = getattr(settings, "REPLICA_MAX_LAG", 5)
+    candidates = []
+    for alias in getattr(settings, "DATABASE_REPLICAS", ()):
+        lag = replica_lag_cache.get(alias)
+        if lag <= max_lag:
+            candidates.append(alias)
+    if not candidates:
+        return None
+    return random.choice(candidates)
+
+
+def _sticky_cache():
+    return caches[getattr(settings, "REPLICA_STICKY_CACHE", "default")]
+
+
+def pin_to_primary(user_id) -> None:
+    seconds = getattr(settings, "REPLICA_STICKY_SECONDS", 10)
+    if seconds:
+        _sticky_cache().set(STICKY_KEY.format(user_id), True, timeout=seconds)
+
+
+def pinned_to_primary(user) -> bool:
+    if not user or not user.is_authenticated:
+        return False
+    return bool(_sticky_cache().get(STICKY_KEY.format(user.pk)))
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints) -> str | None:
+        state = _state.get()
+        if state is None or not state.replica_reads or state.wrote:
+            return None
+        if state.replica is None:
+            state.replica = pick_replica()
+            if state.replica is None:
+                state.replica_reads = False
+                return None
+        return state.replica
+
+    def db_for_write(self, model, **hints) -> None:
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """Scope the routing state to the request and make writers sticky"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = RoutingState()
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        if state.wrote:
+            self.pin_writer(request)
+        return response
+
+    async def __acall__(self, request):
+        state = RoutingState()
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        if state.wrote:
+            await sync_to_async(self.pin_writer)(request)
+        return response
+
+    @staticmethod
+    def pin_writer(request) -> None:
+        # DRF sets the user it authenticated on the underlying request
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            pin_to_primary(user.pk)
+
+
+class ReplicaReadMixin:
+    """Read from a replica on safe requests of users that did not just write"""
+
+    def initial(self, request, *args, **kwargs) -> None:
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and not pinned_to_primary(request.user):
+            use_replica()
@@ -1,5 +1,13 @@
 from rest_framework import serializers
-from airport.models import Crew, Airport, Route, Flight, AirplaneType, Airplane
+from airport.models import (
+    Crew,
+    Airport,
+    Route,
+    RouteAvailability,
+    Flight,
+    AirplaneType,
+    Airplane,
+)
 
 
 class AirportSerializer(serializers.ModelSerializer):
@@ -68,16 +76,37 @@ class RouteDetailSerializer(RouteSerializer):
         )
 
 
+class RouteAvailabilitySerializer(serializers.ModelSerializer):
+    available = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = RouteAvailability
+        fields = ("date", "flights", "capacity", "sold", "available")
+
+
 class CrewSerializer(serializers.ModelSerializer):
+    thumbnails = serializers.SerializerMethodField()
+
     class Meta:
         model = Crew
-        fields = ("id", "first_name", "last_name", "image")
+        fields = ("id", "first_name", "last_name", "image", "thumbnails")
+
+    def get_thumbnails(self, crew: Crew) -> dict[str, str]:
+        """URLs of the image thumbnails by size, empty until they are made"""
+        if not crew.image or crew.thumbnails.get("source") != crew.image.name:
+            return {}
+        request = self.context.get("request")
+        urls = {}
+        for size, name in crew.thumbnails["sizes"].items():
+            url = crew.image.storage.url(name)
+            urls[size] = request.build_absolute_uri(url) if request else url
+        return urls
 
 
 class CrewDetailSerializer(CrewSerializer):
     class Meta:
         model = Crew
-        fields = ("first_name", "last_name", "image")
+        fields = ("first_name", "last_name", "image", "thumbnails")
 
 
 class FlightSerializer(serializers.ModelSerializer):
@@ -127,3 +156,36 @@ class FlightDetailSerializer(FlightListSerializer):
             "crew",
             "airplane",
         )
+
+
+class ItinerarySearchSerializer(serializers.Serializer):
+    source = serializers.IntegerField()
+    destination = serializers.IntegerField()
+    date = serializers.DateField()
+    max_legs = serializers.IntegerField(min_value=1, max_value=4, default=2)
+    min_layover = serializers.IntegerField(min_value=0, max_value=1440, default=60)
+    max_layover = serializers.IntegerField(min_value=0, max_value=2880, default=1440)
+    limit = serializers.IntegerField(min_value=1, max_value=20, default=5)
+
+    def validate(self, attrs) -> dict:
+        if attrs["min_layover"] > attrs["max_layover"]:
+            raise serializers.ValidationError(
+                {"max_layover": "Ensure this value is at least min_layover."}
+            )
+        return attrs
+
+
+class ItineraryLegSerializer(serializers.Serializer):
+    flight = serializers.IntegerField()
+    route = serializers.IntegerField()
+    source = serializers.CharField()
+    destination = serializers.CharField()
+    departure_time = serializers.DateTimeField()
+    arrival_time = serializers.DateTimeField()
+
+
+class ItinerarySerializer(serializers.Serializer):
+    departure_time = serializers.DateTimeField()
+    arrival_time = serializers.DateTimeField()
+    duration_minutes = serializers.IntegerField()
+    legs = ItineraryLegSerializer(many=True)
@@ -0,0 +1,84 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from airport.availability import day_key, refresh_flights, schedule_refresh
+from airport.caching import response_cache
+from airport.connections import connection_graph
+from airport.images import queue_thumbnails
+from airport.models import Airplane, AirplaneType, Airport, Crew, Flight, Route
+
+CACHED_ENTITIES = {
+    AirplaneType: "airplane_type",
+    Airplane: "airplane",
+    Airport: "airport",
+    Crew: "crew",
+    Route: "route",
+    Flight: "flight",
+}
+
+
+def bump_entity_version(sender, **kwargs) -> None:
+    response_cache.bump(CACHED_ENTITIES[sender])
+
+
+def bump_flight_crew_version(sender, action, **kwargs) -> None:
+    if action in ("post_add", "post_remove", "post_clear"):
+        response_cache.bump("flight")
+
+
+for model in CACHED_ENTITIES:
+    post_save.connect(bump_entity_version, sender=model)
+    post_delete.connect(bump_entity_version, sender=model)
+
+m2m_changed.connect(bump_flight_crew_version, sender=Flight.crew.through)
+
+
+@receiver(pre_save, sender=Flight)
+def remember_flight_day(sender, instance, **kwargs) -> None:
+    """Keep the route and day a flight had so its old summary is refreshed"""
+    instance._previous_day = None
+    if instance.pk:
+        previous = (
+            Flight.objects.filter(pk=instance.pk)
+            .values_list("route_id", "departure_time")
+            .first()
+        )
+        if previous:
+            instance._previous_day = (previous[0], previous[1].date())
+
+
+@receiver(post_save, sender=Flight)
+def refresh_flight_availability(sender, instance, **kwargs) -> None:
+    previous = getattr(instance, "_previous_day", None)
+    schedule_refresh([day_key(instance)] + ([previous] if previous else []))
+
+
+@receiver(post_delete, sender=Flight)
+def refresh_deleted_flight_availability(sender, instance, **kwargs) -> None:
+    schedule_refresh([day_key(instance)])
+
+
+@receiver(post_save, sender=Airplane)
+def refresh_airplane_availability(sender, instance, created, **kwargs) -> None:
+    if not created:
+        refresh_flights(Flight.objects.filter(airplane=instance))
+
+
+@receiver(post_save, sender=Flight)
+@receiver(post_delete, sender=Flight)
+def patch_connection_graph(sender, instance, **kwargs) -> None:
+    connection_graph.mark_dirty([instance.pk])
+
+
+@receiver(post_save, sender=Route)
+@receiver(post_delete, sender=Route)
+@receiver(post_save, sender=Airport)
+@receiver(post_delete, sender=Airport)
+def reload_connection_graph(sender, **kwargs) -> None:
+    connection_graph.invalidate()
+
+
+@receiver(post_save, sender=Crew)
+def make_crew_thumbnails(sender, instance, **kwargs) -> None:
+    if instance.image and instance.thumbnails.get("source") != instance.image.name:
+        queue_thumbnails(instance)
@@ -5,6 +5,7 @@ from rest_framework.test import APIClient
 from rest_framework import status
 
 
+from airport.caching import response_cache
 from airport.models import Crew, Airport, Route, Flight, AirplaneType, Airplane
 from airport.serializers import (
     CrewSerializer,
@@ -105,6 +106,7 @@ class UnauthenticatedMovieApiTests(TestCase):
 
 class AuthenticatedAirportApiTests(TestCase):
     def setUp(self) -> None:
+        response_cache.clear()
         self.client = APIClient()
         self.user = get_user_model().objects.create_user(
             email="admin@admin.com",
@@ -180,7 +182,7 @@ class AuthenticatedAirportApiTests(TestCase):
         crew = Crew.objects.all()
         serializer = CrewSerializer(crew, many=True)
         self.assertEqual(result.status_code, status.HTTP_200_OK)
-        self.assertEqual(result.data, serializer.data)
+        self.assertEqual(result.data["results"], serializer.data)
 
     def test_airport_list(self) -> None:
         result = self.client.get(AIRPORT_URL)
@@ -194,7 +196,7 @@ class AuthenticatedAirportApiTests(TestCase):
         route = Route.objects.all()
         serializer = RouteListSerializer(route, many=True)
         self.assertEqual(result.status_code, status.HTTP_200_OK)
-        self.assertEqual(result.data, serializer.data)
+        self.assertEqual(result.data["results"], serializer.data)
 
     def test_route_detail(self) -> None:
         test_route = sample_route()
@@ -227,7 +229,26 @@ class AuthenticatedAirportApiTests(TestCase):
         flight = Flight.objects.all()
         serializer = FlightListSerializer(flight, many=True)
         self.assertEqual(result.status_code, status.HTTP_200_OK)
-        self.assertEqual(result.data, serializer.data)
+        self.assertEqual(result.data["results"], serializer.data)
+
+    def test_flight_list_cursor_pagination(self) -> None:
+        flights = [
+            sample_flight(departure_time=f"2023-10-{day}") for day in (20, 18, 19, 18, 21)
+        ]
+        expected = [
+            flight.id for flight in sorted(flights, key=lambda f: (f.departure_time, f.id))
+        ]
+
+        ids = []
+        url = f"{FLIGHT_URL}?page_size=2"
+        while url:
+            result = self.client.get(url)
+            self.assertEqual(result.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(result.data["results"]), 2)
+            ids += [flight["id"] for flight in result.data["results"]]
+            url = result.data["next"]
+
+        self.assertEqual(ids, expected)
 
     def test_flight_detail(self) -> None:
         test_flight = sample_flight()
@@ -253,7 +274,7 @@ class AuthenticatedAirportApiTests(TestCase):
 
         queryset_url = f"{FLIGHT_URL}?source_airport={flight1.route.source.name}"
         result = self.client.get(queryset_url)
-        result_data = [(key, value) for key, value in result.data[0].items()]
+        result_data = [(key, value) for key, value in result.data["results"][0].items()]
         response_data = {k[0]: k[1] for k in result_data}
 
         serializer1 = FlightListSerializer(flight1)
@@ -274,7 +295,7 @@ class AuthenticatedAirportApiTests(TestCase):
 
         queryset_url = f"{FLIGHT_URL}?destination_airport={flight1.route.destination.name}"
         result = self.client.get(queryset_url)
-        result_data = [(key, value) for key, value in result.data[0].items()]
+        result_data = [(key, value) for key, value in result.data["results"][0].items()]
         response_data = {k[0]: k[1] for k in result_data}
 
         serializer1 = FlightListSerializer(flight1)
@@ -285,6 +306,25 @@ class AuthenticatedAirportApiTests(TestCase):
         self.assertNotIn(serializer2.data["destination"], response_data["destination"])
         self.assertNotIn(serializer3.data["destination"], response_data["destination"])
 
+    def test_filter_flight_by_destination_city_and_airport(self) -> None:
+        gatwick = Airport.objects.create(name="Gatwick", closest_big_city="London")
+        orly = Airport.objects.create(name="Orly", closest_big_city="Paris")
+        flight1 = sample_flight(route=sample_route(destination=gatwick))
+        flight2 = sample_flight(route=sample_route(destination=orly))
+
+        result = self.client.get(FLIGHT_URL, {"destination_city": "lond"})
+        ids = [flight["id"] for flight in result.data["results"]]
+        self.assertIn(flight1.id, ids)
+        self.assertNotIn(flight2.id, ids)
+
+        result = self.client.get(
+            FLIGHT_URL, {"destination_city": "paris", "destination_airport": "orly"}
+        )
+        self.assertEqual([flight["id"] for flight in result.data["results"]], [flight2.id])
+
+        result = self.client.get(FLIGHT_URL, {"destination_airport": "Nowhere"})
+        self.assertEqual(result.data["results"], [])
+
     def test_filter_flight_by_departure_time(self) -> None:
         flight1 = sample_flight()
         flight2 = sample_flight(departure_time="2023-10-20")
@@ -296,7 +336,7 @@ class AuthenticatedAirportApiTests(TestCase):
         serializer1 = FlightListSerializer(flight1)
         serializer2 = FlightListSerializer(flight2)
         serializer3 = FlightListSerializer(flight3)
-        result_data = [(key, value) for key, value in result.data[0].items()]
+        result_data = [(key, value) for key, value in result.data["results"][0].items()]
         response_data = {k[0]: k[1] for k in result_data}
         data_to_check = response_data["departure_time"].split("T00")[0]
 
@@ -304,6 +344,29 @@ class AuthenticatedAirportApiTests(TestCase):
         self.assertNotIn(serializer2.data["departure_time"], data_to_check)
         self.assertNotIn(serializer3.data["departure_time"], data_to_check)
 
+    def test_filter_flight_by_departure_range(self) -> None:
+        flight1 = sample_flight(departure_time="2023-10-20 23:59")
+        flight2 = sample_flight(departure_time="2023-10-21 08:00")
+        flight3 = sample_flight(departure_time="2023-10-22 00:00")
+
+        result = self.client.get(
+            FLIGHT_URL, {"departure_from": "2023-10-21", "departure_to": "2023-10-21"}
+        )
+        self.assertEqual([flight["id"] for flight in result.data["results"]], [flight2.id])
+
+        result = self.client.get(
+            FLIGHT_URL, {"departure_from": "2023-10-20T12:00", "departure_to": "2023-10-22T00:00"}
+        )
+        self.assertEqual(
+            [flight["id"] for flight in result.data["results"]], [flight1.id, flight2.id]
+        )
+        self.assertNotIn(flight3.id, [flight["id"] for flight in result.data["results"]])
+
+    def test_filter_flight_by_invalid_departure(self) -> None:
+        result = self.client.get(FLIGHT_URL, {"departure_time": "23-10-2023"})
+
+        self.assertEqual(result.status_code, status.HTTP_400_BAD_REQUEST)
+
 
 class AdminApiTests(TestCase):
     def setUp(self) -> None:
@@ -0,0 +1,118 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airport.caching import response_cache
+from airport.tests.test_airport_api import sample_crew, sample_flight
+
+ASYNC_FLIGHT_URL = reverse("airport:async-flight-list")
+ASYNC_ROUTE_URL = reverse("airport:async-route-list")
+ASYNC_AIRPORT_URL = reverse("airport:async-airport-list")
+
+
+def async_flight_detail_url(flight_id: int) -> str:
+    return reverse("airport:async-flight-detail", args=[flight_id])
+
+
+class AsyncReadViewTests(TestCase):
+    def setUp(self) -> None:
+        response_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="testpass",
+        )
+        self.async_client = AsyncClient()
+        self.auth = {"Authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.flights = [
+            sample_flight(departure_time=f"2023-10-{day}", arrival_time=f"2023-10-{day}")
+            for day in (17, 18, 19)
+        ]
+        self.flights[0].crew.add(sample_crew())
+
+    async def async_get(self, url: str, params: dict | None = None):
+        return await self.async_client.get(url, params, headers=self.auth)
+
+    async def sync_get(self, url: str, params: dict | None = None):
+        return (await sync_to_async(self.client.get)(url, params)).data
+
+    async def test_requires_authentication(self) -> None:
+        result = await AsyncClient().get(ASYNC_FLIGHT_URL)
+        self.assertEqual(result.status_code, 401)
+        self.assertIn("Bearer", result["WWW-Authenticate"])
+
+        result = await AsyncClient().get(
+            ASYNC_AIRPORT_URL, headers={"Authorization": "Bearer nonsense"}
+        )
+        self.assertEqual(result.status_code, 401)
+
+        result = await self.async_client.post(ASYNC_AIRPORT_URL, headers=self.auth)
+        self.assertEqual(result.status_code, 405)
+
+    @override_settings(
+        REST_FRAMEWORK={"DEFAULT_THROTTLE_RATES": {"catalog": "2/minute"}}
+    )
+    async def test_throttled_as_the_viewsets(self) -> None:
+        caches["throttle"].clear()
+        results = [await self.async_get(ASYNC_AIRPORT_URL) for _ in range(3)]
+
+        self.assertEqual([result.status_code for result in results], [200, 200, 429])
+        self.assertIn("Retry-After", results[-1])
+        # Counted with the sync viewset requests of the same scope
+        result = await sync_to_async(self.client.get)(reverse("airport:route-list"))
+        self.assertEqual(result.status_code, 429)
+
+    async def test_flight_list_pages_and_filters(self) -> None:
+        expected = (await self.sync_get(reverse("airport:flight-list")))["results"]
+
+        first = (await self.async_get(ASYNC_FLIGHT_URL, {"page_size": 2})).json()
+        second = (await self.async_get(first["next"])).json()
+
+        self.assertEqual(first["results"] + second["results"], expected)
+        self.assertIsNone(second["next"])
+
+        filtered = (
+            await self.async_get(
+                ASYNC_FLIGHT_URL,
+                {"departure_from": "2023-10-18", "source_city": "London", "with_count": 1},
+            )
+        ).json()
+        self.assertEqual(filtered["count"], 2)
+        self.assertEqual(filtered["results"], expected[1:])
+
+    async def test_invalid_params(self) -> None:
+        for params in ({"departure_to": "someday"}, {"cursor": "???"}):
+            result = await self.async_get(ASYNC_FLIGHT_URL, params)
+            self.assertEqual(result.status_code, 400)
+
+    async def test_flight_detail_matches_sync_view(self) -> None:
+        flight = self.flights[0]
+        expected = await self.sync_get(reverse("airport:flight-detail", args=[flight.id]))
+
+        result = await self.async_get(async_flight_detail_url(flight.id))
+
+        self.assertEqual(result.json(), expected)
+        self.assertEqual(
+            (await self.async_get(async_flight_detail_url(0))).status_code, 404
+        )
+
+    async def test_route_and_airport_lists_match_sync_views(self) -> None:
+        routes = (await self.async_get(ASYNC_ROUTE_URL)).json()
+        airports = (await self.async_get(ASYNC_AIRPORT_URL)).json()
+
+        self.assertEqual(
+            routes["results"],
+            (await self.sync_get(reverse("airport:route-list")))["results"],
+        )
+        self.assertEqual(
+            sorted(airports, key=lambda airport: airport["id"]),
+            sorted(
+                await self.sync_get(reverse("airport:airport-list")),
+                key=lambda airport: airport["id"],
+            ),
+        )
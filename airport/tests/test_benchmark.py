@@ -0,0 +1,58 @@
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from airport.benchmark import PREFIX, delete_benchmark_data, generate_tickets
+from airport.models import Flight
+from orders.models import Order, SeatMap, Ticket
+
+
+class BenchmarkDataTests(TestCase):
+    def test_generate_tickets(self) -> None:
+        user_ids = generate_tickets(500, users=5)
+
+        self.assertEqual(len(user_ids), 5)
+        self.assertEqual(Ticket.objects.count(), 500)
+        self.assertEqual(Order.objects.count(), 167)
+        self.assertEqual(SeatMap.objects.inconsistent(), [])
+
+        delete_benchmark_data()
+
+        self.assertFalse(Ticket.objects.exists())
+        self.assertFalse(Flight.objects.exists())
+        self.assertFalse(
+            get_user_model().objects.filter(email__startswith=PREFIX).exists()
+        )
+
+    def test_benchmark_api_reports_json(self) -> None:
+        out = io.StringIO()
+        call_command(
+            "benchmark_api",
+            tickets=300,
+            repeat=2,
+            order_sizes=[2],
+            stdout=out,
+            stderr=io.StringIO(),
+        )
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(report["meta"]["tickets"], 300)
+        scenario = report["scenarios"]["order_create_2_tickets"]
+        self.assertEqual(
+            set(scenario),
+            {
+                "min_ms",
+                "p50_ms",
+                "p95_ms",
+                "p99_ms",
+                "max_ms",
+                "queries",
+                "peak_memory_kib",
+                "response_bytes",
+            },
+        )
+        self.assertIn("flight_list_source_city", report["scenarios"])
+        self.assertFalse(Flight.objects.exists())
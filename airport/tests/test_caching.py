@@ -0,0 +1,208 @@
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.caching import DjangoCacheBackend, LocMemLRUBackend, response_cache
+from airport.models import Airport
+from airport.tests.test_airport_api import sample_flight
+from orders.models import Order, Ticket
+
+AIRPORT_URL = reverse("airport:airport-list")
+FLIGHT_URL = reverse("airport:flight-list")
+CACHE_STATS_URL = reverse("airport:cache-stats")
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self) -> None:
+        response_cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="testpass",
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_second_request_is_served_from_cache(self) -> None:
+        sample_flight()
+
+        first = self.client.get(FLIGHT_URL)
+        with self.assertNumQueries(0):
+            second = self.client.get(FLIGHT_URL)
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(first.content, second.content)
+
+    def test_query_params_are_part_of_the_key(self) -> None:
+        self.client.get(FLIGHT_URL, {"source_city": "London"})
+
+        result = self.client.get(FLIGHT_URL, {"source_city": "Paris"})
+
+        self.assertEqual(result["X-Cache"], "MISS")
+
+    def test_host_is_part_of_the_key(self) -> None:
+        sample_flight()
+        self.client.get(FLIGHT_URL)
+
+        with self.settings(ALLOWED_HOSTS=["testserver", "other.example.com"]):
+            result = self.client.get(FLIGHT_URL, HTTP_HOST="other.example.com")
+
+        self.assertEqual(result["X-Cache"], "MISS")
+
+    def test_model_changes_invalidate_responses(self) -> None:
+        Airport.objects.create(name="Heathrow", closest_big_city="London")
+        self.client.get(AIRPORT_URL)
+
+        Airport.objects.create(name="Orly", closest_big_city="Paris")
+        result = self.client.get(AIRPORT_URL)
+
+        self.assertEqual(result["X-Cache"], "MISS")
+        self.assertEqual(len(result.json()), 2)
+
+    def test_ticket_sale_invalidates_flight_list(self) -> None:
+        flight = sample_flight()
+        self.client.get(FLIGHT_URL)
+
+        Ticket.objects.create(
+            flight=flight, order=Order.objects.create(user=self.user), row=1, seat=1
+        )
+        result = self.client.get(FLIGHT_URL)
+
+        self.assertEqual(result["X-Cache"], "MISS")
+        self.assertEqual(
+            result.json()["results"][0]["tickets_available"],
+            flight.airplane.capacity - 1,
+        )
+
+    def test_browsable_api_is_not_cached(self) -> None:
+        self.client.get(AIRPORT_URL, HTTP_ACCEPT="text/html")
+        result = self.client.get(AIRPORT_URL, HTTP_ACCEPT="text/html")
+
+        self.assertNotIn("X-Cache", result)
+
+    def test_cache_stats_for_admin_only(self) -> None:
+        self.client.get(AIRPORT_URL)
+        self.client.get(AIRPORT_URL)
+
+        self.assertEqual(
+            self.client.get(CACHE_STATS_URL).status_code, status.HTTP_403_FORBIDDEN
+        )
+
+        self.user.is_staff = True
+        self.user.save()
+        result = self.client.get(CACHE_STATS_URL)
+
+        self.assertEqual(result.data["hits"], 1)
+        self.assertEqual(result.data["misses"], 1)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self) -> None:
+        response_cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="testpass",
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight()
+        self.url = reverse("airport:flight-detail", args=[self.flight.id])
+
+    def test_matching_etag_returns_not_modified(self) -> None:
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.assertNumQueries(0):
+            result = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(result.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(result["ETag"], etag)
+        self.assertEqual(result.content, b"")
+
+    def test_etag_changes_after_write(self) -> None:
+        etag = self.client.get(self.url)["ETag"]
+
+        self.flight.arrival_time = "2023-10-19"
+        self.flight.save()
+        result = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(result["ETag"], etag)
+
+    def later(self, seconds: float = 2):
+        return mock.patch(
+            "airport.caching.time.time", return_value=time.time() + seconds
+        )
+
+    def test_if_modified_since(self) -> None:
+        with self.later():
+            last_modified = self.client.get(self.url)["Last-Modified"]
+
+            result = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(result.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_no_last_modified_in_the_second_of_a_write(self) -> None:
+        with self.later():
+            response_cache.bump("flight")
+            result = self.client.get(self.url)
+
+            self.assertNotIn("Last-Modified", result)
+            result = self.client.get(
+                self.url, HTTP_IF_MODIFIED_SINCE="Tue, 01 Jan 2999 00:00:00 GMT"
+            )
+
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+
+    def test_every_airport_viewset_sends_validators(self) -> None:
+        for name in ("crew", "airplane_type", "airplane", "airport", "route", "flight"):
+            with self.later():
+                result = self.client.get(reverse(f"airport:{name}-list"))
+
+            self.assertIn("ETag", result, name)
+            self.assertIn("Last-Modified", result, name)
+
+
+class ResponseCacheBackendTests(TestCase):
+    def test_lru_backend_evicts_oldest_entries(self) -> None:
+        backend = LocMemLRUBackend(max_entries=2)
+        backend.set("a", 1)
+        backend.set("b", 2)
+        backend.get("a")
+        backend.set("c", 3)
+
+        self.assertEqual(backend.get("a"), 1)
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(len(backend), 2)
+
+    def test_lru_backend_expires_entries_and_versions(self) -> None:
+        backend = LocMemLRUBackend(timeout=0.05)
+        backend.set("a", 1)
+        versions = backend.versions(["flight"])
+        self.assertEqual(backend.get("a"), 1)
+        self.assertEqual(backend.versions(["flight"]), versions)
+
+        time.sleep(0.06)
+
+        self.assertIsNone(backend.get("a"))
+        self.assertNotEqual(backend.versions(["flight"]), versions)
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_django_cache_backend_versions(self) -> None:
+        backend = DjangoCacheBackend()
+        before = backend.versions(["flight", "route"])
+        self.assertEqual(before, backend.versions(["flight", "route"]))
+
+        backend.bump("flight")
+        after = backend.versions(["flight", "route"])
+
+        self.assertNotEqual(before["flight"], after["flight"])
+        self.assertEqual(before["route"], after["route"])
+        backend.set("key", b"value")
+        self.assertEqual(backend.get("key"), b"value")
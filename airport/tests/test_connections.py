@@ -0,0 +1,167 @@
+from datetime import date, datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.connections import FlightGraph, connection_graph
+from airport.models import Route
+from airport.tests.test_airport_api import sample_airplane, sample_airport
+
+ITINERARIES_URL = reverse("airport:itineraries")
+DAY = date.today() + timedelta(days=10)
+
+
+def at(hour: int, minute: int = 0, days: int = 0) -> datetime:
+    return datetime.combine(DAY, datetime.min.time()) + timedelta(
+        days=days, hours=hour, minutes=minute
+    )
+
+
+class ConnectionSearchTests(TestCase):
+    def setUp(self) -> None:
+        self.airplane = sample_airplane()
+        self.a, self.b, self.c, self.d = (
+            sample_airport(name=name) for name in ("A", "B", "C", "D")
+        )
+        self.graph = FlightGraph(ttl=3600)
+
+    def fly(self, source, destination, departure: datetime, hours: int = 2):
+        route, _ = Route.objects.get_or_create(source=source, destination=destination)
+        return route.flight.create(
+            airplane=self.airplane,
+            departure_time=departure,
+            arrival_time=departure + timedelta(hours=hours),
+        )
+
+    def flight_ids(self, itineraries) -> list[list[int]]:
+        return [[leg.flight for leg in legs] for legs in itineraries]
+
+    def test_direct_and_connecting_itineraries(self) -> None:
+        direct = self.fly(self.a, self.c, at(18), hours=3)
+        first = self.fly(self.a, self.b, at(8))
+        second = self.fly(self.b, self.c, at(11))
+        self.fly(self.b, self.c, at(10, 30))
+
+        itineraries = self.graph.search(self.a.id, self.c.id, DAY)
+
+        self.assertIn([first.id, second.id], self.flight_ids(itineraries))
+        self.assertEqual(self.flight_ids(itineraries)[-1], [direct.id])
+        arrivals = [legs[-1].arrival_time for legs in itineraries]
+        self.assertEqual(arrivals, sorted(arrivals))
+        for legs in itineraries:
+            for arriving, leaving in zip(legs, legs[1:]):
+                self.assertGreaterEqual(
+                    leaving.departure_time - arriving.arrival_time,
+                    timedelta(minutes=60),
+                )
+
+    def test_leg_limit_layover_and_day(self) -> None:
+        self.fly(self.a, self.b, at(8))
+        self.fly(self.b, self.c, at(11))
+        self.fly(self.c, self.d, at(15))
+        self.fly(self.a, self.d, at(9, days=1))
+
+        self.assertEqual(self.graph.search(self.a.id, self.d.id, DAY, max_legs=2), [])
+        self.assertEqual(
+            len(self.graph.search(self.a.id, self.d.id, DAY, max_legs=3)), 1
+        )
+        self.assertEqual(
+            self.graph.search(
+                self.a.id, self.d.id, DAY, max_legs=3, min_layover=timedelta(hours=2)
+            ),
+            [],
+        )
+
+    def test_graph_is_patched_when_flights_change(self) -> None:
+        flight = self.fly(self.a, self.b, at(8))
+        self.assertEqual(len(self.graph.search(self.a.id, self.b.id, DAY)), 1)
+
+        flight.departure_time = at(8, days=1)
+        flight.save()
+        self.graph.mark_dirty([flight.id])
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.graph.search(self.a.id, self.b.id, DAY), [])
+        self.assertEqual(len(self.graph), 1)
+
+        self.graph.mark_dirty([flight.id])
+        flight.delete()
+        self.graph.refresh()
+        self.assertEqual(len(self.graph), 0)
+
+
+    def test_flights_are_marked_dirty_again_after_commit(self) -> None:
+        flight = self.fly(self.a, self.b, at(8))
+        self.graph.refresh()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.graph.mark_dirty([flight.id])
+            # A search before the commit reads the rows and clears them
+            self.graph.refresh()
+
+        with self.assertNumQueries(1):
+            self.graph.refresh()
+
+
+class ItineraryApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="testpass",
+        )
+        self.client.force_authenticate(self.user)
+        connection_graph.invalidate()
+
+    def test_itineraries(self) -> None:
+        source, middle, destination = (
+            sample_airport(name=name) for name in ("Kyiv", "Warsaw", "Lisbon")
+        )
+        airplane = sample_airplane()
+        for route, departure in (
+            (Route.objects.create(source=source, destination=middle), at(8)),
+            (Route.objects.create(source=middle, destination=destination), at(12)),
+        ):
+            route.flight.create(
+                airplane=airplane,
+                departure_time=departure,
+                arrival_time=departure + timedelta(hours=2),
+            )
+
+        result = self.client.get(
+            ITINERARIES_URL,
+            {"source": source.id, "destination": destination.id, "date": DAY},
+        )
+
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        [itinerary] = result.data
+        self.assertEqual(itinerary["duration_minutes"], 360)
+        self.assertEqual(
+            [(leg["source"], leg["destination"]) for leg in itinerary["legs"]],
+            [("Kyiv", "Warsaw"), ("Warsaw", "Lisbon")],
+        )
+
+    def test_invalid_params(self) -> None:
+        result = self.client.get(ITINERARIES_URL, {"source": 1, "max_legs": 9})
+
+        self.assertEqual(result.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("destination", result.data)
+        self.assertIn("max_legs", result.data)
+
+    def test_min_layover_above_max_layover(self) -> None:
+        result = self.client.get(
+            ITINERARIES_URL,
+            {
+                "source": 1,
+                "destination": 2,
+                "date": DAY,
+                "min_layover": 120,
+                "max_layover": 60,
+            },
+        )
+
+        self.assertEqual(result.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("max_layover", result.data)
@@ -0,0 +1,109 @@
+from django.test import SimpleTestCase
+
+from airport_service.database import POOL_ENGINE, database_from_env
+from airport_service.db_pool.pool import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.closed = False
+        self.autocommit = True
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class DatabaseFromEnvTests(SimpleTestCase):
+    def test_postgresql_with_persistent_connections_by_default(self) -> None:
+        database = database_from_env({"POSTGRES_USER": "airport"})
+
+        self.assertEqual(database["ENGINE"], "django.db.backends.postgresql")
+        self.assertEqual(database["USER"], "airport")
+        self.assertEqual(database["CONN_MAX_AGE"], 60)
+        self.assertTrue(database["CONN_HEALTH_CHECKS"])
+        self.assertFalse(database["DISABLE_SERVER_SIDE_CURSORS"])
+
+    def test_connection_reuse_is_configurable(self) -> None:
+        database = database_from_env(
+            {
+                "DB_CONN_MAX_AGE": "none",
+                "DB_CONN_HEALTH_CHECKS": "false",
+                "DB_DISABLE_SERVER_SIDE_CURSORS": "1",
+                "DB_CONNECT_TIMEOUT": "5",
+            }
+        )
+
+        self.assertIsNone(database["CONN_MAX_AGE"])
+        self.assertFalse(database["CONN_HEALTH_CHECKS"])
+        self.assertTrue(database["DISABLE_SERVER_SIDE_CURSORS"])
+        self.assertEqual(database["OPTIONS"], {"connect_timeout": 5})
+
+    def test_pool_disables_persistent_connections(self) -> None:
+        database = database_from_env(
+            {"DB_POOL": "true", "DB_CONN_MAX_AGE": "600", "DB_POOL_MAX_SIZE": "4"}
+        )
+
+        self.assertEqual(database["ENGINE"], POOL_ENGINE)
+        self.assertEqual(database["CONN_MAX_AGE"], 0)
+        self.assertEqual(database["OPTIONS"]["pool"]["max_size"], 4)
+
+    def test_sqlite(self) -> None:
+        database = database_from_env({"DB_ENGINE": "sqlite3"}, base_dir="/srv")
+
+        self.assertEqual(database["ENGINE"], "django.db.backends.sqlite3")
+        self.assertEqual(database["NAME"], "/srv/db.sqlite3")
+
+    def test_unknown_engine(self) -> None:
+        with self.assertRaises(ValueError):
+            database_from_env({"DB_ENGINE": "oracle"})
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def test_returned_connection_is_reused(self) -> None:
+        pool = ConnectionPool(max_size=2)
+
+        first = pool.get(FakeConnection)
+        pool.put(first)
+
+        self.assertIs(pool.get(FakeConnection), first)
+
+    def test_waits_for_a_free_slot(self) -> None:
+        pool = ConnectionPool(max_size=1, timeout=0.01)
+        pool.get(FakeConnection)
+
+        with self.assertRaises(PoolTimeout):
+            pool.get(FakeConnection)
+
+    def test_unusable_connections_are_replaced(self) -> None:
+        def check(connection) -> None:
+            raise ConnectionError
+
+        pool = ConnectionPool(max_size=1, check=check)
+        broken = pool.get(FakeConnection)
+        pool.put(broken)
+
+        self.assertIsNot(pool.get(FakeConnection), broken)
+        self.assertTrue(broken.closed)
+
+    def test_closed_and_idle_connections_are_not_reused(self) -> None:
+        pool = ConnectionPool(max_size=2, max_idle=0)
+        closed, idle = pool.get(FakeConnection), pool.get(FakeConnection)
+        closed.close()
+        pool.put(closed)
+        pool.put(idle)
+
+        self.assertEqual(pool.idle, 1)
+        self.assertNotIn(pool.get(FakeConnection), (closed, idle))
+        self.assertTrue(idle.closed)
+
+    def test_connection_failing_to_reset_is_discarded(self) -> None:
+        def reset(connection) -> None:
+            raise ConnectionError
+
+        pool = ConnectionPool(max_size=1, reset=reset)
+        connection = pool.get(FakeConnection)
+        pool.put(connection)
+
+        self.assertEqual(pool.idle, 0)
+        self.assertTrue(connection.closed)
+        pool.get(FakeConnection)
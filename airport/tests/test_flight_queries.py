@@ -0,0 +1,75 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+
+from airport.caching import response_cache
+from airport.tests.test_airport_api import sample_flight, sample_route
+from airport.views import FlightViewSet
+from orders.models import Order, Ticket
+
+FLIGHT_URL = reverse("airport:flight-list")
+
+
+class FlightListQueryTests(TestCase):
+    def setUp(self) -> None:
+        response_cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="testpass",
+        )
+        self.client.force_authenticate(self.user)
+        self.order = Order.objects.create(user=self.user)
+
+    def sell_tickets(self, flight, rows: int) -> None:
+        Ticket.objects.bulk_create(
+            Ticket(flight=flight, order=self.order, row=row, seat=seat)
+            for row in range(1, rows + 1)
+            for seat in range(1, flight.airplane.seats_in_row + 1)
+        )
+
+    def flight_list_queryset(self, **params):
+        request = APIRequestFactory().get(FLIGHT_URL, params)
+        view = FlightViewSet(action_map={"get": "list"}, format_kwarg=None)
+        view.request = view.initialize_request(request)
+        return view.get_queryset()
+
+    def test_flight_list_query_count_is_constant(self) -> None:
+        sample_flight()
+        with self.assertNumQueries(1):
+            self.client.get(FLIGHT_URL)
+
+        for _ in range(5):
+            self.sell_tickets(sample_flight(), rows=3)
+        with self.assertNumQueries(1):
+            self.client.get(FLIGHT_URL)
+
+        with self.assertNumQueries(2):
+            self.client.get(FLIGHT_URL, {"source_city": "London"})
+
+    def test_flight_list_sql_has_no_distinct_or_group_by(self) -> None:
+        sample_flight()
+        sql = str(
+            self.flight_list_queryset(
+                source_airport="Test", destination_city="London", departure_from="2023-10-01"
+            ).query
+        ).upper()
+
+        self.assertNotIn("DISTINCT", sql)
+        self.assertNotIn("GROUP BY", sql)
+        self.assertNotIn("ORDERS_TICKET", sql)
+
+    def test_flight_list_plan_independent_of_ticket_count(self) -> None:
+        flight = sample_flight(route=sample_route())
+        plan_before = self.flight_list_queryset(departure_time="2023-10-17").explain()
+
+        self.sell_tickets(flight, rows=50)
+        for _ in range(3):
+            self.sell_tickets(sample_flight(), rows=20)
+        plan_after = self.flight_list_queryset(departure_time="2023-10-17").explain()
+
+        self.assertEqual(plan_before, plan_after)
+        self.assertNotIn("orders_ticket", plan_after)
+        self.assertNotIn("DISTINCT", plan_after.upper())
+        self.assertNotIn("GROUP BY", plan_after.upper())
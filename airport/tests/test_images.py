@@ -0,0 +1,146 @@
+import io
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.caching import response_cache
+from airport.images import THUMBNAIL_FOLDER, executor, process_crew_image
+from airport.models import Crew
+
+CREW_URL = reverse("airport:crew-list")
+
+
+def crew_detail_url(crew_id: int) -> str:
+    return reverse("airport:crew-detail", args=[crew_id])
+
+
+def sample_image(
+    size=(1600, 1200), mode="RGB", image_format="JPEG", color=(255, 0, 0)
+) -> bytes:
+    buffer = io.BytesIO()
+    Image.new(mode, size, color).save(buffer, image_format)
+    return buffer.getvalue()
+
+
+class CrewThumbnailTests(TestCase):
+    def setUp(self) -> None:
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(
+            MEDIA_ROOT=self.media_root, IMAGE_PROCESSING_WORKERS=0
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        caches["throttle"].clear()
+        response_cache.clear()
+
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="admin@admin.com", password="testpass", is_staff=True
+            )
+        )
+
+    def upload(self, content: bytes, name="photo.jpg", crew_id=None):
+        payload = {
+            "first_name": "Jane",
+            "last_name": "Doe",
+            "image": SimpleUploadedFile(name, content),
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            if crew_id is None:
+                return self.client.post(CREW_URL, payload, format="multipart")
+            return self.client.put(
+                crew_detail_url(crew_id), payload, format="multipart"
+            )
+
+    def test_upload_makes_thumbnails(self) -> None:
+        response = self.upload(sample_image())
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        crew = Crew.objects.get()
+        self.assertTrue(crew.image.name.startswith("uploads/crew/doe-"))
+        self.assertEqual(crew.thumbnails["source"], crew.image.name)
+        for size_name, size in (("small", 64), ("medium", 256), ("large", 1024)):
+            name = crew.thumbnails["sizes"][size_name]
+            self.assertTrue(name.startswith(THUMBNAIL_FOLDER))
+            with crew.image.storage.open(name) as file, Image.open(file) as image:
+                self.assertEqual(image.format, "WEBP")
+                self.assertEqual(max(image.size), size)
+                self.assertEqual(image.size[0] / image.size[1], 4 / 3)
+
+    def test_thumbnail_urls_in_list_and_detail(self) -> None:
+        self.upload(sample_image())
+        crew = Crew.objects.get()
+
+        listed = self.client.get(CREW_URL).data["results"][0]["thumbnails"]
+        detail = self.client.get(crew_detail_url(crew.pk)).data["thumbnails"]
+
+        self.assertEqual(listed, detail)
+        self.assertEqual(set(listed), {"small", "medium", "large"})
+        self.assertTrue(
+            listed["small"].startswith("http://testserver/media/uploads/crew/")
+        )
+
+    def test_no_thumbnails_until_processed(self) -> None:
+        with override_settings(IMAGE_PROCESSING_WORKERS=1):
+            with self.captureOnCommitCallbacks():
+                self.client.post(
+                    CREW_URL,
+                    {
+                        "first_name": "Jane",
+                        "last_name": "Doe",
+                        "image": SimpleUploadedFile("photo.jpg", sample_image()),
+                    },
+                    format="multipart",
+                )
+
+        response = self.client.get(CREW_URL)
+        self.assertEqual(response.data["results"][0]["thumbnails"], {})
+
+    def test_replacing_the_image_replaces_thumbnails(self) -> None:
+        self.upload(sample_image())
+        crew = Crew.objects.get()
+        old = crew.thumbnails["sizes"]
+
+        self.upload(
+            sample_image((100, 100), "RGBA", "PNG", (255, 0, 0, 128)),
+            name="new.png",
+            crew_id=crew.pk,
+        )
+
+        crew.refresh_from_db()
+        self.assertEqual(crew.thumbnails["source"], crew.image.name)
+        self.assertTrue(
+            all(not crew.image.storage.exists(name) for name in old.values())
+        )
+        with crew.image.storage.open(crew.thumbnails["sizes"]["large"]) as file:
+            with Image.open(file) as image:
+                # Never scaled up
+                self.assertEqual(image.size, (100, 100))
+                self.assertEqual(image.mode, "RGBA")
+
+    def test_thumbnails_of_a_replaced_image_are_dropped(self) -> None:
+        # Saved without running the queued job
+        crew = Crew(first_name="Jane", last_name="Doe")
+        crew.image.save("photo.jpg", SimpleUploadedFile("photo.jpg", sample_image()))
+        stale_image = crew.image.name
+        crew.image.save("other.jpg", SimpleUploadedFile("other.jpg", sample_image()))
+
+        process_crew_image(crew.pk, stale_image)
+
+        crew.refresh_from_db()
+        self.assertEqual(crew.thumbnails, {})
+        self.assertEqual(crew.image.storage.listdir(THUMBNAIL_FOLDER)[1], [])
+
+    def test_pool_size_follows_the_setting(self) -> None:
+        with override_settings(IMAGE_PROCESSING_WORKERS=3):
+            self.assertEqual(executor()._max_workers, 3)
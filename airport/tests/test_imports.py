@@ -0,0 +1,189 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.imports import import_schedule
+from airport.models import Flight
+from airport.tests.test_airport_api import sample_airplane, sample_crew, sample_route
+
+IMPORT_URL = reverse("airport:flight-bulk-import")
+
+
+class ImportScheduleTests(TestCase):
+    def setUp(self) -> None:
+        self.route = sample_route()
+        self.airplane = sample_airplane()
+        self.crew = [sample_crew(), sample_crew()]
+
+    def row(self, **params) -> dict:
+        default = {
+            "route": self.route.id,
+            "airplane": self.airplane.id,
+            "departure_time": "2024-01-01 10:00",
+            "arrival_time": "2024-01-01 14:00",
+            "crew": [member.id for member in self.crew],
+        }
+        default.update(params)
+        return default
+
+    def test_import_creates_flights_and_crew(self) -> None:
+        rows = [self.row(), self.row(crew=str(self.crew[0].id)), self.row(crew="")]
+
+        with self.assertNumQueries(20):
+            report = import_schedule(rows, batch_size=2)
+
+        self.assertEqual(report.created, 3)
+        self.assertEqual(report.errors, [])
+        flights = Flight.objects.order_by("id")
+        self.assertEqual(
+            [flight.crew.count() for flight in flights], [2, 1, 0]
+        )
+
+    def test_import_reports_row_errors(self) -> None:
+        rows = [
+            self.row(route=0),
+            self.row(departure_time="soon"),
+            self.row(),
+            self.row(crew=[self.crew[0].id, 0]),
+            "nonsense",
+        ]
+
+        report = import_schedule(rows)
+
+        self.assertEqual(report.created, 1)
+        self.assertEqual([error["row"] for error in report.errors], [1, 2, 4, 5])
+        self.assertIn("route", report.errors[0]["errors"])
+        self.assertIn("departure_time", report.errors[1]["errors"])
+        self.assertIn("crew", report.errors[2]["errors"])
+
+    def test_import_fixture_entries(self) -> None:
+        rows = [
+            {"model": "airport.crew", "pk": 1, "fields": {}},
+            {
+                "model": "airport.flight",
+                "pk": 1,
+                "fields": self.row(crew=f"{self.crew[0].id} {self.crew[1].id}"),
+            },
+        ]
+
+        report = import_schedule(rows)
+
+        self.assertEqual(report.skipped, 1)
+        self.assertEqual(report.created, 1)
+        self.assertEqual(Flight.objects.get().crew.count(), 2)
+
+    def test_import_command_csv(self) -> None:
+        crew = ";".join(str(member.id) for member in self.crew)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "schedule.csv")
+            with open(path, "w", newline="") as file:
+                file.write("route,airplane,departure_time,arrival_time,crew\n")
+                file.write(
+                    f"{self.route.id},{self.airplane.id},"
+                    f"2024-01-01,2024-01-02,{crew}\n"
+                )
+                file.write(f"0,{self.airplane.id},2024-01-01,2024-01-02,\n")
+            out, err = StringIO(), StringIO()
+
+            call_command("import_schedule", path, stdout=out, stderr=err)
+
+        self.assertIn("Created 1 flights", out.getvalue())
+        self.assertIn("Row 2", err.getvalue())
+        self.assertEqual(Flight.objects.get().crew.count(), 2)
+
+
+class ImportScheduleApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="admin@admin.com",
+            password="testpass",
+            is_staff=True,
+        )
+        self.client.force_authenticate(self.user)
+        self.route = sample_route()
+        self.airplane = sample_airplane()
+
+    def test_import_json_body(self) -> None:
+        payload = [
+            {
+                "route": self.route.id,
+                "airplane": self.airplane.id,
+                "departure_time": "2024-01-01",
+                "arrival_time": "2024-01-02",
+            },
+            {"route": self.route.id},
+        ]
+
+        result = self.client.post(IMPORT_URL, payload, format="json")
+
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        self.assertEqual(result.data["created"], 1)
+        self.assertEqual(result.data["errors"][0]["row"], 2)
+
+    def test_import_ndjson_upload(self) -> None:
+        row = {
+            "route": self.route.id,
+            "airplane": self.airplane.id,
+            "departure_time": "2024-01-01",
+            "arrival_time": "2024-01-02",
+        }
+        upload = SimpleUploadedFile(
+            "schedule.ndjson", (json.dumps(row) + "\n").encode() * 3
+        )
+
+        result = self.client.post(IMPORT_URL, {"file": upload}, format="multipart")
+
+        self.assertEqual(result.data["created"], 3)
+        self.assertEqual(Flight.objects.count(), 3)
+
+    def test_import_ndjson_reports_malformed_lines(self) -> None:
+        row = json.dumps(
+            {
+                "route": self.route.id,
+                "airplane": self.airplane.id,
+                "departure_time": "2024-01-01",
+                "arrival_time": "2024-01-02",
+            }
+        )
+        upload = SimpleUploadedFile(
+            "schedule.ndjson", f"{row}\n{{broken\n{row}\n".encode()
+        )
+
+        result = self.client.post(IMPORT_URL, {"file": upload}, format="multipart")
+
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        self.assertEqual(result.data["created"], 2)
+        self.assertEqual(result.data["errors"][0]["row"], 2)
+        errors = result.data["errors"][0]["errors"]
+        self.assertIn("Invalid JSON", errors["non_field_errors"])
+
+    def test_import_csv_upload_with_quoted_newlines(self) -> None:
+        crew = sample_crew(first_name="Ann")
+        content = (
+            "route,airplane,departure_time,arrival_time,crew\r\n"
+            f'{self.route.id},{self.airplane.id},2024-01-01T10:00,2024-01-01T12:00,"{crew.id}\r\n"\r\n'
+        )
+        upload = SimpleUploadedFile("schedule.csv", content.encode())
+
+        result = self.client.post(IMPORT_URL, {"file": upload}, format="multipart")
+
+        self.assertEqual(result.data["created"], 1)
+        self.assertEqual(list(Flight.objects.get().crew.all()), [crew])
+
+    def test_import_requires_admin(self) -> None:
+        self.user.is_staff = False
+        self.user.save()
+
+        result = self.client.post(IMPORT_URL, [], format="json")
+
+        self.assertEqual(result.status_code, status.HTTP_403_FORBIDDEN)
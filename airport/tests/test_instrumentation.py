@@ -0,0 +1,92 @@
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airport.caching import response_cache
+from airport.instrumentation import metrics_registry, percentiles
+from airport.tests.test_airport_api import sample_flight
+
+FLIGHT_URL = reverse("airport:flight-list")
+METRICS_URL = reverse("airport:metrics")
+ASYNC_AIRPORT_URL = reverse("airport:async-airport-list")
+
+
+class InstrumentationTests(TestCase):
+    def setUp(self) -> None:
+        response_cache.clear()
+        metrics_registry.clear()
+        self.user = get_user_model().objects.create_user(
+            email="admin@admin.com",
+            password="testpass",
+            is_staff=True,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight()
+
+    def test_server_timing_header(self) -> None:
+        response = self.client.get(FLIGHT_URL)
+
+        names = [
+            entry.split(";")[0].strip()
+            for entry in response["Server-Timing"].split(",")
+        ]
+        self.assertEqual(names, ["db", "render", "app", "total"])
+        self.assertRegex(
+            response["Server-Timing"], r'db;dur=[\d.]+;desc="[1-9]\d* queries"'
+        )
+
+    def test_metrics_are_aggregated_per_view_and_action(self) -> None:
+        for _ in range(3):
+            self.client.get(FLIGHT_URL, {"page_size": 5})
+        self.client.get(reverse("airport:flight-detail", args=[self.flight.id]))
+
+        response = self.client.get(METRICS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        flight_list = response.data["FlightViewSet.list"]
+        self.assertEqual(flight_list["count"], 3)
+        self.assertEqual(set(flight_list["duration_ms"]), {"p50", "p95", "p99"})
+        self.assertGreater(flight_list["queries"]["p99"], 0)
+        self.assertGreater(flight_list["response_bytes"]["p99"], 0)
+        self.assertEqual(response.data["FlightViewSet.retrieve"]["count"], 1)
+
+    def test_metrics_require_admin(self) -> None:
+        self.user.is_staff = False
+        self.user.save()
+
+        response = self.client.get(METRICS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+    def test_slow_queries_are_logged(self) -> None:
+        with self.assertLogs("airport.instrumentation", "WARNING") as logs:
+            self.client.get(FLIGHT_URL)
+
+        self.assertIn("FlightViewSet.list", logs.output[0])
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=10_000)
+    def test_fast_queries_are_not_logged(self) -> None:
+        with self.assertNoLogs("airport.instrumentation", "WARNING"):
+            self.client.get(FLIGHT_URL)
+
+    async def test_async_views_are_measured(self) -> None:
+        token = AccessToken.for_user(self.user)
+        response = await AsyncClient().get(
+            ASYNC_AIRPORT_URL, headers={"Authorization": f"Bearer {token}"}
+        )
+
+        self.assertIn("total;dur=", response["Server-Timing"])
+        metrics = metrics_registry.snapshot()["airport.async_views.airport_list"]
+        self.assertEqual(metrics["count"], 1)
+        self.assertGreater(metrics["queries"]["p50"], 0)
+
+    def test_percentiles(self) -> None:
+        self.assertEqual(
+            percentiles(list(range(1, 101))), {"p50": 51, "p95": 96, "p99": 100}
+        )
+        self.assertEqual(percentiles([]), {})
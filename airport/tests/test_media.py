@@ -0,0 +1,134 @@
+import os
+import shutil
+import tempfile
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from airport.images import thumbnail_name
+from airport_service.media import IMMUTABLE, REVALIDATE, cache_control
+
+UPLOAD = "uploads/crew/doe-0b8a3a3e-6a0c-4f1e-9a53-3b1f0d8c2e11.jpg"
+CONTENT = bytes(range(256)) * 4
+
+
+def media_url(path: str) -> str:
+    return reverse("media", args=[path])
+
+
+def read(response) -> bytes:
+    return b"".join(response.streaming_content)
+
+
+class MediaServingTests(TestCase):
+    def setUp(self) -> None:
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        os.makedirs(os.path.join(self.media_root, "uploads/crew"))
+        for name in (UPLOAD, "notes.txt"):
+            with open(os.path.join(self.media_root, name), "wb") as file:
+                file.write(CONTENT)
+
+    def test_serves_files_with_cache_headers(self) -> None:
+        response = self.client.get(media_url(UPLOAD))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(read(response), CONTENT)
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(response["Cache-Control"], IMMUTABLE)
+        self.assertIn("ETag", response)
+
+        response = self.client.get(media_url("notes.txt"))
+        self.assertEqual(response["Cache-Control"], REVALIDATE)
+
+    def test_hashed_and_uuid_names_are_immutable(self) -> None:
+        self.assertEqual(cache_control(UPLOAD), IMMUTABLE)
+        self.assertEqual(
+            cache_control(thumbnail_name(UPLOAD, "small", b"thumbnail")), IMMUTABLE
+        )
+        self.assertEqual(cache_control("uploads/crew/doe.jpg"), REVALIDATE)
+
+    def test_conditional_requests(self) -> None:
+        response = self.client.get(media_url(UPLOAD))
+
+        not_modified = self.client.get(
+            media_url(UPLOAD), headers={"If-None-Match": response["ETag"]}
+        )
+        self.assertEqual(not_modified.status_code, 304)
+        not_modified = self.client.get(
+            media_url(UPLOAD),
+            headers={"If-Modified-Since": response["Last-Modified"]},
+        )
+        self.assertEqual(not_modified.status_code, 304)
+        modified = self.client.get(
+            media_url(UPLOAD), headers={"If-None-Match": '"other"'}
+        )
+        self.assertEqual(modified.status_code, 200)
+
+    def test_byte_ranges(self) -> None:
+        for header, first, last in (
+            ("bytes=2-5", 2, 5),
+            ("bytes=1000-", 1000, 1023),
+            ("bytes=-4", 1020, 1023),
+            ("bytes=1020-5000", 1020, 1023),
+        ):
+            with self.subTest(header):
+                response = self.client.get(media_url(UPLOAD), headers={"Range": header})
+
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(read(response), CONTENT[first : last + 1])
+                self.assertEqual(
+                    response["Content-Range"], f"bytes {first}-{last}/1024"
+                )
+                self.assertEqual(response["Content-Length"], str(last - first + 1))
+
+    def test_ignored_and_unsatisfiable_ranges(self) -> None:
+        etag = self.client.get(media_url(UPLOAD))["ETag"]
+        for headers in (
+            {"Range": "bytes=0-1,4-5"},
+            {"Range": "items=0-1"},
+            {"Range": "bytes=5-2"},
+            {"Range": "bytes=0-1", "If-Range": '"other"'},
+        ):
+            with self.subTest(headers):
+                response = self.client.get(media_url(UPLOAD), headers=headers)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(read(response), CONTENT)
+
+        response = self.client.get(
+            media_url(UPLOAD), headers={"Range": "bytes=0-1", "If-Range": etag}
+        )
+        self.assertEqual(response.status_code, 206)
+
+        response = self.client.get(media_url(UPLOAD), headers={"Range": "bytes=1024-"})
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */1024")
+
+    @override_settings(MEDIA_SERVING="x-sendfile")
+    def test_x_sendfile(self) -> None:
+        response = self.client.get(media_url(UPLOAD))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["X-Sendfile"], os.path.join(self.media_root, UPLOAD))
+        self.assertEqual(response["Cache-Control"], IMMUTABLE)
+
+    @override_settings(
+        MEDIA_SERVING="x-accel-redirect", MEDIA_ACCEL_REDIRECT_PREFIX="/internal/"
+    )
+    def test_x_accel_redirect(self) -> None:
+        response = self.client.get(media_url(UPLOAD))
+
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["X-Accel-Redirect"], f"/internal/{UPLOAD}")
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+
+    def test_only_files_in_media_root(self) -> None:
+        for path in ("missing.jpg", "uploads/crew", "../settings.py"):
+            with self.subTest(path):
+                self.assertEqual(self.client.get(media_url(path)).status_code, 404)
+        self.assertEqual(self.client.post(media_url(UPLOAD)).status_code, 405)
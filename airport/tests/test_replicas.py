@@ -0,0 +1,183 @@
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import OperationalError, connections
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airport.caching import response_cache
+from airport.models import Airport
+from airport.replicas import (
+    STICKY_KEY,
+    ReplicaRouter,
+    RoutingState,
+    _state,
+    pin_to_primary,
+    pinned_to_primary,
+    replica_lag_cache,
+)
+
+REPLICA = "replica"
+AIRPORT_URL = reverse("airport:airport-list")
+ASYNC_AIRPORT_URL = reverse("airport:async-airport-list")
+
+
+@override_settings(
+    DATABASE_REPLICAS=[REPLICA],
+    REPLICA_STICKY_SECONDS=10,
+    REPLICA_MAX_LAG=5,
+    REPLICA_LAG_CHECK_INTERVAL=0,
+)
+class ReplicaRoutingTests(TestCase):
+    """A second in-memory SQLite database stands in for the replica.
+
+    It is added after the test runner set up the databases, so it is not
+    wrapped in a transaction and is emptied after every test instead.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        replica = {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+        connections.settings[REPLICA] = connections.configure_settings(
+            {"default": {}, REPLICA: replica}
+        )[REPLICA]
+        call_command("migrate", database=REPLICA, verbosity=0)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+
+    def setUp(self) -> None:
+        caches["shared"].clear()
+        response_cache.clear()
+        replica_lag_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="testpass",
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Airport.objects.create(name="Primary", closest_big_city="Kyiv")
+        Airport.objects.using(REPLICA).create(name="Replica", closest_big_city="Kyiv")
+
+    def tearDown(self) -> None:
+        Airport.objects.using(REPLICA).all().delete()
+
+    def airport_names(self) -> list[str]:
+        response = self.client.get(AIRPORT_URL)
+        return [airport["name"] for airport in response.data]
+
+    def test_safe_requests_read_from_replica(self) -> None:
+        self.assertEqual(self.airport_names(), ["Replica"])
+
+    def test_writes_go_to_primary(self) -> None:
+        self.user.is_staff = True
+        self.user.save()
+
+        response = self.client.post(
+            AIRPORT_URL, {"name": "New", "closest_big_city": "Lviv"}
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Airport.objects.filter(name="New").exists())
+        self.assertFalse(Airport.objects.using(REPLICA).filter(name="New").exists())
+
+    def test_user_reads_from_primary_after_own_write(self) -> None:
+        self.user.is_staff = True
+        self.user.save()
+        self.client.post(AIRPORT_URL, {"name": "New", "closest_big_city": "Lviv"})
+
+        self.assertEqual(self.airport_names(), ["Primary", "New"])
+
+        other = APIClient()
+        other.force_authenticate(
+            get_user_model().objects.create_user(email="other@user.com")
+        )
+        response = other.get(AIRPORT_URL, {"page": 1})
+        self.assertEqual([airport["name"] for airport in response.data], ["Replica"])
+
+    def test_stickiness_is_kept_in_the_shared_cache(self) -> None:
+        pin_to_primary(self.user.pk)
+
+        self.assertTrue(caches["shared"].get(STICKY_KEY.format(self.user.pk)))
+        self.assertIsNone(caches["default"].get(STICKY_KEY.format(self.user.pk)))
+        self.assertTrue(pinned_to_primary(self.user))
+
+    @override_settings(REPLICA_STICKY_SECONDS=0)
+    def test_sticky_window_can_be_disabled(self) -> None:
+        self.user.is_staff = True
+        self.user.save()
+        self.client.post(AIRPORT_URL, {"name": "New", "closest_big_city": "Lviv"})
+
+        self.assertEqual(self.airport_names(), ["Replica"])
+
+    def test_lagging_replica_is_skipped(self) -> None:
+        with mock.patch("airport.replicas.replica_lag", return_value=60):
+            self.assertEqual(self.airport_names(), ["Primary"])
+
+    def test_unreachable_replica_is_skipped(self) -> None:
+        with mock.patch("airport.replicas.replica_lag", side_effect=OperationalError):
+            self.assertEqual(self.airport_names(), ["Primary"])
+
+    def test_responses_read_from_a_replica_are_not_cached(self) -> None:
+        # Committed and versioned, but not yet on a replica measured at lag 0
+        Airport.objects.create(name="New", closest_big_city="Lviv")
+
+        self.assertEqual(self.airport_names(), ["Replica"])
+        response = self.client.get(AIRPORT_URL)
+        self.assertNotIn("X-Cache", response)
+        self.assertNotIn("ETag", response)
+
+        Airport.objects.using(REPLICA).create(name="New", closest_big_city="Lviv")
+        self.assertEqual(self.airport_names(), ["Replica", "New"])
+
+    def test_order_list_reads_from_primary(self) -> None:
+        with self.assertNumQueries(0, using=REPLICA):
+            self.client.get(reverse("orders:orders-list"))
+
+    async def test_async_views_read_from_replica(self) -> None:
+        token = await sync_to_async(AccessToken.for_user)(self.user)
+        response = await AsyncClient().get(
+            ASYNC_AIRPORT_URL, headers={"Authorization": f"Bearer {token}"}
+        )
+
+        self.assertEqual([airport["name"] for airport in response.json()], ["Replica"])
+
+
+class ReplicaRouterTests(TestCase):
+    def route(self, state: RoutingState) -> str | None:
+        token = _state.set(state)
+        try:
+            return ReplicaRouter().db_for_read(Airport)
+        finally:
+            _state.reset(token)
+
+    @override_settings(DATABASE_REPLICAS=[REPLICA])
+    def test_reads_after_a_write_use_primary(self) -> None:
+        state = RoutingState(replica_reads=True)
+        token = _state.set(state)
+        try:
+            ReplicaRouter().db_for_write(Airport)
+        finally:
+            _state.reset(token)
+
+        self.assertTrue(state.wrote)
+        self.assertIsNone(self.route(state))
+
+    def test_reads_outside_requests_use_primary(self) -> None:
+        self.assertIsNone(ReplicaRouter().db_for_read(Airport))
+
+    def test_without_replicas_reads_use_primary(self) -> None:
+        state = RoutingState(replica_reads=True)
+
+        self.assertIsNone(self.route(state))
+        self.assertFalse(state.replica_reads)
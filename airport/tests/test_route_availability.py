@@ -0,0 +1,131 @@
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.imports import import_schedule
+from airport.models import RouteAvailability
+from airport.tests.test_airport_api import sample_airplane, sample_flight, sample_route
+from orders.models import Order, Ticket
+
+
+def availability_url(route_id: int) -> str:
+    return reverse("airport:route-availability", args=[route_id])
+
+
+class RouteAvailabilityTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="testpass",
+        )
+        self.client.force_authenticate(self.user)
+        self.route = sample_route()
+        self.airplane = sample_airplane(rows=10, seats_in_row=4)
+        self.order = Order.objects.create(user=self.user)
+
+    def create_flight(self, departure: str = "2023-10-17 08:00"):
+        with self.captureOnCommitCallbacks(execute=True):
+            return sample_flight(
+                route=self.route,
+                airplane=self.airplane,
+                departure_time=departure,
+                arrival_time=departure,
+            )
+
+    def summary(self) -> list[tuple]:
+        return list(
+            RouteAvailability.objects.filter(route=self.route).values_list(
+                "date", "flights", "capacity", "sold"
+            )
+        )
+
+    def test_summary_follows_flights_and_tickets(self) -> None:
+        morning = self.create_flight("2023-10-17 08:00")
+        evening = self.create_flight("2023-10-17 20:00")
+        Ticket.objects.create(order=self.order, flight=morning, row=1, seat=1)
+        ticket = Ticket.objects.create(order=self.order, flight=morning, row=1, seat=2)
+
+        [(day, flights, capacity, sold)] = self.summary()
+        self.assertEqual((str(day), flights, capacity, sold), ("2023-10-17", 2, 80, 2))
+
+        ticket.delete()
+        self.assertEqual(self.summary()[0][3], 1)
+
+        morning.departure_time = "2023-10-18 08:00"
+        with self.captureOnCommitCallbacks(execute=True):
+            morning.save()
+        self.assertEqual(
+            [(str(day), flights, sold) for day, flights, _, sold in self.summary()],
+            [("2023-10-17", 1, 0), ("2023-10-18", 1, 1)],
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            evening.delete()
+        self.assertEqual([str(row[0]) for row in self.summary()], ["2023-10-18"])
+
+    def test_summary_follows_airplane_and_bulk_import(self) -> None:
+        self.create_flight()
+        self.airplane.rows = 20
+        self.airplane.save()
+        self.assertEqual(self.summary()[0][2], 80)
+
+        import_schedule(
+            [
+                {
+                    "route": self.route.id,
+                    "airplane": self.airplane.id,
+                    "departure_time": "2023-10-17 12:00",
+                    "arrival_time": "2023-10-17 14:00",
+                }
+            ]
+        )
+        self.assertEqual(self.summary()[0][1:3], (2, 160))
+
+    def test_rebuild_command(self) -> None:
+        flight = self.create_flight()
+        Ticket.objects.create(order=self.order, flight=flight, row=1, seat=1)
+        RouteAvailability.objects.update(sold=30, flights=9)
+
+        call_command("rebuild_route_availability", verbosity=0)
+
+        self.assertEqual(self.summary()[0][1:], (1, 40, 1))
+
+    def test_availability_endpoint(self) -> None:
+        self.create_flight("2023-10-17 08:00")
+        flight = self.create_flight("2023-10-18 08:00")
+        Ticket.objects.create(order=self.order, flight=flight, row=1, seat=1)
+
+        with self.assertNumQueries(1):
+            result = self.client.get(
+                availability_url(self.route.id), {"date_from": "2023-10-18"}
+            )
+
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            result.data,
+            [
+                {
+                    "date": "2023-10-18",
+                    "flights": 1,
+                    "capacity": 40,
+                    "sold": 1,
+                    "available": 39,
+                }
+            ],
+        )
+
+    def test_availability_endpoint_errors(self) -> None:
+        result = self.client.get(availability_url(self.route.id + 1))
+        self.assertEqual(result.status_code, status.HTTP_404_NOT_FOUND)
+
+        result = self.client.get(availability_url(self.route.id))
+        self.assertEqual(result.data, [])
+
+        result = self.client.get(
+            availability_url(self.route.id), {"date_to": "someday"}
+        )
+        self.assertEqual(result.status_code, status.HTTP_400_BAD_REQUEST)
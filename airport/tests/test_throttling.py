@@ -0,0 +1,152 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+from rest_framework.request import Request
+
+from airport.caching import response_cache
+from airport.throttling import SlidingWindowRateThrottle, throttle_scope
+
+AIRPORT_URL = reverse("airport:airport-list")
+ORDER_URL = reverse("orders:orders-list")
+
+RATES = {
+    "anon": "2/minute",
+    "user": "2/minute",
+    "catalog": "3/minute",
+    "orders": "5/minute",
+    "order_create": "1/minute",
+}
+
+
+class FakeView:
+    def __init__(self, scope=None, action=None, method="get") -> None:
+        self.throttle_scope = scope
+        self.action = action
+        self.request = APIRequestFactory().generic(method.upper(), "/")
+
+
+class ThrottleTestMixin:
+    def setUp(self) -> None:
+        caches["throttle"].clear()
+        self.now = 600.0
+
+    def throttle(self) -> SlidingWindowRateThrottle:
+        throttle = SlidingWindowRateThrottle()
+        throttle.timer = lambda: self.now
+        return throttle
+
+    def request(self, user=None) -> Request:
+        request = APIRequestFactory().get("/")
+        if user is not None:
+            force_authenticate(request, user=user)
+        return Request(request)
+
+
+@override_settings(REST_FRAMEWORK={"DEFAULT_THROTTLE_RATES": RATES})
+class SlidingWindowRateThrottleTests(ThrottleTestMixin, SimpleTestCase):
+    def test_allows_the_rate_then_throttles(self) -> None:
+        view = FakeView("catalog")
+        results = [
+            self.throttle().allow_request(self.request(), view) for _ in range(4)
+        ]
+
+        self.assertEqual(results, [True, True, True, False])
+
+    def test_previous_window_counts_by_its_overlap(self) -> None:
+        view = FakeView("catalog")
+        for _ in range(3):
+            self.throttle().allow_request(self.request(), view)
+
+        # Two thirds into the next window a third of the 3 requests remain
+        self.now += 100
+        results = [
+            self.throttle().allow_request(self.request(), view) for _ in range(3)
+        ]
+
+        self.assertEqual(results, [True, True, False])
+
+    def test_wait_until_the_estimate_leaves_room(self) -> None:
+        view = FakeView("order_create")
+        throttle = self.throttle()
+        throttle.allow_request(self.request(), view)
+
+        self.assertFalse(throttle.allow_request(self.request(), view))
+        self.assertEqual(throttle.wait(), 60)
+
+        self.now += 60
+        self.assertFalse(throttle.allow_request(self.request(), view))
+        self.assertEqual(throttle.wait(), 60)
+
+        self.now += 60
+        self.assertTrue(throttle.allow_request(self.request(), view))
+
+    def test_scopes_and_clients_are_counted_separately(self) -> None:
+        user = get_user_model()(pk=1, email="user@user.com")
+        throttle = self.throttle()
+        throttle.allow_request(self.request(), FakeView("order_create"))
+
+        self.assertTrue(throttle.allow_request(self.request(), FakeView("catalog")))
+        self.assertTrue(
+            throttle.allow_request(self.request(user), FakeView("order_create"))
+        )
+        self.assertFalse(
+            throttle.allow_request(self.request(), FakeView("order_create"))
+        )
+
+    def test_views_without_scope_use_user_or_anon(self) -> None:
+        user = get_user_model()(pk=1, email="user@user.com")
+        throttle = self.throttle()
+
+        throttle.allow_request(self.request(user), FakeView())
+        self.assertEqual(throttle.scope, "user")
+        throttle.allow_request(self.request(), FakeView())
+        self.assertEqual(throttle.scope, "anon")
+
+    def test_scope_without_rate_is_not_throttled(self) -> None:
+        view = FakeView("unlimited")
+
+        self.assertTrue(
+            all(self.throttle().allow_request(self.request(), view) for _ in range(10))
+        )
+
+    def test_scope_per_action(self) -> None:
+        scopes = {"create": "order_create", "default": "orders"}
+
+        self.assertEqual(throttle_scope(FakeView(scopes, "create")), "order_create")
+        self.assertEqual(throttle_scope(FakeView(scopes, "list")), "orders")
+        self.assertEqual(
+            throttle_scope(FakeView({"post": "search"}, method="post")), "search"
+        )
+
+
+@override_settings(REST_FRAMEWORK={"DEFAULT_THROTTLE_RATES": RATES})
+class EndpointThrottleTests(TestCase):
+    def setUp(self) -> None:
+        caches["throttle"].clear()
+        response_cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="testpass",
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_catalog_reads_have_their_own_limit(self) -> None:
+        responses = [self.client.get(AIRPORT_URL) for _ in range(4)]
+
+        self.assertEqual(
+            [response.status_code for response in responses],
+            [200, 200, 200, status.HTTP_429_TOO_MANY_REQUESTS],
+        )
+        self.assertIn("Retry-After", responses[-1])
+        self.assertEqual(self.client.get(ORDER_URL).status_code, status.HTTP_200_OK)
+
+    def test_order_creation_is_limited_apart_from_order_listing(self) -> None:
+        self.client.post(ORDER_URL, {"tickets": []}, format="json")
+        response = self.client.post(ORDER_URL, {"tickets": []}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(self.client.get(ORDER_URL).status_code, status.HTTP_200_OK)
@@ -0,0 +1,101 @@
+"""Sliding-window rate limits shared by all processes through a cache.
+
+Every request is counted against exactly one scope: the scope the view
+declares for the action in ``throttle_scope``, otherwise ``user`` for
+authenticated users and ``anon`` for everybody else. Rates come from
+``REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]``, so cheap catalog reads can
+be allowed far more often than creating orders.
+
+Each client and scope has one counter per fixed window of the rate's
+duration. The number of requests in the last ``duration`` seconds is
+estimated from the current and the previous counter, weighting the
+previous one by how much of it still overlaps the sliding window. A
+check is one ``get_many`` and one ``incr`` of integers, whatever the
+rate, so the counters can live in a cache shared by every worker:
+``settings.THROTTLE_CACHE`` names the alias in ``CACHES``.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+def throttle_scope(view) -> str | None:
+    """Scope of the view for the current action.
+
+    ``throttle_scope`` is a scope name, or a mapping from action names
+    (HTTP method names for plain API views) to scope names with an
+    optional ``"default"`` entry.
+    """
+    scope = getattr(view, "throttle_scope", None)
+    if not isinstance(scope, dict):
+        return scope
+    action = getattr(view, "action", None) or view.request.method.lower()
+    return scope.get(action, scope.get("default"))
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    cache_format = "throttle:%(scope)s:%(ident)s:%(window)d"
+
+    def __init__(self) -> None:
+        # The scope, and with it the rate, depends on the request
+        self.wait_seconds = None
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, "THROTTLE_CACHE", "default")]
+
+    def get_scope(self, request, view) -> str:
+        scope = throttle_scope(view)
+        if scope:
+            return scope
+        if request.user and request.user.is_authenticated:
+            return "user"
+        return "anon"
+
+    def get_ident(self, request) -> str:
+        if request.user and request.user.is_authenticated:
+            return f"user-{request.user.pk}"
+        return super().get_ident(request)
+
+    def allow_request(self, request, view) -> bool:
+        self.wait_seconds = None
+        self.scope = self.get_scope(request, view)
+        self.rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+
+        now = self.timer()
+        window, elapsed = divmod(now, self.duration)
+        ident = self.get_ident(request)
+        current_key, previous_key = (
+            self.cache_format % {"scope": self.scope, "ident": ident, "window": number}
+            for number in (window, window - 1)
+        )
+        counts = self.cache.get_many([current_key, previous_key])
+        current = counts.get(current_key, 0)
+        previous = counts.get(previous_key, 0)
+
+        overlap = 1 - elapsed / self.duration
+        if previous * overlap + current + 1 > self.num_requests:
+            self.wait_seconds = self._wait(previous, current, elapsed)
+            return False
+
+        if not self.cache.add(current_key, 1, timeout=2 * self.duration):
+            try:
+                self.cache.incr(current_key)
+            except ValueError:
+                # Expired in between
+                self.cache.add(current_key, 1, timeout=2 * self.duration)
+        return True
+
+    def _wait(self, previous: int, current: int, elapsed: float) -> float:
+        """Seconds until the estimate leaves room for one more request"""
+        room = self.num_requests - 1 - current
+        if room < 0 or previous == 0:
+            return self.duration - elapsed
+        return max(self.duration * (1 - room / previous) - elapsed, 0)
+
+    def wait(self) -> float | None:
+        return self.wait_seconds
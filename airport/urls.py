@@ -1,6 +1,8 @@
 from django.urls import path, include
 from rest_framework import routers
 
+from airport import async_views
+
 from airport.views import (
     CrewViewSet,
     AirportViewSet,
@@ -8,6 +10,9 @@ from airport.views import (
     FlightViewSet,
     AirplaneTypeViewSet,
     AirplaneViewSet,
+    ResponseCacheStatsView,
+    RequestMetricsView,
+    ItinerarySearchView,
 )
 
 router = routers.DefaultRouter()
@@ -18,6 +23,19 @@ router.register("route", RouteViewSet, basename="route")
 router.register("airport", AirportViewSet, basename="airport")
 router.register("flight", FlightViewSet, basename="flight")
 
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [
+    path("", include(router.urls)),
+    path("cache-stats/", ResponseCacheStatsView.as_view(), name="cache-stats"),
+    path("metrics/", RequestMetricsView.as_view(), name="metrics"),
+    path("itineraries/", ItinerarySearchView.as_view(), name="itineraries"),
+    path("async/flight/", async_views.flight_list, name="async-flight-list"),
+    path(
+        "async/flight/<int:pk>/",
+        async_views.flight_detail,
+        name="async-flight-detail",
+    ),
+    path("async/route/", async_views.route_list, name="async-route-list"),
+    path("async/airport/", async_views.airport_list, name="async-airport-list"),
+]
 
 app_name = "airport"
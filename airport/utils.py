@@ -2,9 +2,8 @@ import os
 import uuid
 from django.utils.text import slugify
 
-from airport_service.settings import MEDIA_ROOT
-
-UPLOAD_FOLDER = os.path.join(MEDIA_ROOT, "uploads/crew/")
+# Relative to MEDIA_ROOT; storages reject absolute names
+UPLOAD_FOLDER = "uploads/crew/"
 
 
 def crew_image_file_path(instance, filename: str) -> str:
@@ -1,42 +1,79 @@
-from datetime import datetime
+import io
+import os
+from datetime import datetime, time, timedelta
 from typing import Type
 
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
+from rest_framework.pagination import CursorPagination
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
 
 from rest_framework.serializers import Serializer
+from rest_framework.views import APIView
 
-from django.db.models import F, Count
+from django.db.models import Q, QuerySet
+from django.http import Http404
+from django.utils.dateparse import parse_date, parse_datetime
 
+from airport.caching import CachedResponseMixin, response_cache
+from airport.connections import connection_graph
+from airport.imports import IMPORT_FORMATS, import_schedule, read_rows
+from airport.instrumentation import metrics_registry
 from airport.models import (
     Crew,
     Airport,
     Route,
+    RouteAvailability,
     Flight,
     AirplaneType,
     Airplane
 )
 from airport.permissions import IsAdminOrIfAuthenticatedReadOnly
+from airport.replicas import ReplicaReadMixin
+from orders.utils import get_seat_grid
 from airport.serializers import (
     CrewSerializer,
     CrewDetailSerializer,
     AirportSerializer,
     RouteListSerializer,
     RouteDetailSerializer,
+    RouteAvailabilitySerializer,
     FlightListSerializer,
     FlightDetailSerializer,
     RouteSerializer,
     FlightSerializer,
     AirplaneTypeSerializer,
     AirplaneListSerializer,
+    ItinerarySearchSerializer,
+    ItinerarySerializer,
 )
 
 
-class CrewViewSet(viewsets.ModelViewSet):
+class IdCursorPagination(CursorPagination):
+    ordering = ("id",)
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class FlightPagination(IdCursorPagination):
+    ordering = ("departure_time", "id")
+
+
+class CrewViewSet(
+    ReplicaReadMixin, CachedResponseMixin, viewsets.ModelViewSet
+):
     queryset = Crew.objects.all()
     serializer_class = CrewSerializer
+    pagination_class = IdCursorPagination
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    throttle_scope = "catalog"
+    cache_dependencies = ("crew",)
 
     def get_serializer_class(self) -> Type[Serializer]:
         if self.action == "retrieve":
@@ -45,47 +82,110 @@ class CrewViewSet(viewsets.ModelViewSet):
         return self.serializer_class
 
 
-class AirplaneTypeViewSet(viewsets.ModelViewSet):
+class AirplaneTypeViewSet(
+    ReplicaReadMixin, CachedResponseMixin, viewsets.ModelViewSet
+):
     queryset = AirplaneType.objects.all()
     serializer_class = AirplaneTypeSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    throttle_scope = "catalog"
+    cache_dependencies = ("airplane_type",)
 
 
-class AirplaneViewSet(viewsets.ModelViewSet):
+class AirplaneViewSet(
+    ReplicaReadMixin, CachedResponseMixin, viewsets.ModelViewSet
+):
     queryset = Airplane.objects.select_related("airplane_type")
     serializer_class = AirplaneListSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    throttle_scope = "catalog"
+    cache_dependencies = ("airplane", "airplane_type")
 
 
-class AirportViewSet(viewsets.ModelViewSet):
+class AirportViewSet(
+    ReplicaReadMixin, CachedResponseMixin, viewsets.ModelViewSet
+):
     queryset = Airport.objects.all()
     serializer_class = AirportSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    throttle_scope = "catalog"
+    cache_dependencies = ("airport",)
 
 
-class RouteViewSet(viewsets.ModelViewSet):
+class RouteViewSet(
+    ReplicaReadMixin, CachedResponseMixin, viewsets.ModelViewSet
+):
     queryset = Route.objects.select_related("source", "destination")
     serializer_class = RouteSerializer
+    pagination_class = IdCursorPagination
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    throttle_scope = "catalog"
+    cache_dependencies = ("route", "airport")
 
     def get_serializer_class(self) -> Type[Serializer]:
         if self.action == "list":
             return RouteListSerializer
         if self.action == "retrieve":
             return RouteDetailSerializer
+        if self.action == "availability":
+            return RouteAvailabilitySerializer
 
         return self.serializer_class
 
-
-class FlightViewSet(viewsets.ModelViewSet):
-    queryset = Flight.objects.select_related("route", "airplane").prefetch_related("crew").annotate(
-        tickets_available=(
-                F("airplane__rows") * F("airplane__seats_in_row")
-                - Count("tickets")
-        )
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "date_from",
+                type=OpenApiTypes.DATE,
+                description="First departure day, inclusive (ex. ?date_from=2023-10-01)",
+            ),
+            OpenApiParameter(
+                "date_to",
+                type=OpenApiTypes.DATE,
+                description="Last departure day, inclusive (ex. ?date_to=2023-10-31)",
+            ),
+        ],
+        responses={200: RouteAvailabilitySerializer(many=True)},
     )
+    @action(methods=["GET"], detail=True, url_path="availability")
+    def availability(self, request, pk=None) -> Response:
+        """Flights, seats and free seats of the route per departure day"""
+        try:
+            route_id = int(pk)
+        except ValueError:
+            raise Http404
+
+        days = RouteAvailability.objects.filter(route_id=route_id)
+        for param, lookup in (("date_from", "date__gte"), ("date_to", "date__lte")):
+            value = request.query_params.get(param)
+            if value:
+                try:
+                    day = parse_date(value)
+                except ValueError:
+                    day = None
+                if day is None:
+                    raise ValidationError({param: "Enter a date (YYYY-MM-DD)."})
+                days = days.filter(**{lookup: day})
+
+        data = self.get_serializer(days, many=True).data
+        if not data and not Route.objects.filter(pk=route_id).exists():
+            raise Http404
+        return Response(data)
+
+
+class FlightViewSet(
+    ReplicaReadMixin, CachedResponseMixin, viewsets.ModelViewSet
+):
+    queryset = Flight.objects.select_related(
+        "route__source", "route__destination", "airplane"
+    ).with_tickets_available()
     serializer_class = FlightSerializer
+    pagination_class = FlightPagination
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    throttle_scope = "catalog"
+    cache_dependencies = (
+        "flight", "route", "airport", "airplane", "airplane_type", "crew", "ticket"
+    )
 
     def get_serializer_class(self) -> Type[Serializer]:
         if self.action == "list":
@@ -95,39 +195,103 @@ class FlightViewSet(viewsets.ModelViewSet):
 
         return self.serializer_class
 
+    @staticmethod
+    def _parse_departure(param: str, value: str) -> tuple[datetime, bool]:
+        """Parse a date or datetime query param into a datetime.
+
+        Returns the datetime and whether the value was a plain date.
+        """
+        try:
+            date = parse_date(value)
+            if date:
+                return datetime.combine(date, time.min), True
+            moment = parse_datetime(value)
+        except ValueError:
+            moment = None
+        if moment is None:
+            raise ValidationError(
+                {param: "Enter a date (YYYY-MM-DD) or datetime (YYYY-MM-DDThh:mm)."}
+            )
+        return moment, False
+
+    @classmethod
+    def _departure_filters(cls, params) -> list[Q]:
+        """Departure time conditions of the departure_* query params"""
+        filters = []
+        departure_time = params.get("departure_time")
+        departure_from = params.get("departure_from")
+        departure_to = params.get("departure_to")
+
+        if departure_time:
+            start, _ = cls._parse_departure("departure_time", departure_time)
+            filters.append(
+                Q(
+                    departure_time__gte=start,
+                    departure_time__lt=start + timedelta(days=1),
+                )
+            )
+
+        if departure_from:
+            start, _ = cls._parse_departure("departure_from", departure_from)
+            filters.append(Q(departure_time__gte=start))
+
+        if departure_to:
+            end, is_date = cls._parse_departure("departure_to", departure_to)
+            if is_date:
+                end += timedelta(days=1)
+            filters.append(Q(departure_time__lt=end))
+
+        return filters
+
+    @staticmethod
+    def _airports_matching(name: str | None, city: str | None) -> QuerySet:
+        """Ids of the airports matching name/city filters"""
+        airports = Airport.objects.all()
+        if name:
+            airports = airports.filter(name__icontains=name)
+        if city:
+            airports = airports.filter(closest_big_city__icontains=city)
+        return airports.values_list("id", flat=True)
+
+    @classmethod
+    def _matching_airport_ids(cls, name: str | None, city: str | None) -> list[int]:
+        """Resolve airport name/city filters to ids in one pre-query"""
+        return list(cls._airports_matching(name, city))
+
     def get_queryset(self) -> str:
-        """Filtering the flights"""
+        """Filtering the flights.
+
+        Every filter is either on flight columns or on ids resolved up
+        front, and availability comes from the one-to-one seat map, so
+        rows are never duplicated and no DISTINCT or GROUP BY is needed.
+        """
         source_airport = self.request.query_params.get("source_airport")
         source_city = self.request.query_params.get("source_city")
         destination_airport = self.request.query_params.get("destination_airport")
         destination_city = self.request.query_params.get("destination_city")
-        departure_time = self.request.query_params.get("departure_time")
-
-        queryset = self.queryset
 
-        if source_airport:
-            queryset = queryset.filter(route__source__name__icontains=source_airport)
+        queryset = super().get_queryset()
 
-        if source_city:
+        if source_airport or source_city:
             queryset = queryset.filter(
-                route__source__closest_big_city__icontains=source_city
+                route__source_id__in=self._matching_airport_ids(
+                    source_airport, source_city
+                )
             )
 
-        if destination_airport:
+        if destination_airport or destination_city:
             queryset = queryset.filter(
-                route__destination__name__icontains=destination_airport
+                route__destination_id__in=self._matching_airport_ids(
+                    destination_airport, destination_city
+                )
             )
 
-        if destination_city:
-            queryset = queryset.filter(
-                route__destination__closest_big_city__icontains=destination_city
-            )
+        queryset = queryset.filter(*self._departure_filters(self.request.query_params))
 
-        if departure_time:
-            date = datetime.strptime(departure_time, "%Y-%m-%d").date()
-            queryset = queryset.filter(departure_time__icontains=date)
+        if self.action != "list":
+            queryset = queryset.prefetch_related("crew")
 
-        return queryset.distinct()
+        return queryset
 
     @extend_schema(
         parameters=[
@@ -155,11 +319,163 @@ class FlightViewSet(viewsets.ModelViewSet):
                 "departure_time",
                 type=OpenApiTypes.DATE,
                 description=(
-                        "Filter by flight departure time"
-                        "(ex. ?date=2023-10-23)"
+                        "Filter by flight departure date "
+                        "(ex. ?departure_time=2023-10-23)"
+                ),
+            ),
+            OpenApiParameter(
+                "departure_from",
+                type=OpenApiTypes.STR,
+                description=(
+                        "Flights departing at or after a date or datetime "
+                        "(ex. ?departure_from=2023-10-23T08:00)"
+                ),
+            ),
+            OpenApiParameter(
+                "departure_to",
+                type=OpenApiTypes.STR,
+                description=(
+                        "Flights departing before a datetime, or on or before a date "
+                        "(ex. ?departure_to=2023-10-25)"
                 ),
             ),
         ]
     )
     def list(self, request, *args, **kwargs) -> tuple:
         return super().list(request, *args, **kwargs)
+
+    @extend_schema(
+        responses={200: OpenApiTypes.OBJECT},
+        description=(
+            "Seat occupancy of the flight. `seats` is a base64 bitmap with "
+            "one bit per seat, row by row, most significant bit first; "
+            "a set bit means the seat is taken."
+        ),
+    )
+    @action(methods=["GET"], detail=True, url_path="seats")
+    def seats(self, request, pk=None) -> Response:
+        """Occupancy grid of the flight airplane seats"""
+        try:
+            flight_id = int(pk)
+        except ValueError:
+            raise Http404
+
+        grid = get_seat_grid(
+            flight_id,
+            lambda: get_object_or_404(
+                Flight.objects.select_related("airplane", "seat_map"),
+                pk=flight_id,
+            ),
+        )
+        return Response(grid)
+
+    @extend_schema(
+        request={
+            "multipart/form-data": OpenApiTypes.OBJECT,
+            "application/json": OpenApiTypes.OBJECT,
+        },
+        responses={200: OpenApiTypes.OBJECT},
+        description=(
+            "Bulk create flights with crew from a `file` upload (csv, json or "
+            "ndjson, see `import_format`) or a JSON list of rows with route, "
+            "airplane, departure_time, arrival_time and crew ids. Invalid rows "
+            "are reported in `errors` and do not stop the import."
+        ),
+    )
+    @action(methods=["POST"], detail=False, url_path="import")
+    def bulk_import(self, request) -> Response:
+        """Bulk import a flight schedule"""
+        upload = request.FILES.get("file")
+        if upload is None:
+            if not isinstance(request.data, list):
+                raise ValidationError(
+                    {"file": "Upload a file or send a JSON list of rows."}
+                )
+            return Response(import_schedule(request.data).as_dict())
+
+        fmt = request.query_params.get(
+            "import_format", os.path.splitext(upload.name)[1].lstrip(".")
+        )
+        if fmt not in IMPORT_FORMATS:
+            raise ValidationError({"import_format": "Expected csv, json or ndjson."})
+        try:
+            report = import_schedule(
+                read_rows(io.TextIOWrapper(upload, encoding="utf-8", newline=""), fmt)
+            )
+        except (UnicodeDecodeError, ValueError) as error:
+            raise ValidationError({"file": str(error)})
+        return Response(report.as_dict())
+
+
+class ResponseCacheStatsView(APIView):
+    """Hit and miss counters of the response cache in this process"""
+
+    permission_classes = (IsAdminUser,)
+
+    @extend_schema(responses={200: OpenApiTypes.OBJECT})
+    def get(self, request) -> Response:
+        return Response(response_cache.stats())
+
+
+class RequestMetricsView(APIView):
+    """Query, timing and size percentiles per view and action in this process"""
+
+    permission_classes = (IsAdminUser,)
+
+    @extend_schema(responses={200: OpenApiTypes.OBJECT})
+    def get(self, request) -> Response:
+        return Response(metrics_registry.snapshot())
+
+
+class ItinerarySearchView(APIView):
+    """Direct and connecting itineraries between two airports"""
+
+    permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    throttle_scope = "search"
+
+    @extend_schema(
+        parameters=[ItinerarySearchSerializer],
+        responses={200: ItinerarySerializer(many=True)},
+        description=(
+            "Itineraries from the `source` to the `destination` airport id "
+            "leaving on `date`, earliest arrival first. Layovers are in "
+            "minutes."
+        ),
+    )
+    def get(self, request) -> Response:
+        params = ItinerarySearchSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        search = params.validated_data
+
+        itineraries = connection_graph.search(
+            search["source"],
+            search["destination"],
+            search["date"],
+            max_legs=search["max_legs"],
+            min_layover=timedelta(minutes=search["min_layover"]),
+            max_layover=timedelta(minutes=search["max_layover"]),
+            limit=search["limit"],
+        )
+        data = [
+            {
+                "departure_time": legs[0].departure_time,
+                "arrival_time": legs[-1].arrival_time,
+                "duration_minutes": int(
+                    (legs[-1].arrival_time - legs[0].departure_time).total_seconds()
+                    // 60
+                ),
+                "legs": [
+                    {
+                        "flight": leg.flight,
+                        "route": leg.route,
+                        "source": connection_graph.airport_name(leg.source),
+                        "destination": connection_graph.airport_name(leg.destination),
+                        "departure_time": leg.departure_time,
+                        "arrival_time": leg.arrival_time,
+                    }
+                    for leg in legs
+                ],
+            }
+            for legs in itineraries
+        ]
+        return Response(ItinerarySerializer(data, many=True).data)
@@ -0,0 +1,101 @@
+"""Database settings read from the environment.
+
+By default connections persist for ``DB_CONN_MAX_AGE`` seconds and are
+checked with a cheap query before being reused, so a request no longer
+pays for a TCP and authentication handshake with PostgreSQL.
+
+``DB_POOL=true`` switches to the pooling backend of
+``airport_service.db_pool``: connections are handed back to a pool shared
+by all threads of the process when a request ends. Prefer it under ASGI,
+where requests are not tied to a long-lived thread. Set
+``DB_DISABLE_SERVER_SIDE_CURSORS=true`` behind PgBouncer in transaction
+mode instead.
+
+``DB_REPLICA_HOSTS`` lists read replicas of the primary, which are
+reached with the same credentials; see ``airport.replicas``.
+"""
+import os
+from collections.abc import Mapping
+
+ENGINES = {
+    "postgresql": "django.db.backends.postgresql",
+    "sqlite3": "django.db.backends.sqlite3",
+}
+POOL_ENGINE = "airport_service.db_pool"
+
+TRUE_VALUES = ("1", "true", "yes", "on")
+
+
+def env_flag(env: Mapping, name: str, default: bool) -> bool:
+    value = env.get(name)
+    if value is None or value == "":
+        return default
+    return value.strip().lower() in TRUE_VALUES
+
+
+def env_max_age(env: Mapping, name: str, default: int | None) -> int | None:
+    """Seconds to keep a connection open; ``none`` keeps it forever"""
+    value = env.get(name)
+    if value is None or value == "":
+        return default
+    if value.strip().lower() == "none":
+        return None
+    return int(value)
+
+
+def database_from_env(env: Mapping = os.environ, base_dir=None) -> dict:
+    """Return the ``default`` entry of ``DATABASES``"""
+    engine = env.get("DB_ENGINE", "postgresql")
+    if engine not in ENGINES:
+        raise ValueError(
+            f"DB_ENGINE must be one of {', '.join(ENGINES)}, got {engine!r}"
+        )
+    if engine == "sqlite3":
+        name = env.get("SQLITE_PATH") or os.path.join(base_dir or "", "db.sqlite3")
+        return {"ENGINE": ENGINES[engine], "NAME": name}
+
+    database = {
+        "ENGINE": ENGINES[engine],
+        "NAME": env.get("POSTGRES_DB", "airport"),
+        "USER": env.get("POSTGRES_USER"),
+        "PASSWORD": env.get("POSTGRES_PASSWORD"),
+        "HOST": env.get("POSTGRES_HOST", "127.0.0.1"),
+        "PORT": env.get("POSTGRES_PORT", "5432"),
+        "CONN_MAX_AGE": env_max_age(env, "DB_CONN_MAX_AGE", 60),
+        "CONN_HEALTH_CHECKS": env_flag(env, "DB_CONN_HEALTH_CHECKS", True),
+        "DISABLE_SERVER_SIDE_CURSORS": env_flag(
+            env, "DB_DISABLE_SERVER_SIDE_CURSORS", False
+        ),
+        "OPTIONS": {},
+    }
+    connect_timeout = env.get("DB_CONNECT_TIMEOUT")
+    if connect_timeout:
+        database["OPTIONS"]["connect_timeout"] = int(connect_timeout)
+
+    if env_flag(env, "DB_POOL", False):
+        # The pool keeps the connections, so Django must not hold on to them
+        database["ENGINE"] = POOL_ENGINE
+        database["CONN_MAX_AGE"] = 0
+        database["OPTIONS"]["pool"] = {
+            "max_size": int(env.get("DB_POOL_MAX_SIZE", 10)),
+            "timeout": float(env.get("DB_POOL_TIMEOUT", 30)),
+            "max_idle": float(env.get("DB_POOL_MAX_IDLE", 600)),
+        }
+    return database
+
+
+def replicas_from_env(env: Mapping, primary: dict) -> dict[str, dict]:
+    """Return ``DATABASES`` entries of the comma-separated DB_REPLICA_HOSTS"""
+    replicas = {}
+    hosts = [host.strip() for host in env.get("DB_REPLICA_HOSTS", "").split(",")]
+    for index, address in enumerate(filter(None, hosts), start=1):
+        host, _, port = address.partition(":")
+        replicas[f"replica{index}"] = {
+            **primary,
+            "HOST": host,
+            "PORT": port or primary.get("PORT", ""),
+            "OPTIONS": dict(primary.get("OPTIONS", {})),
+            # Tests read their own writes, so run them against the primary
+            "TEST": {"MIRROR": "default"},
+        }
+    return replicas
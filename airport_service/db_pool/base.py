@@ -0,0 +1,74 @@
+"""PostgreSQL backend that draws its connections from a per-process pool.
+
+Configured through ``OPTIONS["pool"]`` (``max_size``, ``timeout`` and
+``max_idle``); see ``airport_service.database``. Django closes the
+connection at the end of every request, which here hands it back to the
+pool instead. With ``CONN_HEALTH_CHECKS`` a connection is checked with
+``SELECT 1`` before it is handed out again.
+"""
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from airport_service.db_pool.pool import ConnectionPool, PoolTimeout
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _check(connection) -> None:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
+def _reset(connection) -> None:
+    if not connection.autocommit:
+        connection.rollback()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def __init__(self, settings_dict, alias="default") -> None:
+        super().__init__(settings_dict, alias)
+        if self.settings_dict["CONN_MAX_AGE"] != 0:
+            raise ImproperlyConfigured("Pooled connections require CONN_MAX_AGE = 0.")
+
+    def get_connection_params(self) -> dict:
+        params = super().get_connection_params()
+        params.pop("pool", None)
+        return params
+
+    def _pool(self, conn_params: dict) -> ConnectionPool:
+        # Keyed by the parameters too: the test runner renames the database
+        key = (self.alias, tuple(sorted((k, repr(v)) for k, v in conn_params.items())))
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = ConnectionPool(
+                    check=_check if self.settings_dict["CONN_HEALTH_CHECKS"] else None,
+                    reset=_reset,
+                    **self.settings_dict["OPTIONS"].get("pool", {}),
+                )
+            return pool
+
+    def get_new_connection(self, conn_params):
+        try:
+            self._connection_pool = self._pool(conn_params)
+            connection = self._connection_pool.get(
+                lambda: super(DatabaseWrapper, self).get_new_connection(conn_params)
+            )
+        except PoolTimeout as error:
+            raise self.Database.OperationalError(str(error)) from error
+        # Set by the parent class only when it opens a new connection
+        self.isolation_level = IsolationLevel(
+            self.settings_dict["OPTIONS"].get(
+                "isolation_level", IsolationLevel.READ_COMMITTED
+            )
+        )
+        return connection
+
+    def _close(self) -> None:
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self._connection_pool.put(self.connection)
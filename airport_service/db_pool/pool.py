@@ -0,0 +1,98 @@
+import queue
+import threading
+import time
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """Thread-safe pool of at most ``max_size`` open DB-API connections.
+
+    Idle connections are reused most recently returned first, so that the
+    surplus of a burst grows idle and is closed after ``max_idle`` seconds.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10,
+        timeout: float = 30,
+        max_idle: float = 600,
+        check=None,
+        reset=None,
+    ) -> None:
+        self._check = check
+        self._reset = reset
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    def _discard(self, connection) -> None:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _usable(self, connection, returned_at: float) -> bool:
+        if getattr(connection, "closed", False):
+            return False
+        if time.monotonic() - returned_at > self.max_idle:
+            return False
+        if self._check is None:
+            return True
+        try:
+            self._check(connection)
+        except Exception:
+            return False
+        return True
+
+    def get(self, connect):
+        """Return an idle connection, or a new one from ``connect()``"""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeout(
+                f"No database connection available within {self.timeout}s "
+                f"({self.max_size} in use)"
+            )
+        try:
+            while True:
+                try:
+                    connection, returned_at = self._idle.get_nowait()
+                except queue.Empty:
+                    return connect()
+                if self._usable(connection, returned_at):
+                    return connection
+                self._discard(connection)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def put(self, connection) -> None:
+        """Take back a connection from ``get``, resetting or closing it"""
+        try:
+            if getattr(connection, "closed", False):
+                return
+            if self._reset is not None:
+                try:
+                    self._reset(connection)
+                except Exception:
+                    self._discard(connection)
+                    return
+            self._idle.put((connection, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    @property
+    def idle(self) -> int:
+        return self._idle.qsize()
+
+    def close(self) -> None:
+        """Close the idle connections"""
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(connection)
@@ -0,0 +1,166 @@
+"""Serving of uploaded media files that holds up in production.
+
+``settings.MEDIA_SERVING`` chooses who sends the file body:
+
+- ``"django"`` streams it from the worker, answering ``Range`` requests
+  with single byte ranges, so large files can be resumed and seeked;
+- ``"x-sendfile"`` leaves it to Apache mod_xsendfile or lighttpd through
+  the ``X-Sendfile`` header with the absolute path of the file;
+- ``"x-accel-redirect"`` leaves it to nginx through ``X-Accel-Redirect``
+  to ``settings.MEDIA_ACCEL_REDIRECT_PREFIX`` followed by the media path,
+  which nginx maps to ``MEDIA_ROOT`` in an ``internal`` location.
+
+The web server then handles ranges itself. Names ending in a uuid, as
+``crew_image_file_path`` gives uploads, or in a content hash, as crew
+thumbnails have, never change content, so browsers and CDNs may cache
+them for a year without asking again. Other files are revalidated with
+their ``ETag`` and ``Last-Modified``.
+"""
+import mimetypes
+import os
+import re
+import stat
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBase,
+    HttpResponseNotAllowed,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+IMMUTABLE_NAME = re.compile(
+    r"-(?:[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|[0-9a-f]{16})"
+    r"\.\w+$"
+)
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "public, no-cache"
+
+BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+CHUNK_SIZE = 64 * 1024
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def cache_control(path: str) -> str:
+    return IMMUTABLE if IMMUTABLE_NAME.search(path) else REVALIDATE
+
+
+def byte_range(request: HttpRequest, size: int, validators) -> tuple | None:
+    """First and last byte of the requested range, None for the whole file.
+
+    Only a single range is served; other range headers are ignored, as
+    RFC 9110 allows. ``If-Range`` must match one of ``validators``.
+    """
+    header = request.headers.get("Range")
+    if not header:
+        return None
+    if_range = request.headers.get("If-Range")
+    if if_range and if_range not in validators:
+        return None
+    match = BYTE_RANGE.match(header.strip())
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if not first:
+        # The last bytes
+        length = min(int(last), size)
+        if length == 0:
+            raise RangeNotSatisfiable
+        return size - length, size - 1
+    start = int(first)
+    if start >= size:
+        raise RangeNotSatisfiable
+    end = min(int(last), size - 1) if last else size - 1
+    if end < start:
+        return None
+    return start, end
+
+
+def _read(file, length: int):
+    with file:
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _stream(request, full_path: str, size: int, content_type: str, validators):
+    try:
+        requested = byte_range(request, size, validators)
+    except RangeNotSatisfiable:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+    file = open(full_path, "rb")
+    if requested is None:
+        # Servers may send it with sendfile through wsgi.file_wrapper
+        response = FileResponse(file, content_type=content_type)
+    else:
+        start, end = requested
+        file.seek(start)
+        response = StreamingHttpResponse(
+            _read(file, end - start + 1), status=206, content_type=content_type
+        )
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = end - start + 1
+    response["Accept-Ranges"] = "bytes"
+    return response
+
+
+def serve_media(request: HttpRequest, path: str) -> HttpResponseBase:
+    if request.method not in ("GET", "HEAD"):
+        return HttpResponseNotAllowed(["GET", "HEAD"])
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        stats = os.stat(full_path)
+    except (SuspiciousFileOperation, OSError):
+        raise Http404("File not found")
+    if not stat.S_ISREG(stats.st_mode):
+        raise Http404("File not found")
+
+    etag = f'"{stats.st_mtime_ns:x}-{stats.st_size:x}"'
+    last_modified = http_date(stats.st_mtime)
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        not_modified = etag in {tag.strip() for tag in if_none_match.split(",")}
+    else:
+        not_modified = not was_modified_since(
+            request.headers.get("If-Modified-Since"), stats.st_mtime
+        )
+
+    content_type, encoding = mimetypes.guess_type(full_path)
+    if encoding or not content_type:
+        # Compressed files are sent as they are, not decompressed by clients
+        content_type = "application/octet-stream"
+    mode = getattr(settings, "MEDIA_SERVING", "django")
+    if not_modified:
+        response = HttpResponseNotModified()
+    elif mode == "x-sendfile":
+        response = HttpResponse(content_type=content_type)
+        response["X-Sendfile"] = full_path
+    elif mode == "x-accel-redirect":
+        response = HttpResponse(content_type=content_type)
+        prefix = settings.MEDIA_ACCEL_REDIRECT_PREFIX
+        response["X-Accel-Redirect"] = prefix + quote(path)
+    else:
+        response = _stream(
+            request, full_path, stats.st_size, content_type, (etag, last_modified)
+        )
+    response["ETag"] = etag
+    response["Last-Modified"] = last_modified
+    response["Cache-Control"] = cache_control(path)
+    return response
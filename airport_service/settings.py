@@ -9,10 +9,15 @@ https://docs.djangoproject.com/en/4.2/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
+import importlib.util
 import os
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 from dotenv import load_dotenv
+from django.conf import global_settings
+
+from airport_service.database import database_from_env, replicas_from_env
 
 
 load_dotenv()
@@ -49,6 +54,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "airport.instrumentation.InstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -56,6 +62,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "airport.replicas.ReplicaRoutingMiddleware",
 ]
 
 ROOT_URLCONF = "airport_service.urls"
@@ -83,16 +90,22 @@ WSGI_APPLICATION = "airport_service.wsgi.application"
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.postgresql",
-        "NAME": "airport",
-        "USER": os.getenv("POSTGRES_USER"),
-        "PASSWORD": os.getenv("POSTGRES_PASSWORD"),
-        "HOST": "127.0.0.1",
-        "PORT": "5432",
-    }
-}
+# Connection reuse and pooling are configured from the environment, see
+# airport_service/database.py and .env.sample
+DATABASES = {"default": database_from_env(base_dir=BASE_DIR)}
+
+# GET requests of the airport endpoints read from these replicas
+DATABASES.update(replicas_from_env(os.environ, DATABASES["default"]))
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["airport.replicas.ReplicaRouter"]
+
+# Seconds a user reads from the primary after writing anything
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", 10))
+# Cache remembering those users; every process must see the same one
+REPLICA_STICKY_CACHE = "shared"
+# Replicas further behind than this many seconds are not read from
+REPLICA_MAX_LAG = float(os.getenv("REPLICA_MAX_LAG", 5))
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL", 5))
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -112,15 +125,55 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Hasher of new passwords: pbkdf2, scrypt or argon2, which needs the
+# argon2-cffi package. Passwords hashed by the others still verify and
+# are rehashed with this one at the next login
+PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "pbkdf2")
+_HASHERS = {
+    "pbkdf2": "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "scrypt": "django.contrib.auth.hashers.ScryptPasswordHasher",
+    "argon2": "django.contrib.auth.hashers.Argon2PasswordHasher",
+}
+if PASSWORD_HASHER not in _HASHERS:
+    raise ValueError(
+        f"PASSWORD_HASHER must be one of {', '.join(_HASHERS)}, "
+        f"got {PASSWORD_HASHER!r}"
+    )
+if PASSWORD_HASHER == "argon2" and importlib.util.find_spec("argon2") is None:
+    # Otherwise every login fails once the first password is hashed
+    raise ValueError("PASSWORD_HASHER=argon2 needs the argon2-cffi package")
+PASSWORD_HASHERS = [
+    _HASHERS[PASSWORD_HASHER],
+    *(
+        hasher
+        for hasher in global_settings.PASSWORD_HASHERS
+        if hasher != _HASHERS[PASSWORD_HASHER]
+    ),
+]
+# Passwords hashed at once per process; defaults to the number of cores
+PASSWORD_HASHING_WORKERS = int(os.getenv("PASSWORD_HASHING_WORKERS") or 0) or None
+
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "airport.throttling.SlidingWindowRateThrottle",
+    ],
+    # "anon" and "user" apply to views without a throttle_scope
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "100/day",
+        "user": "300/day",
+        "catalog": "600/minute",
+        "search": "120/minute",
+        "orders": "120/minute",
+        "order_create": "20/minute",
+        "seat_hold": "60/minute",
+    },
+    "DEFAULT_RENDERER_CLASSES": [
+        "airport.instrumentation.TimedJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "100/day", "user": "300/day"},
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.StatelessJWTAuthentication",
     ),
 }
 
@@ -141,7 +194,6 @@ SPECTACULAR_SETTINGS = {
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
 
-
 LANGUAGE_CODE = "en-us"
 
 TIME_ZONE = "UTC"
@@ -158,14 +210,95 @@ AUTH_USER_MODEL = "user.User"
 STATIC_URL = "static/"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "airport/media")
+# Who sends media files: "django", or the web server with "x-sendfile"
+# (Apache, lighttpd) or "x-accel-redirect" (nginx), see airport_service.media
+MEDIA_SERVING = os.getenv("MEDIA_SERVING", "django")
+if MEDIA_SERVING not in ("django", "x-sendfile", "x-accel-redirect"):
+    raise ValueError(
+        "MEDIA_SERVING must be one of django, x-sendfile, x-accel-redirect, "
+        f"got {MEDIA_SERVING!r}"
+    )
+# nginx location with "internal" and "alias" to MEDIA_ROOT
+MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv(
+    "MEDIA_ACCEL_REDIRECT_PREFIX", "/protected-media/"
+)
+
+# Crew image thumbnails by name, with the longest side in pixels
+CREW_THUMBNAIL_SIZES = {"small": 64, "medium": 256, "large": 1024}
+# Threads making thumbnails per process; 0 makes them in the request
+IMAGE_PROCESSING_WORKERS = int(os.getenv("IMAGE_PROCESSING_WORKERS", 2))
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Tests keep every cache in memory, away from the files other processes share
+TEST_RUNNER = "airport_service.test_runner.LocalCachesTestRunner"
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=90),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "ROTATE_REFRESH_TOKENS": False,
+    "TOKEN_OBTAIN_SERIALIZER": "user.serializers.TokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "user.serializers.TokenRefreshSerializer",
+}
+
+# Token versions are cached this many seconds in a cache shared by all
+# processes, or revoked tokens stay valid in the others until it expires
+TOKEN_VERSION_CACHE = "shared"
+TOKEN_VERSION_CACHE_TIMEOUT = int(os.getenv("TOKEN_VERSION_CACHE_TIMEOUT", 60))
+
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    # Shared by all worker processes of a node, for the response cache and
+    # replica stickiness. Use e.g. RedisCache to share it between nodes
+    "shared": {
+        "BACKEND": os.getenv(
+            "SHARED_CACHE_BACKEND",
+            "django.core.cache.backends.filebased.FileBasedCache",
+        ),
+        "LOCATION": os.getenv(
+            "SHARED_CACHE_LOCATION",
+            os.path.join(tempfile.gettempdir(), "airport-service-cache"),
+        ),
+    },
+    # Rate limit counters, shared by all worker processes of a node like
+    # "shared"; use e.g. RedisCache to share them between nodes
+    "throttle": {
+        "BACKEND": os.getenv(
+            "THROTTLE_CACHE_BACKEND",
+            "django.core.cache.backends.filebased.FileBasedCache",
+        ),
+        "LOCATION": os.getenv(
+            "THROTTLE_CACHE_LOCATION",
+            os.path.join(tempfile.gettempdir(), "airport-service-throttle"),
+        ),
+    },
 }
+# Cache holding the rate limit counters
+THROTTLE_CACHE = "throttle"
+
+# Response cache of the airport read endpoints, kept in the "shared" cache.
+# "airport.caching.LocMemLRUBackend" keeps it in each process instead,
+# where writes handled by other processes show after its timeout
+AIRPORT_RESPONSE_CACHE = {
+    "BACKEND": os.getenv(
+        "AIRPORT_RESPONSE_CACHE_BACKEND", "airport.caching.DjangoCacheBackend"
+    ),
+    "OPTIONS": {},
+}
+if AIRPORT_RESPONSE_CACHE["BACKEND"].endswith(".DjangoCacheBackend"):
+    AIRPORT_RESPONSE_CACHE["OPTIONS"]["alias"] = "shared"
+
+# Seconds a seat stays reserved for a user before it has to be confirmed
+SEAT_HOLD_TTL = int(os.getenv("SEAT_HOLD_TTL", 600))
+
+# Seconds before the in-memory itinerary search graph is reloaded to pick up
+# flight changes made by other processes
+CONNECTION_GRAPH_TTL = int(os.getenv("CONNECTION_GRAPH_TTL", 60))
+
+# Queries taking at least this many milliseconds are logged as warnings
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", 200))
+# Latest requests per view kept for the percentiles of /api/airport/metrics/
+INSTRUMENTATION_SAMPLES = int(os.getenv("INSTRUMENTATION_SAMPLES", 1000))
@@ -0,0 +1,29 @@
+"""Test runner keeping every cache of the test run in local memory.
+
+The "shared" and "throttle" caches default to files shared by all
+processes of the machine. Without this the tests would clear and bump
+the caches of a local development server, and concurrent test runs
+would see each other's response versions, stickiness and counters.
+"""
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class LocalCachesTestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs) -> None:
+        super().setup_test_environment(**kwargs)
+        self._local_caches = override_settings(
+            CACHES={
+                alias: {
+                    "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                    "LOCATION": alias,
+                }
+                for alias in settings.CACHES
+            }
+        )
+        self._local_caches.enable()
+
+    def teardown_test_environment(self, **kwargs) -> None:
+        self._local_caches.disable()
+        super().teardown_test_environment(**kwargs)
@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from orders.models import Order, Ticket
+from orders.models import Order, SeatHold, Ticket
 
 admin.site.register(Order)
 admin.site.register(Ticket)
+admin.site.register(SeatHold)
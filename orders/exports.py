@@ -0,0 +1,134 @@
+import json
+from datetime import datetime, time, timedelta
+from typing import Iterable, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Exists, OuterRef, QuerySet
+from django.utils.dateparse import parse_date, parse_datetime
+
+from airport.models import Flight
+from orders.models import Order, Ticket
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = ("ndjson", "json")
+
+EXPORT_FIELDS = {
+    "flights": (
+        "id",
+        "route_id",
+        "route__source__name",
+        "route__destination__name",
+        "airplane_id",
+        "departure_time",
+        "arrival_time",
+    ),
+    "tickets": (
+        "id",
+        "order_id",
+        "flight_id",
+        "row",
+        "seat",
+        "flight__departure_time",
+    ),
+    "orders": ("id", "user_id", "created_at"),
+}
+
+_encoder = DjangoJSONEncoder(separators=(",", ":"))
+
+
+def parse_bound(value: str, end: bool = False) -> datetime:
+    """Parse a date or datetime export bound.
+
+    A plain date used as an upper bound covers the whole day.
+    """
+    try:
+        date = parse_date(value)
+        if date:
+            moment = datetime.combine(date, time.min)
+            return moment + timedelta(days=1) if end else moment
+        moment = parse_datetime(value)
+    except ValueError:
+        moment = None
+    if moment is None:
+        raise ValueError(
+            f"Invalid date {value!r}, expected YYYY-MM-DD or YYYY-MM-DDThh:mm."
+        )
+    return moment
+
+
+def export_queryset(
+    kind: str,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    route: int | None = None,
+) -> QuerySet:
+    """Rows to export as plain dicts.
+
+    Flights and tickets are filtered by flight departure time, orders by
+    creation time. The route filter keeps orders with a ticket on it.
+    ``date_to`` is exclusive.
+    """
+    if kind not in EXPORT_FIELDS:
+        raise ValueError(f"Unknown export {kind!r}.")
+
+    if kind == "flights":
+        queryset, date_field, route_field = Flight.objects, "departure_time", "route_id"
+    elif kind == "tickets":
+        queryset = Ticket.objects
+        date_field, route_field = "flight__departure_time", "flight__route_id"
+    else:
+        queryset, date_field, route_field = Order.objects, "created_at", None
+
+    queryset = queryset.order_by("id")
+    if date_from:
+        queryset = queryset.filter(**{f"{date_field}__gte": date_from})
+    if date_to:
+        queryset = queryset.filter(**{f"{date_field}__lt": date_to})
+    if route:
+        if route_field:
+            queryset = queryset.filter(**{route_field: route})
+        else:
+            queryset = queryset.filter(
+                Exists(
+                    Ticket.objects.filter(
+                        order_id=OuterRef("pk"), flight__route_id=route
+                    )
+                )
+            )
+
+    return queryset.values(*EXPORT_FIELDS[kind])
+
+
+def _rows(queryset: QuerySet, chunk_size: int) -> Iterator[dict]:
+    for row in queryset.iterator(chunk_size=chunk_size):
+        yield {key.replace("__", "_"): value for key, value in row.items()}
+
+
+def stream_export(
+    queryset: QuerySet,
+    fmt: str = "ndjson",
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterable[str]:
+    """Encode export rows lazily, one chunk of text per row.
+
+    ``ndjson`` yields one object per line, ``json`` a single array.
+    Rows are read through a server-side cursor, so memory stays bounded
+    by ``chunk_size`` whatever the table size.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}, expected ndjson or json.")
+
+    if fmt == "ndjson":
+        for row in _rows(queryset, chunk_size):
+            yield _encoder.encode(row) + "\n"
+        return
+
+    separator = "[\n"
+    for row in _rows(queryset, chunk_size):
+        yield separator + _encoder.encode(row)
+        separator = ",\n"
+    yield "[]\n" if separator == "[\n" else "\n]\n"
+
+
+def content_type(fmt: str) -> str:
+    return "application/x-ndjson" if fmt == "ndjson" else "application/json"
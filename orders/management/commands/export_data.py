@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from orders.exports import (
+    EXPORT_CHUNK_SIZE,
+    EXPORT_FIELDS,
+    EXPORT_FORMATS,
+    export_queryset,
+    parse_bound,
+    stream_export,
+)
+
+
+class Command(BaseCommand):
+    help = "Stream flights, tickets or orders as NDJSON or a JSON array"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("kind", choices=sorted(EXPORT_FIELDS))
+        parser.add_argument(
+            "--format", dest="fmt", choices=EXPORT_FORMATS, default="ndjson"
+        )
+        parser.add_argument(
+            "--date-from",
+            help="Start date or datetime, inclusive",
+        )
+        parser.add_argument(
+            "--date-to",
+            help="End date (whole day included) or datetime, exclusive",
+        )
+        parser.add_argument("--route", type=int, help="Only rows of this route id")
+        parser.add_argument(
+            "--output",
+            help="Write to this file instead of stdout",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help="Rows fetched per database round trip",
+        )
+
+    def handle(self, *args, **options) -> None:
+        try:
+            date_from = options["date_from"] and parse_bound(options["date_from"])
+            date_to = options["date_to"] and parse_bound(options["date_to"], end=True)
+        except ValueError as error:
+            raise CommandError(error)
+
+        queryset = export_queryset(
+            options["kind"],
+            date_from=date_from or None,
+            date_to=date_to or None,
+            route=options["route"],
+        )
+        chunks = stream_export(queryset, options["fmt"], options["chunk_size"])
+
+        if not options["output"]:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+
+        with open(options["output"], "w", encoding="utf-8") as output:
+            output.writelines(chunks)
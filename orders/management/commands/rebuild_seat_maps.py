@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from airport.models import Flight
+from orders.models import SeatMap
+
+
+class Command(BaseCommand):
+    help = "Rebuild flight seat occupancy bitmaps from existing tickets"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--flight",
+            type=int,
+            action="append",
+            dest="flights",
+            help="Only process the flight with this id (can be repeated)",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report flights whose seat map does not match tickets",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options) -> None:
+        flights = Flight.objects.all()
+        if options["flights"]:
+            flights = flights.filter(pk__in=options["flights"])
+
+        if options["check"]:
+            mismatched = SeatMap.objects.inconsistent(
+                flights, batch_size=options["batch_size"]
+            )
+            if mismatched:
+                raise CommandError(
+                    f"{len(mismatched)} inconsistent seat maps, flights: "
+                    + ", ".join(str(pk) for pk in mismatched)
+                )
+            self.stdout.write(self.style.SUCCESS("All seat maps are consistent"))
+            return
+
+        rebuilt = SeatMap.objects.rebuild(flights, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} seat maps"))
@@ -0,0 +1,105 @@
+import random
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from airport.models import Flight
+from orders.models import SeatHold, Ticket
+from orders.reservations import SeatUnavailable, confirm_holds, hold_seats
+
+
+def run_stress(flight, threads: int, attempts: int, seats_per_order: int = 2) -> dict:
+    """Book seats of the flight from many threads at once.
+
+    Every thread repeatedly holds a few random seats and confirms them.
+    Returns booking counts and throughput; double bookings are counted by
+    comparing sold tickets with distinct seats.
+    """
+    airplane = flight.airplane
+    users = [
+        get_user_model().objects.create_user(
+            email=f"stress-{flight.pk}-{index}-{time.monotonic_ns()}@example.com",
+            password=None,
+        )
+        for index in range(threads)
+    ]
+    results = {"booked": 0, "conflicts": 0, "errors": 0}
+    results_lock = threading.Lock()
+    start = threading.Barrier(threads)
+
+    def worker(user, seed: int) -> None:
+        rng = random.Random(seed)
+        outcome = {"booked": 0, "conflicts": 0, "errors": 0}
+        try:
+            start.wait()
+            for _ in range(attempts):
+                seats = {
+                    (rng.randint(1, airplane.rows), rng.randint(1, airplane.seats_in_row))
+                    for _ in range(seats_per_order)
+                }
+                try:
+                    holds = hold_seats(user, flight, list(seats))
+                    confirm_holds(user, [hold.pk for hold in holds])
+                    outcome["booked"] += len(seats)
+                except SeatUnavailable:
+                    outcome["conflicts"] += 1
+                except Exception:
+                    outcome["errors"] += 1
+        finally:
+            connection.close()
+            with results_lock:
+                for key, value in outcome.items():
+                    results[key] += value
+
+    workers = [
+        threading.Thread(target=worker, args=(user, index))
+        for index, user in enumerate(users)
+    ]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    tickets = Ticket.objects.filter(flight=flight)
+    sold = tickets.count()
+    distinct_seats = tickets.values("row", "seat").distinct().count()
+    SeatHold.objects.filter(user__in=users).delete()
+    return {
+        **results,
+        "tickets": sold,
+        "double_booked": sold - distinct_seats,
+        "seconds": elapsed,
+        "attempts_per_second": threads * attempts / elapsed if elapsed else 0,
+    }
+
+
+class Command(BaseCommand):
+    help = "Book seats of a flight from concurrent threads and report throughput"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("flight", type=int)
+        parser.add_argument("--threads", type=int, default=16)
+        parser.add_argument("--attempts", type=int, default=50)
+        parser.add_argument("--seats-per-order", type=int, default=2)
+
+    def handle(self, *args, **options) -> None:
+        try:
+            flight = Flight.objects.select_related("airplane").get(pk=options["flight"])
+        except Flight.DoesNotExist:
+            raise CommandError(f"Flight {options['flight']} does not exist")
+
+        stats = run_stress(
+            flight,
+            threads=options["threads"],
+            attempts=options["attempts"],
+            seats_per_order=options["seats_per_order"],
+        )
+        for key, value in stats.items():
+            self.stdout.write(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}")
+        if stats["double_booked"]:
+            raise CommandError("Seats were double-booked")
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from orders.reservations import release_expired_holds
+
+
+class Command(BaseCommand):
+    help = "Delete expired seat holds, once or periodically"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Keep sweeping every INTERVAL seconds instead of once",
+        )
+
+    def handle(self, *args, **options) -> None:
+        while True:
+            released = release_expired_holds()
+            self.stdout.write(f"Released {released} expired seat holds")
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,75 @@
+# Generated by Django 4.2.6 on 2026-10-18 17:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_seat_maps(apps, schema_editor) -> None:
+    Flight = apps.get_model("airport", "Flight")
+    SeatMap = apps.get_model("orders", "SeatMap")
+    Ticket = apps.get_model("orders", "Ticket")
+
+    seat_maps = {}
+    tickets = Ticket.objects.order_by().values_list("flight_id", "row", "seat")
+    for flight_id, row, seat in tickets.iterator(chunk_size=2000):
+        seat_maps.setdefault(flight_id, []).append((row, seat))
+
+    flights = Flight.objects.filter(pk__in=list(seat_maps)).values_list(
+        "pk", "airplane__seats_in_row"
+    )
+    objs = []
+    for flight_id, seats_in_row in flights:
+        bitmap = bytearray()
+        sold = 0
+        for row, seat in set(seat_maps[flight_id]):
+            index = (row - 1) * seats_in_row + (seat - 1)
+            byte = index >> 3
+            if byte >= len(bitmap):
+                bitmap.extend(bytes(byte + 1 - len(bitmap)))
+            bitmap[byte] |= 0x80 >> (index & 7)
+            sold += 1
+        objs.append(
+            SeatMap(
+                flight_id=flight_id,
+                seats_in_row=seats_in_row,
+                bitmap=bytes(bitmap),
+                sold=sold,
+            )
+        )
+    SeatMap.objects.bulk_create(objs, batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("airport", "0008_alter_ticket_unique_together_remove_ticket_flight_and_more"),
+        ("orders", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SeatMap",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("seats_in_row", models.IntegerField()),
+                ("bitmap", models.BinaryField(default=bytes)),
+                ("sold", models.IntegerField(default=0)),
+                (
+                    "flight",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="seat_map",
+                        to="airport.flight",
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(build_seat_maps, migrations.RunPython.noop),
+    ]
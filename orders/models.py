@@ -1,8 +1,11 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.core.exceptions import ValidationError
 
+from airport.availability import adjust_sold, day_key, refresh_availability
+from airport.caching import response_cache
 from airport.models import Flight
+from orders.utils import invalidate_seat_grid
 
 
 class Order(models.Model):
@@ -67,3 +70,188 @@ class Ticket(models.Model):
     class Meta:
         unique_together = ("flight", "row", "seat")
         ordering = ["row", "seat"]
+
+
+
+class SeatHold(models.Model):
+    """Short-lived reservation of a seat before it is paid for"""
+
+    row = models.IntegerField()
+    seat = models.IntegerField()
+    flight = models.ForeignKey(Flight, on_delete=models.CASCADE, related_name="holds")
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="seat_holds"
+    )
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self) -> str:
+        return f"Hold of flight {self.flight_id}. Row number: {self.row}, seat: {self.seat}"
+
+    class Meta:
+        unique_together = ("flight", "row", "seat")
+        ordering = ["expires_at"]
+
+
+class SeatMapManager(models.Manager):
+    """Keep per-flight seat occupancy bitmaps in sync with tickets."""
+
+    def _locked(self, flight) -> "SeatMap":
+        seat_map, _ = self.select_for_update().get_or_create(
+            flight_id=flight.pk,
+            defaults={"seats_in_row": flight.airplane.seats_in_row},
+        )
+        return seat_map
+
+    @transaction.atomic
+    def occupy(self, flight, seats) -> "SeatMap":
+        """Mark (row, seat) pairs of the flight as sold"""
+        seat_map = self._locked(flight)
+        sold = seat_map.sold
+        seat_map.set_seats(seats, occupied=True)
+        seat_map.save(update_fields=["bitmap", "sold"])
+        if seat_map.sold != sold:
+            adjust_sold(flight, seat_map.sold - sold)
+        invalidate_seat_grid(flight.pk)
+        response_cache.bump("ticket")
+        return seat_map
+
+    @transaction.atomic
+    def release(self, flight, seats) -> "SeatMap":
+        """Mark (row, seat) pairs of the flight as free"""
+        seat_map = self._locked(flight)
+        sold = seat_map.sold
+        seat_map.set_seats(seats, occupied=False)
+        seat_map.save(update_fields=["bitmap", "sold"])
+        if seat_map.sold != sold:
+            adjust_sold(flight, seat_map.sold - sold)
+        invalidate_seat_grid(flight.pk)
+        response_cache.bump("ticket")
+        return seat_map
+
+    def build(self, flight, seats) -> "SeatMap":
+        """Return an unsaved seat map of the flight with the given seats sold"""
+        seat_map = self.model(
+            flight_id=flight.pk,
+            seats_in_row=flight.airplane.seats_in_row,
+        )
+        seat_map.set_seats(seats, occupied=True)
+        return seat_map
+
+    def _seats_by_flight(self, flights) -> dict[int, list[tuple[int, int]]]:
+        seats = {flight.pk: [] for flight in flights}
+        tickets = (
+            Ticket.objects.filter(flight__in=list(seats))
+            .order_by()
+            .values_list("flight_id", "row", "seat")
+        )
+        for flight_id, row, seat in tickets.iterator(chunk_size=2000):
+            seats[flight_id].append((row, seat))
+        return seats
+
+    def rebuild(self, flights=None, batch_size: int = 500) -> int:
+        """Recreate the seat maps of the flights from their tickets"""
+        if flights is None:
+            flights = Flight.objects.all()
+        flights = flights.select_related("airplane").order_by("pk")
+
+        rebuilt = 0
+        batch = []
+        for flight in flights.iterator(chunk_size=batch_size):
+            batch.append(flight)
+            if len(batch) == batch_size:
+                rebuilt += self._rebuild_batch(batch)
+                batch = []
+        if batch:
+            rebuilt += self._rebuild_batch(batch)
+        if rebuilt:
+            # Once, after every batch is committed
+            response_cache.bump("ticket")
+        return rebuilt
+
+    @transaction.atomic
+    def _rebuild_batch(self, flights) -> int:
+        seats = self._seats_by_flight(flights)
+        self.filter(flight__in=flights).delete()
+        self.bulk_create(
+            [self.build(flight, seats[flight.pk]) for flight in flights]
+        )
+        for flight in flights:
+            invalidate_seat_grid(flight.pk)
+        refresh_availability(day_key(flight) for flight in flights)
+        return len(flights)
+
+    def inconsistent(self, flights=None, batch_size: int = 500) -> list[int]:
+        """Return ids of the flights whose seat map does not match tickets"""
+        if flights is None:
+            flights = Flight.objects.all()
+        flights = flights.select_related("airplane", "seat_map").order_by("pk")
+
+        mismatched = []
+        batch = []
+        for flight in flights.iterator(chunk_size=batch_size):
+            batch.append(flight)
+            if len(batch) == batch_size:
+                mismatched += self._inconsistent_batch(batch)
+                batch = []
+        if batch:
+            mismatched += self._inconsistent_batch(batch)
+        return mismatched
+
+    def _inconsistent_batch(self, flights) -> list[int]:
+        seats = self._seats_by_flight(flights)
+        mismatched = []
+        for flight in flights:
+            expected = self.build(flight, seats[flight.pk])
+            seat_map = getattr(flight, "seat_map", None)
+            if seat_map is None:
+                if expected.sold:
+                    mismatched.append(flight.pk)
+            elif (
+                bytes(seat_map.bitmap) != bytes(expected.bitmap)
+                or seat_map.sold != expected.sold
+                or seat_map.seats_in_row != expected.seats_in_row
+            ):
+                mismatched.append(flight.pk)
+        return mismatched
+
+
+class SeatMap(models.Model):
+    """Occupancy bitmap of a flight: one bit per seat, row by row.
+
+    Bit ``(row - 1) * seats_in_row + (seat - 1)`` is set when the seat
+    is sold, most significant bit of each byte first.
+    """
+
+    flight = models.OneToOneField(Flight, on_delete=models.CASCADE, related_name="seat_map")
+    seats_in_row = models.IntegerField()
+    bitmap = models.BinaryField(default=bytes)
+    sold = models.IntegerField(default=0)
+
+    objects = SeatMapManager()
+
+    def __str__(self) -> str:
+        return f"Seat map of flight {self.flight_id}. Sold: {self.sold}"
+
+    def _index(self, row: int, seat: int) -> int:
+        return (row - 1) * self.seats_in_row + (seat - 1)
+
+    def is_occupied(self, row: int, seat: int) -> bool:
+        index = self._index(row, seat)
+        bitmap = self.bitmap
+        byte = index >> 3
+        if byte >= len(bitmap):
+            return False
+        return bool(bitmap[byte] & (0x80 >> (index & 7)))
+
+    def set_seats(self, seats, occupied: bool) -> None:
+        bitmap = bytearray(self.bitmap)
+        for row, seat in seats:
+            index = self._index(row, seat)
+            byte, mask = index >> 3, 0x80 >> (index & 7)
+            if byte >= len(bitmap):
+                bitmap.extend(bytes(byte + 1 - len(bitmap)))
+            if bool(bitmap[byte] & mask) == occupied:
+                continue
+            bitmap[byte] ^= mask
+            self.sold += 1 if occupied else -1
+        self.bitmap = bytes(bitmap)
@@ -0,0 +1,188 @@
+"""Seat holds and bookings serialized per flight.
+
+Every operation that sells or holds seats runs under ``lock_flights``,
+so checking a seat and taking it happen atomically for all concurrent
+requests. On PostgreSQL the flight rows are locked with
+``SELECT ... FOR UPDATE``; databases without row locks (SQLite) fall back
+to a process-wide lock, which is enough for single-process deployments
+and tests since SQLite serializes writers anyway.
+"""
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from airport.models import Flight
+from orders.models import Order, SeatHold, SeatMap, Ticket
+
+_local_lock = threading.RLock()
+
+
+class SeatUnavailable(Exception):
+    """Some of the requested seats are sold, held by others or expired"""
+
+    def __init__(self, seats) -> None:
+        self.seats = set(seats)
+        super().__init__(
+            "Seats are not available: "
+            + ", ".join(f"flight {f} row {r} seat {s}" for f, r, s in sorted(self.seats))
+        )
+
+
+def hold_ttl() -> timedelta:
+    return timedelta(seconds=getattr(settings, "SEAT_HOLD_TTL", 600))
+
+
+@contextmanager
+def local_lock():
+    """Process-wide lock for databases that cannot lock rows"""
+    if connection.features.has_select_for_update:
+        yield
+        return
+    with _local_lock:
+        yield
+
+
+@contextmanager
+def lock_flights(flight_ids):
+    """Run the block in a transaction holding a lock on every flight.
+
+    Rows are locked in primary key order so concurrent bookings spanning
+    several flights cannot deadlock. The process-local fallback must not
+    be entered from an outer atomic block, otherwise the lock would be
+    released before the outer transaction commits.
+    """
+    flight_ids = sorted(set(flight_ids))
+    with local_lock(), transaction.atomic():
+        if connection.features.has_select_for_update:
+            list(
+                Flight.objects.select_for_update()
+                .filter(pk__in=flight_ids)
+                .order_by("pk")
+                .values_list("pk", flat=True)
+            )
+        yield
+
+
+def _seats_filter(seats) -> Q:
+    query = Q()
+    for row, seat in seats:
+        query |= Q(row=row, seat=seat)
+    return query
+
+
+def _taken_seats(flight_id: int, seats, user, now) -> list[tuple[int, int, int]]:
+    """Return requested seats that are sold or held by another user"""
+    seat_map = SeatMap.objects.filter(flight_id=flight_id).first()
+    held = set(
+        SeatHold.objects.filter(flight_id=flight_id, expires_at__gt=now)
+        .filter(_seats_filter(seats))
+        .exclude(user=user)
+        .values_list("row", "seat")
+    )
+    return [
+        (flight_id, row, seat)
+        for row, seat in seats
+        if (row, seat) in held
+        or (seat_map is not None and seat_map.is_occupied(row, seat))
+    ]
+
+
+def hold_seats(user, flight, seats, ttl: timedelta = None) -> list[SeatHold]:
+    """Hold seats of the flight for the user, extending own existing holds"""
+    seats = list(dict.fromkeys(seats))
+    with lock_flights([flight.pk]):
+        now = timezone.now()
+        SeatHold.objects.filter(flight=flight, expires_at__lte=now).delete()
+
+        taken = _taken_seats(flight.pk, seats, user, now)
+        if taken:
+            raise SeatUnavailable(taken)
+
+        expires_at = now + (ttl or hold_ttl())
+        SeatHold.objects.filter(flight=flight, user=user).filter(
+            _seats_filter(seats)
+        ).delete()
+        return SeatHold.objects.bulk_create(
+            [
+                SeatHold(flight=flight, user=user, row=row, seat=seat, expires_at=expires_at)
+                for row, seat in seats
+            ]
+        )
+
+
+def book_tickets(user, tickets_data, holds=None) -> Order:
+    """Create an order with the tickets if all their seats are free.
+
+    When holds are given, each of them must still be active at the moment
+    of booking, otherwise the whole booking fails.
+    """
+    seats = defaultdict(list)
+    for ticket_data in tickets_data:
+        seats[ticket_data["flight"]].append((ticket_data["row"], ticket_data["seat"]))
+
+    with lock_flights(flight.pk for flight in seats):
+        now = timezone.now()
+
+        if holds is not None:
+            active = set(
+                SeatHold.objects.filter(
+                    pk__in=[hold.pk for hold in holds], user=user, expires_at__gt=now
+                ).values_list("pk", flat=True)
+            )
+            expired = [
+                (hold.flight_id, hold.row, hold.seat)
+                for hold in holds
+                if hold.pk not in active
+            ]
+            if expired:
+                raise SeatUnavailable(expired)
+
+        taken = []
+        for flight, flight_seats in seats.items():
+            taken += _taken_seats(flight.pk, flight_seats, user, now)
+        if taken:
+            raise SeatUnavailable(taken)
+
+        order = Order.objects.create(user=user)
+        Ticket.objects.bulk_create(
+            [Ticket(order=order, **ticket_data) for ticket_data in tickets_data]
+        )
+        for flight, flight_seats in seats.items():
+            SeatMap.objects.occupy(flight, flight_seats)
+            SeatHold.objects.filter(flight=flight, user=user).filter(
+                _seats_filter(flight_seats)
+            ).delete()
+        return order
+
+
+def confirm_holds(user, hold_ids) -> Order:
+    """Turn the user's holds into tickets of a new order"""
+    with local_lock():
+        holds = list(
+            SeatHold.objects.filter(pk__in=hold_ids, user=user).select_related(
+                "flight__airplane"
+            )
+        )
+        if len(holds) != len(set(hold_ids)):
+            raise SeatHold.DoesNotExist("Some of the holds do not exist")
+
+        return book_tickets(
+            user,
+            [
+                {"flight": hold.flight, "row": hold.row, "seat": hold.seat}
+                for hold in holds
+            ],
+            holds=holds,
+        )
+
+
+def release_expired_holds() -> int:
+    """Delete every expired hold, returning how many were removed"""
+    deleted, _ = SeatHold.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
@@ -1,18 +1,99 @@
 from rest_framework import serializers
-from django.db import transaction
 
+from airport.models import Flight
 from airport.serializers import FlightListSerializer
-from orders.models import Ticket, Order
+from orders.models import SeatHold, Ticket, Order
+from orders.reservations import (
+    SeatUnavailable,
+    book_tickets,
+    confirm_holds,
+    hold_seats,
+)
+
+SEAT_TAKEN_MESSAGE = "The fields flight, row, seat must make a unique set."
+
+
+def seat_errors(seats_data, taken) -> list[dict]:
+    """Per-seat errors for the seats of seats_data listed in taken"""
+    errors = []
+    for seat_data in seats_data:
+        if (seat_data["flight"].pk, seat_data["row"], seat_data["seat"]) in taken:
+            error = serializers.ErrorDetail(SEAT_TAKEN_MESSAGE, code="unique")
+            errors.append({"non_field_errors": [error]})
+        else:
+            errors.append({})
+    return errors
+
+
+class PreloadedFlightField(serializers.PrimaryKeyRelatedField):
+    """Resolve flights preloaded by TicketBulkSerializer without a query"""
+
+    def to_internal_value(self, data) -> Flight:
+        flights = self.context.get("flights")
+        if flights is not None:
+            try:
+                return flights[int(data)]
+            except (KeyError, TypeError, ValueError):
+                pass
+        return super().to_internal_value(data)
+
+
+class TicketBulkSerializer(serializers.ListSerializer):
+    """Validate a batch of tickets against flights loaded once per flight"""
+
+    def to_internal_value(self, data) -> list[dict]:
+        if isinstance(data, list):
+            flight_ids = set()
+            for item in data:
+                try:
+                    flight_ids.add(int(item["flight"]))
+                except (KeyError, TypeError, ValueError):
+                    continue
+            self.context["flights"] = Flight.objects.select_related(
+                "airplane", "seat_map"
+            ).in_bulk(flight_ids)
+
+        tickets = super().to_internal_value(data)
+        self.validate_seats_free(tickets)
+        return tickets
+
+    @staticmethod
+    def validate_seats_free(tickets) -> None:
+        """Report every ticket whose seat is sold or repeated in the batch"""
+        errors = []
+        requested = set()
+        for ticket in tickets:
+            flight, row, seat = ticket["flight"], ticket["row"], ticket["seat"]
+            seat_map = getattr(flight, "seat_map", None)
+            if (flight.pk, row, seat) in requested or (
+                seat_map is not None and seat_map.is_occupied(row, seat)
+            ):
+                error = serializers.ErrorDetail(SEAT_TAKEN_MESSAGE, code="unique")
+                errors.append({"non_field_errors": [error]})
+            else:
+                errors.append({})
+            requested.add((flight.pk, row, seat))
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
 
 
 class TicketSerializer(serializers.ModelSerializer):
+    flight = PreloadedFlightField(
+        queryset=Flight.objects.select_related("airplane", "seat_map")
+    )
+
+    def get_validators(self) -> list:
+        if isinstance(self.parent, TicketBulkSerializer):
+            return []
+        return super().get_validators()
 
     def validate(self, attrs) -> dict[str]:
         data = super(TicketSerializer, self).validate(attrs)
         Ticket.validate_ticket(
             attrs["row"],
             attrs["seat"],
-            attrs["flight"],
+            attrs["flight"].airplane,
             serializers.ValidationError
         )
 
@@ -21,6 +102,7 @@ class TicketSerializer(serializers.ModelSerializer):
     class Meta:
         model = Ticket
         fields = ("id", "row", "seat", "flight")
+        list_serializer_class = TicketBulkSerializer
 
 
 class TicketListSerializer(TicketSerializer):
@@ -34,14 +116,74 @@ class OrderSerializer(serializers.ModelSerializer):
         model = Order
         fields = ("id", "tickets", "created_at")
 
-    @transaction.atomic
     def create(self, validated_data) -> Order:
         tickets_data = validated_data.pop("tickets")
-        order = Order.objects.create(**validated_data)
-        for ticket_data in tickets_data:
-            Ticket.objects.create(order=order, **ticket_data)
-        return order
+        try:
+            return book_tickets(validated_data["user"], tickets_data)
+        except SeatUnavailable as error:
+            raise serializers.ValidationError(
+                {"tickets": seat_errors(tickets_data, error.seats)}
+            )
 
 
 class OrderListSerializer(OrderSerializer):
-    tickets = TicketListSerializer(many=True, read_only=True)
\ No newline at end of file
+    tickets = TicketListSerializer(many=True, read_only=True)
+
+
+class SeatSerializer(serializers.Serializer):
+    row = serializers.IntegerField()
+    seat = serializers.IntegerField()
+
+
+class SeatHoldSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SeatHold
+        fields = ("id", "row", "seat", "flight", "expires_at")
+
+
+class SeatHoldCreateSerializer(serializers.Serializer):
+    flight = serializers.PrimaryKeyRelatedField(
+        queryset=Flight.objects.select_related("airplane")
+    )
+    seats = SeatSerializer(many=True, allow_empty=False)
+
+    def validate(self, attrs) -> dict:
+        for seat in attrs["seats"]:
+            Ticket.validate_ticket(
+                seat["row"],
+                seat["seat"],
+                attrs["flight"].airplane,
+                serializers.ValidationError
+            )
+        return attrs
+
+    def create(self, validated_data) -> list[SeatHold]:
+        flight = validated_data["flight"]
+        seats = [(seat["row"], seat["seat"]) for seat in validated_data["seats"]]
+        try:
+            return hold_seats(validated_data["user"], flight, seats)
+        except SeatUnavailable as error:
+            raise serializers.ValidationError(
+                {
+                    "seats": seat_errors(
+                        [{"flight": flight, **seat} for seat in validated_data["seats"]],
+                        error.seats,
+                    )
+                }
+            )
+
+
+class SeatHoldConfirmSerializer(serializers.Serializer):
+    holds = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False
+    )
+
+    def create(self, validated_data) -> Order:
+        try:
+            return confirm_holds(validated_data["user"], validated_data["holds"])
+        except SeatHold.DoesNotExist:
+            raise serializers.ValidationError({"holds": "Some of the holds do not exist."})
+        except SeatUnavailable:
+            raise serializers.ValidationError(
+                {"holds": "Some of the holds have expired or their seats are taken."}
+            )
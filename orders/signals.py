@@ -0,0 +1,46 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from airport.models import Flight
+from orders.models import SeatMap, Ticket
+from orders.utils import invalidate_seat_grid
+
+
+@receiver(pre_save, sender=Ticket)
+def remember_ticket_seat(sender, instance, **kwargs) -> None:
+    """Keep the seat a ticket had before an update so it can be freed"""
+    instance._previous_seat = None
+    if instance.pk:
+        instance._previous_seat = (
+            Ticket.objects.filter(pk=instance.pk)
+            .values_list("flight_id", "row", "seat")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Ticket)
+def occupy_ticket_seat(sender, instance, created, **kwargs) -> None:
+    previous = getattr(instance, "_previous_seat", None)
+    current = (instance.flight_id, instance.row, instance.seat)
+    if previous == current:
+        return
+    if previous:
+        flight_id, row, seat = previous
+        flight = (
+            instance.flight
+            if flight_id == instance.flight_id
+            else Flight.objects.select_related("airplane").get(pk=flight_id)
+        )
+        SeatMap.objects.release(flight, [(row, seat)])
+    SeatMap.objects.occupy(instance.flight, [(instance.row, instance.seat)])
+
+
+@receiver(post_delete, sender=Ticket)
+def release_ticket_seat(sender, instance, **kwargs) -> None:
+    SeatMap.objects.release(instance.flight, [(instance.row, instance.seat)])
+
+
+@receiver(post_save, sender=Flight)
+@receiver(post_delete, sender=Flight)
+def drop_flight_seat_grid(sender, instance, **kwargs) -> None:
+    invalidate_seat_grid(instance.pk)
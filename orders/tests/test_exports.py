@@ -0,0 +1,115 @@
+import json
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.tests.test_airport_api import sample_flight, sample_route
+from orders.models import Order, Ticket
+
+
+def export_url(kind: str) -> str:
+    return reverse("orders:export", args=[kind])
+
+
+def read_stream(response) -> str:
+    return b"".join(response.streaming_content).decode()
+
+
+class ExportApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="admin@admin.com",
+            password="testpass",
+            is_staff=True,
+        )
+        self.client.force_authenticate(self.user)
+        self.route = sample_route()
+        self.early = sample_flight(
+            route=self.route,
+            departure_time="2023-10-17 08:00",
+            arrival_time="2023-10-17 12:00",
+        )
+        self.late = sample_flight(
+            departure_time="2023-10-20 08:00",
+            arrival_time="2023-10-20 12:00",
+        )
+        self.order = Order.objects.create(user=self.user)
+        Ticket.objects.create(order=self.order, flight=self.early, row=1, seat=1)
+        Ticket.objects.create(order=self.order, flight=self.late, row=1, seat=2)
+
+    def test_export_requires_admin(self) -> None:
+        user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="testpass",
+        )
+        self.client.force_authenticate(user)
+
+        result = self.client.get(export_url("flights"))
+
+        self.assertEqual(result.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_flights_ndjson(self) -> None:
+        result = self.client.get(export_url("flights"))
+
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        self.assertTrue(result.streaming)
+        self.assertEqual(result["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in read_stream(result).splitlines()]
+        self.assertEqual([row["id"] for row in rows], [self.early.id, self.late.id])
+        self.assertEqual(rows[0]["route_id"], self.route.id)
+        self.assertEqual(rows[0]["departure_time"], "2023-10-17T08:00:00")
+
+    def test_export_tickets_json_array(self) -> None:
+        result = self.client.get(export_url("tickets"), {"export_format": "json"})
+
+        rows = json.loads(read_stream(result))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["order_id"], self.order.id)
+
+    def test_export_empty_json_array(self) -> None:
+        result = self.client.get(
+            export_url("flights"),
+            {"export_format": "json", "date_from": "2030-01-01"},
+        )
+
+        self.assertEqual(json.loads(read_stream(result)), [])
+
+    def test_export_filters(self) -> None:
+        result = self.client.get(
+            export_url("tickets"),
+            {"date_from": "2023-10-17", "date_to": "2023-10-17"},
+        )
+        rows = [json.loads(line) for line in read_stream(result).splitlines()]
+        self.assertEqual([row["flight_id"] for row in rows], [self.early.id])
+
+        Order.objects.create(user=self.user)
+        result = self.client.get(export_url("orders"), {"route": self.route.id})
+        rows = [json.loads(line) for line in read_stream(result).splitlines()]
+        self.assertEqual([row["id"] for row in rows], [self.order.id])
+
+    def test_export_invalid_params(self) -> None:
+        self.assertEqual(
+            self.client.get(export_url("crew")).status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+        for params in (
+            {"export_format": "xml"},
+            {"date_from": "yesterday"},
+            {"route": "first"},
+        ):
+            result = self.client.get(export_url("flights"), params)
+            self.assertEqual(result.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_command(self) -> None:
+        out = StringIO()
+
+        call_command("export_data", "flights", "--date-to=2023-10-18", stdout=out)
+
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([row["id"] for row in rows], [self.early.id])
@@ -0,0 +1,139 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.tests.test_airport_api import sample_flight
+from orders.models import Order, SeatMap, Ticket
+
+ORDER_URL = reverse("orders:orders-list")
+
+
+class OrderCreateTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="testpass",
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight()
+
+    def test_create_order_with_tickets(self) -> None:
+        other_flight = sample_flight()
+        payload = {
+            "tickets": [
+                {"row": 1, "seat": seat, "flight": self.flight.id}
+                for seat in range(1, 7)
+            ] + [
+                {"row": 2, "seat": seat, "flight": other_flight.id}
+                for seat in range(1, 4)
+            ]
+        }
+
+        result = self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(result.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Ticket.objects.filter(order__user=self.user).count(), 9)
+        self.assertEqual(SeatMap.objects.get(flight=self.flight).sold, 6)
+        self.assertEqual(SeatMap.objects.get(flight=other_flight).sold, 3)
+
+    def test_create_order_query_count_does_not_grow_with_tickets(self) -> None:
+        def create_order(row: int, seats: int) -> None:
+            payload = {
+                "tickets": [
+                    {"row": row, "seat": seat, "flight": self.flight.id}
+                    for seat in range(1, seats + 1)
+                ]
+            }
+            self.client.post(ORDER_URL, payload, format="json")
+
+        create_order(row=1, seats=1)
+        with self.assertNumQueries(14):
+            create_order(row=2, seats=1)
+        with self.assertNumQueries(14):
+            create_order(row=3, seats=6)
+
+    def test_create_order_reports_taken_seats(self) -> None:
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(flight=self.flight, order=order, row=1, seat=2)
+        payload = {
+            "tickets": [
+                {"row": 1, "seat": 1, "flight": self.flight.id},
+                {"row": 1, "seat": 2, "flight": self.flight.id},
+                {"row": 1, "seat": 1, "flight": self.flight.id},
+            ]
+        }
+
+        result = self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(result.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(result.data["tickets"][0], {})
+        self.assertIn("non_field_errors", result.data["tickets"][1])
+        self.assertIn("non_field_errors", result.data["tickets"][2])
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_create_order_validates_seat_range(self) -> None:
+        payload = {"tickets": [{"row": 51, "seat": 1, "flight": self.flight.id}]}
+
+        result = self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(result.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("row", result.data["tickets"][0])
+
+
+class OrderListQueryTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="testpass",
+        )
+        self.client.force_authenticate(self.user)
+
+    def create_orders(self, count: int, tickets: int = 3) -> None:
+        for _ in range(count):
+            order = Order.objects.create(user=self.user)
+            for seat in range(1, tickets + 1):
+                Ticket.objects.create(
+                    order=order, flight=sample_flight(), row=1, seat=seat
+                )
+
+    def test_order_list_query_count_is_constant(self) -> None:
+        self.create_orders(1)
+        with self.assertNumQueries(3):
+            self.client.get(ORDER_URL)
+
+        self.create_orders(9)
+        with self.assertNumQueries(3):
+            result = self.client.get(ORDER_URL, {"page_size": 10})
+
+        self.assertEqual(len(result.data["results"]), 10)
+
+    def test_order_list_shows_tickets_available(self) -> None:
+        flight = sample_flight()
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(order=order, flight=flight, row=1, seat=1)
+        Ticket.objects.create(order=order, flight=flight, row=1, seat=2)
+
+        result = self.client.get(ORDER_URL)
+
+        tickets = result.data["results"][0]["tickets"]
+        self.assertEqual(len(tickets), 2)
+        self.assertEqual(
+            tickets[0]["flight"]["tickets_available"],
+            flight.airplane.rows * flight.airplane.seats_in_row - 2,
+        )
+
+    def test_order_list_only_own_orders(self) -> None:
+        other = get_user_model().objects.create_user(
+            email="other@user.com",
+            password="testpass",
+        )
+        Order.objects.create(user=other)
+        self.create_orders(1)
+
+        result = self.client.get(ORDER_URL)
+
+        self.assertEqual(len(result.data["results"]), 1)
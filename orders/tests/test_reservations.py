@@ -0,0 +1,123 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.tests.test_airport_api import sample_flight
+from orders.management.commands.stress_reservations import run_stress
+from orders.models import SeatHold, SeatMap, Ticket
+from orders.reservations import (
+    SeatUnavailable,
+    book_tickets,
+    confirm_holds,
+    hold_seats,
+    release_expired_holds,
+)
+
+HOLD_URL = reverse("orders:holds-list")
+CONFIRM_URL = reverse("orders:holds-confirm")
+ORDER_URL = reverse("orders:orders-list")
+
+
+def sample_user(email: str = "user@user.com"):
+    return get_user_model().objects.create_user(email=email, password="testpass")
+
+
+class SeatHoldTests(TestCase):
+    def setUp(self) -> None:
+        self.user = sample_user()
+        self.other_user = sample_user("other@user.com")
+        self.flight = sample_flight()
+
+    def test_held_seat_unavailable_to_others(self) -> None:
+        hold_seats(self.user, self.flight, [(1, 1)])
+
+        with self.assertRaises(SeatUnavailable) as context:
+            hold_seats(self.other_user, self.flight, [(1, 1), (1, 2)])
+
+        self.assertEqual(context.exception.seats, {(self.flight.id, 1, 1)})
+        with self.assertRaises(SeatUnavailable):
+            book_tickets(
+                self.other_user, [{"flight": self.flight, "row": 1, "seat": 1}]
+            )
+
+    def test_expired_hold_is_swept(self) -> None:
+        hold_seats(self.user, self.flight, [(1, 1)], ttl=timedelta(seconds=-1))
+
+        holds = hold_seats(self.other_user, self.flight, [(1, 1)])
+
+        self.assertEqual(holds[0].user, self.other_user)
+        self.assertEqual(SeatHold.objects.count(), 1)
+
+    def test_confirm_turns_holds_into_tickets(self) -> None:
+        holds = hold_seats(self.user, self.flight, [(2, 1), (2, 2)])
+
+        order = confirm_holds(self.user, [hold.pk for hold in holds])
+
+        self.assertEqual(order.tickets.count(), 2)
+        self.assertFalse(SeatHold.objects.exists())
+        self.assertEqual(SeatMap.objects.get(flight=self.flight).sold, 2)
+
+    def test_confirm_expired_hold_fails(self) -> None:
+        holds = hold_seats(self.user, self.flight, [(1, 1)])
+        SeatHold.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        with self.assertRaises(SeatUnavailable):
+            confirm_holds(self.user, [hold.pk for hold in holds])
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_release_expired_holds(self) -> None:
+        hold_seats(self.user, self.flight, [(1, 1)], ttl=timedelta(seconds=-1))
+        hold_seats(self.user, sample_flight(), [(1, 1)])
+
+        self.assertEqual(release_expired_holds(), 1)
+        self.assertEqual(SeatHold.objects.count(), 1)
+
+
+class SeatHoldApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = sample_user()
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight()
+
+    def test_hold_and_confirm(self) -> None:
+        payload = {"flight": self.flight.id, "seats": [{"row": 3, "seat": 4}]}
+
+        result = self.client.post(HOLD_URL, payload, format="json")
+        self.assertEqual(result.status_code, status.HTTP_201_CREATED)
+
+        hold_ids = [hold["id"] for hold in result.data]
+        result = self.client.post(CONFIRM_URL, {"holds": hold_ids}, format="json")
+
+        self.assertEqual(result.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(result.data["tickets"][0]["row"], 3)
+        self.assertEqual(result.data["tickets"][0]["seat"], 4)
+
+    def test_order_for_seat_held_by_other_user(self) -> None:
+        hold_seats(sample_user("other@user.com"), self.flight, [(1, 1)])
+        payload = {"tickets": [{"row": 1, "seat": 1, "flight": self.flight.id}]}
+
+        result = self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(result.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("non_field_errors", result.data["tickets"][0])
+
+
+class ReservationStressTests(TransactionTestCase):
+    def test_concurrent_bookings_never_double_book(self) -> None:
+        flight = sample_flight()
+        flight.airplane.rows = 4
+        flight.airplane.save()
+
+        stats = run_stress(flight, threads=8, attempts=10)
+
+        self.assertEqual(stats["errors"], 0)
+        self.assertEqual(stats["double_booked"], 0)
+        self.assertGreater(stats["tickets"], 0)
+        self.assertGreater(stats["attempts_per_second"], 0)
+        self.assertEqual(stats["tickets"], SeatMap.objects.get(flight=flight).sold)
@@ -0,0 +1,151 @@
+import base64
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command, CommandError
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.caching import response_cache
+from airport.tests.test_airport_api import sample_flight
+from orders.models import Order, SeatMap, Ticket
+
+FLIGHT_URL = reverse("airport:flight-list")
+
+
+class SeatMapTests(TestCase):
+    def setUp(self) -> None:
+        response_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="testpass",
+        )
+        self.flight = sample_flight()
+        self.order = Order.objects.create(user=self.user)
+
+    def test_ticket_occupies_seat(self) -> None:
+        Ticket.objects.create(flight=self.flight, order=self.order, row=2, seat=3)
+
+        seat_map = SeatMap.objects.get(flight=self.flight)
+
+        self.assertEqual(seat_map.sold, 1)
+        self.assertTrue(seat_map.is_occupied(2, 3))
+        self.assertFalse(seat_map.is_occupied(3, 2))
+
+    def test_deleted_ticket_releases_seat(self) -> None:
+        ticket = Ticket.objects.create(flight=self.flight, order=self.order, row=1, seat=1)
+        ticket.delete()
+
+        seat_map = SeatMap.objects.get(flight=self.flight)
+
+        self.assertEqual(seat_map.sold, 0)
+        self.assertFalse(seat_map.is_occupied(1, 1))
+
+    def test_moved_ticket_updates_seats(self) -> None:
+        ticket = Ticket.objects.create(flight=self.flight, order=self.order, row=1, seat=1)
+        ticket.seat = 2
+        ticket.save()
+
+        seat_map = SeatMap.objects.get(flight=self.flight)
+
+        self.assertEqual(seat_map.sold, 1)
+        self.assertFalse(seat_map.is_occupied(1, 1))
+        self.assertTrue(seat_map.is_occupied(1, 2))
+
+    def test_tickets_available_uses_seat_map(self) -> None:
+        client = APIClient()
+        client.force_authenticate(self.user)
+        Ticket.objects.create(flight=self.flight, order=self.order, row=1, seat=1)
+        Ticket.objects.create(flight=self.flight, order=self.order, row=1, seat=2)
+        empty_flight = sample_flight()
+
+        result = client.get(FLIGHT_URL)
+        available = {flight["id"]: flight["tickets_available"] for flight in result.data["results"]}
+
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        self.assertEqual(available[self.flight.id], self.flight.airplane.capacity - 2)
+        self.assertEqual(available[empty_flight.id], empty_flight.airplane.capacity)
+
+    def test_rebuild_command_restores_seat_maps(self) -> None:
+        Ticket.objects.create(flight=self.flight, order=self.order, row=5, seat=6)
+        SeatMap.objects.all().delete()
+
+        with self.assertRaises(CommandError):
+            call_command("rebuild_seat_maps", "--check", stdout=StringIO())
+
+        call_command("rebuild_seat_maps", stdout=StringIO())
+        call_command("rebuild_seat_maps", "--check", stdout=StringIO())
+
+        seat_map = SeatMap.objects.get(flight=self.flight)
+        self.assertEqual(seat_map.sold, 1)
+        self.assertTrue(seat_map.is_occupied(5, 6))
+
+    def test_rebuild_refreshes_cached_flight_lists(self) -> None:
+        client = APIClient()
+        client.force_authenticate(self.user)
+        sample_flight()
+        client.get(FLIGHT_URL)
+        # Without signals, as a drifted seat map would be
+        Ticket.objects.bulk_create(
+            [Ticket(flight=self.flight, order=self.order, row=1, seat=1)]
+        )
+
+        with mock.patch.object(
+            response_cache, "bump", wraps=response_cache.bump
+        ) as bump:
+            SeatMap.objects.rebuild(batch_size=1)
+
+        bump.assert_called_once_with("ticket")
+        result = client.get(FLIGHT_URL)
+        available = {
+            flight["id"]: flight["tickets_available"]
+            for flight in result.data["results"]
+        }
+        self.assertEqual(available[self.flight.id], self.flight.airplane.capacity - 1)
+
+
+class SeatGridApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="testpass",
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight()
+        self.order = Order.objects.create(user=self.user)
+        self.url = reverse("airport:flight-seats", args=[self.flight.id])
+
+    def test_seat_grid_marks_sold_seats(self) -> None:
+        Ticket.objects.create(flight=self.flight, order=self.order, row=1, seat=2)
+        Ticket.objects.create(flight=self.flight, order=self.order, row=2, seat=1)
+
+        result = self.client.get(self.url)
+        bitmap = base64.b64decode(result.data["seats"])
+
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        self.assertEqual(result.data["rows"], 50)
+        self.assertEqual(result.data["seats_in_row"], 6)
+        self.assertEqual(result.data["tickets_available"], 298)
+        self.assertEqual(len(bitmap), 300 // 8 + 1)
+        self.assertEqual(bitmap[0], 0b01000010)
+
+    def test_seat_grid_cache_invalidated_by_tickets(self) -> None:
+        self.assertEqual(self.client.get(self.url).data["tickets_available"], 300)
+
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+        ticket = Ticket.objects.create(flight=self.flight, order=self.order, row=1, seat=1)
+        self.assertEqual(self.client.get(self.url).data["tickets_available"], 299)
+
+        ticket.delete()
+        self.assertEqual(self.client.get(self.url).data["tickets_available"], 300)
+
+    def test_seat_grid_unknown_flight(self) -> None:
+        result = self.client.get(reverse("airport:flight-seats", args=[0]))
+
+        self.assertEqual(result.status_code, status.HTTP_404_NOT_FOUND)
@@ -1,11 +1,15 @@
 from django.urls import path, include
 from rest_framework import routers
 
-from orders.views import OrderViewSet
+from orders.views import ExportView, OrderViewSet, SeatHoldViewSet
 
 router = routers.DefaultRouter()
 router.register("orders", OrderViewSet, basename="orders")
+router.register("holds", SeatHoldViewSet, basename="holds")
 
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [
+    path("", include(router.urls)),
+    path("export/<str:kind>/", ExportView.as_view(), name="export"),
+]
 
 app_name = "orders"
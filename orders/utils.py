@@ -0,0 +1,69 @@
+import base64
+import threading
+import time
+from collections import OrderedDict
+
+from django.db import transaction
+
+SEAT_GRID_CACHE_SIZE = 1024
+SEAT_GRID_CACHE_TTL = 5
+
+_seat_grids = OrderedDict()
+_seat_grids_lock = threading.Lock()
+
+
+def build_seat_grid(flight) -> dict:
+    """Encode occupancy of all flight seats as a base64 bitmap.
+
+    Bit ``(row - 1) * seats_in_row + (seat - 1)`` is set for sold seats,
+    most significant bit first.
+    """
+    rows, seats_in_row = flight.airplane.rows, flight.airplane.seats_in_row
+    capacity = rows * seats_in_row
+    bitmap = bytearray((capacity + 7) // 8)
+    sold = 0
+
+    seat_map = getattr(flight, "seat_map", None)
+    if seat_map is not None:
+        for row in range(1, rows + 1):
+            for seat in range(1, seats_in_row + 1):
+                if seat_map.is_occupied(row, seat):
+                    index = (row - 1) * seats_in_row + (seat - 1)
+                    bitmap[index >> 3] |= 0x80 >> (index & 7)
+                    sold += 1
+
+    return {
+        "flight": flight.id,
+        "rows": rows,
+        "seats_in_row": seats_in_row,
+        "tickets_available": capacity - sold,
+        "encoding": "bitmap",
+        "seats": base64.b64encode(bytes(bitmap)).decode(),
+    }
+
+
+def get_seat_grid(flight_id: int, load_flight) -> dict:
+    """Return the cached seat grid, calling load_flight() on a miss"""
+    now = time.monotonic()
+    with _seat_grids_lock:
+        cached = _seat_grids.get(flight_id)
+        if cached and cached[0] > now:
+            _seat_grids.move_to_end(flight_id)
+            return cached[1]
+
+    grid = build_seat_grid(load_flight())
+    with _seat_grids_lock:
+        _seat_grids[flight_id] = (now + SEAT_GRID_CACHE_TTL, grid)
+        _seat_grids.move_to_end(flight_id)
+        while len(_seat_grids) > SEAT_GRID_CACHE_SIZE:
+            _seat_grids.popitem(last=False)
+    return grid
+
+
+def invalidate_seat_grid(flight_id: int) -> None:
+    def invalidate() -> None:
+        with _seat_grids_lock:
+            _seat_grids.pop(flight_id, None)
+
+    invalidate()
+    transaction.on_commit(invalidate)
@@ -1,16 +1,43 @@
-from rest_framework import mixins
-from rest_framework.permissions import IsAuthenticated
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import mixins, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination
 from typing import Type
 from rest_framework.serializers import Serializer
+from rest_framework.views import APIView
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiParameter
 
-from orders.models import Order
-from orders.serializers import OrderSerializer, OrderListSerializer
+from airport.models import Flight
+from orders.exports import (
+    EXPORT_FIELDS,
+    EXPORT_FORMATS,
+    content_type,
+    export_queryset,
+    parse_bound,
+    stream_export,
+)
+from orders.models import Order, SeatHold
+from orders.serializers import (
+    OrderSerializer,
+    OrderListSerializer,
+    SeatHoldSerializer,
+    SeatHoldCreateSerializer,
+    SeatHoldConfirmSerializer,
+)
+from user.authentication import UserJWTAuthentication
 
 
-class OrderPagination(PageNumberPagination):
+class OrderPagination(CursorPagination):
+    ordering = ("-created_at", "id")
     page_size = 10
+    page_size_query_param = "page_size"
     max_page_size = 100
 
 
@@ -21,14 +48,22 @@ class OrderViewSet(
     GenericViewSet,
 ):
     queryset = Order.objects.prefetch_related(
-        "tickets__flight__route", "tickets__flight__airplane"
+        Prefetch(
+            "tickets__flight",
+            queryset=Flight.objects.select_related(
+                "route__source", "route__destination", "airplane"
+            ).with_tickets_available(),
+        )
     )
     serializer_class = OrderSerializer
     pagination_class = OrderPagination
     permission_classes = (IsAuthenticated,)
+    throttle_scope = {"create": "order_create", "default": "orders"}
+    # Orders and holds are saved with the User row
+    authentication_classes = (UserJWTAuthentication,)
 
     def get_queryset(self) -> Order:
-        return Order.objects.filter(user=self.request.user)
+        return super().get_queryset().filter(user=self.request.user)
 
     def get_serializer_class(self) -> Type[Serializer]:
         if self.action == "list":
@@ -38,3 +73,120 @@ class OrderViewSet(
 
     def perform_create(self, serializer) -> None:
         serializer.save(user=self.request.user)
+
+
+class SeatHoldViewSet(
+    mixins.ListModelMixin,
+    mixins.CreateModelMixin,
+    mixins.DestroyModelMixin,
+    GenericViewSet,
+):
+    serializer_class = SeatHoldSerializer
+    permission_classes = (IsAuthenticated,)
+    throttle_scope = {
+        "create": "seat_hold",
+        "confirm": "order_create",
+        "default": "orders",
+    }
+    # Orders and holds are saved with the User row
+    authentication_classes = (UserJWTAuthentication,)
+
+    def get_queryset(self) -> SeatHold:
+        return SeatHold.objects.filter(
+            user=self.request.user, expires_at__gt=timezone.now()
+        )
+
+    def get_serializer_class(self) -> Type[Serializer]:
+        if self.action == "create":
+            return SeatHoldCreateSerializer
+        if self.action == "confirm":
+            return SeatHoldConfirmSerializer
+
+        return self.serializer_class
+
+    def create(self, request, *args, **kwargs) -> Response:
+        """Hold seats of a flight for a few minutes"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        holds = serializer.save(user=request.user)
+        return Response(
+            SeatHoldSerializer(holds, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(methods=["POST"], detail=False, url_path="confirm")
+    def confirm(self, request) -> Response:
+        """Turn held seats into an order"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        order = serializer.save(user=request.user)
+        return Response(
+            OrderSerializer(order).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class ExportView(APIView):
+    """Stream all flights, tickets or orders for offline processing"""
+
+    permission_classes = (IsAdminUser,)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "export_format",
+                type=OpenApiTypes.STR,
+                enum=EXPORT_FORMATS,
+                description="ndjson (default) or a single json array",
+            ),
+            OpenApiParameter(
+                "date_from",
+                type=OpenApiTypes.STR,
+                description=(
+                    "Start date or datetime, inclusive "
+                    "(departure for flights and tickets, creation for orders)"
+                ),
+            ),
+            OpenApiParameter(
+                "date_to",
+                type=OpenApiTypes.STR,
+                description="End date (whole day included) or datetime, exclusive",
+            ),
+            OpenApiParameter(
+                "route",
+                type=OpenApiTypes.INT,
+                description="Only rows for flights of this route id",
+            ),
+        ],
+        responses={200: OpenApiTypes.BINARY},
+    )
+    def get(self, request, kind: str) -> StreamingHttpResponse:
+        if kind not in EXPORT_FIELDS:
+            raise NotFound(f"Unknown export {kind!r}.")
+
+        params = request.query_params
+        fmt = params.get("export_format", "ndjson")
+        if fmt not in EXPORT_FORMATS:
+            raise ValidationError({"export_format": "Expected ndjson or json."})
+
+        filters = {}
+        for param in ("date_from", "date_to"):
+            if params.get(param):
+                try:
+                    filters[param] = parse_bound(
+                        params[param], end=param == "date_to"
+                    )
+                except ValueError as error:
+                    raise ValidationError({param: str(error)})
+        if params.get("route"):
+            try:
+                filters["route"] = int(params["route"])
+            except ValueError:
+                raise ValidationError({"route": "Expected a route id."})
+
+        response = StreamingHttpResponse(
+            stream_export(export_queryset(kind, **filters), fmt),
+            content_type=content_type(fmt),
+        )
+        response["Content-Disposition"] = f'attachment; filename="{kind}.{fmt}"'
+        return response
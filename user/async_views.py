@@ -0,0 +1,119 @@
+"""Async login and registration for ASGI deployments.
+
+The DRF views hash passwords in a worker thread, which waits for the
+password hashing pool. These views await the pool instead, so the event
+loop keeps serving other requests while a burst of logins is hashed.
+They accept the same JSON or form data, answer like the DRF views and
+are throttled the same way.
+"""
+import json
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
+from django.http import HttpRequest, JsonResponse
+from rest_framework.settings import api_settings
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from user import passwords
+from user.serializers import TokenObtainPairSerializer, UserSerializer
+
+
+class PasswordView:
+    """Stands in for a DRF view to the throttles; counted as ``anon``"""
+
+    throttle_scope = None
+
+    @property
+    def throttle_classes(self) -> list:
+        # Read per request, so that changes of the setting apply
+        return api_settings.DEFAULT_THROTTLE_CLASSES
+
+
+def _error(detail, status: int) -> JsonResponse:
+    return JsonResponse(
+        {"detail": detail} if isinstance(detail, str) else detail, status=status
+    )
+
+
+def _throttle_wait(request: HttpRequest) -> float | None:
+    """Seconds to wait when a throttle denies the request, else None"""
+    view = PasswordView()
+    waits = [
+        throttle.wait()
+        for throttle in (cls() for cls in view.throttle_classes)
+        if not throttle.allow_request(request, view)
+    ]
+    if waits:
+        return max(wait or 0 for wait in waits)
+    return None
+
+
+def password_post(view):
+    """Accept throttled POST requests without CSRF checks, as DRF does"""
+
+    @wraps(view)
+    async def wrapper(request: HttpRequest) -> JsonResponse:
+        if request.method != "POST":
+            return _error(f'Method "{request.method}" not allowed.', 405)
+        wait = await sync_to_async(_throttle_wait)(request)
+        if wait is not None:
+            response = _error("Request was throttled.", 429)
+            response["Retry-After"] = str(round(wait))
+            return response
+        if request.content_type == "application/json":
+            try:
+                data = json.loads(request.body or b"{}")
+            except ValueError as error:
+                return _error(f"JSON parse error - {error}", 400)
+            if not isinstance(data, dict):
+                return _error("Expected a JSON object.", 400)
+        else:
+            data = request.POST
+        return await view(request, data)
+
+    wrapper.csrf_exempt = True
+    return wrapper
+
+
+@password_post
+async def obtain_token(request: HttpRequest, data) -> JsonResponse:
+    errors = {
+        field: ["This field is required."]
+        for field in ("email", "password")
+        if not data.get(field)
+    }
+    if errors:
+        return _error(errors, 400)
+
+    user = await get_user_model().objects.filter(email=data["email"]).afirst()
+    if user is None:
+        # Take as long as a wrong password
+        await passwords.amake_password(data["password"])
+    elif await user.acheck_password(data["password"]) and user.is_active:
+        refresh = await sync_to_async(TokenObtainPairSerializer.get_token)(user)
+        if jwt_settings.UPDATE_LAST_LOGIN:
+            await sync_to_async(update_last_login)(None, user)
+        return JsonResponse(
+            {"refresh": str(refresh), "access": str(refresh.access_token)}
+        )
+    return _error("No active account found with the given credentials", 401)
+
+
+@password_post
+async def register(request: HttpRequest, data) -> JsonResponse:
+    serializer = UserSerializer(data=data)
+    # Validation checks that the email is not taken
+    if not await sync_to_async(serializer.is_valid)():
+        return _error(serializer.errors, 400)
+
+    fields = dict(serializer.validated_data)
+    password = fields.pop("password")
+    user = get_user_model()(
+        email=get_user_model().objects.normalize_email(fields.pop("email")),
+        **fields,
+    )
+    user.password = await passwords.amake_password(password)
+    await user.asave()
+    return JsonResponse(UserSerializer(user).data, status=201)
@@ -0,0 +1,34 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from user.tokens import STAFF_CLAIM, VERSION_CLAIM, is_current
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """Authenticate JWTs without loading the user from the database.
+
+    Tokens obtained from ``/api/user/token/`` carry ``is_staff`` and the
+    token version, so the request user is a ``TokenUser`` built from the
+    claims once the cached version confirms the token was not revoked.
+    Views that need the ``User`` row use ``UserJWTAuthentication`` instead.
+    Tokens without these claims are checked against the database.
+    """
+
+    def get_user(self, validated_token):
+        if STAFF_CLAIM not in validated_token or VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken("Token contained no recognizable user identification")
+        if not is_current(validated_token):
+            raise InvalidToken("Token has been revoked")
+        return api_settings.TOKEN_USER_CLASS(validated_token)
+
+
+class UserJWTAuthentication(JWTAuthentication):
+    """Authenticate JWTs with the ``User`` row, rejecting revoked tokens"""
+
+    def get_user(self, validated_token):
+        if VERSION_CLAIM in validated_token and not is_current(validated_token):
+            raise InvalidToken("Token has been revoked")
+        return super().get_user(validated_token)
@@ -0,0 +1,116 @@
+import asyncio
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.views import TokenObtainPairView
+
+from airport.benchmark import PREFIX, without_throttling
+from user.async_views import PasswordView
+
+PASSWORD = "benchmark-password"
+
+
+def _summary(timings: list[float], seconds: float) -> str:
+    timings.sort()
+    return (
+        f"{len(timings) / seconds:8.1f} logins/s  "
+        f"p50 {statistics.median(timings):8.2f} ms  "
+        f"p95 {timings[int(len(timings) * 0.95)]:8.2f} ms"
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure login throughput of the sync (WSGI) and async (ASGI) token "
+        "endpoints for each size of the password hashing pool, with "
+        "--concurrency clients logging in at once. Uses the hasher selected "
+        "by PASSWORD_HASHER; run again with another one to compare. Writes "
+        "to the configured database; use a server database or a sqlite "
+        "file, as in-memory sqlite is not shared between threads."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            nargs="+",
+            default=sorted({1, 2, 4, os.cpu_count() or 1}),
+            help="Sizes of the password hashing pool",
+        )
+
+    def run_wsgi(self, email: str, options: dict) -> str:
+        url = reverse("user:obtain_token")
+
+        def client_loop(worker: int) -> list[float]:
+            client = Client()
+            timings = []
+            for _ in range(worker, options["requests"], options["concurrency"]):
+                started = time.perf_counter()
+                response = client.post(url, {"email": email, "password": PASSWORD})
+                timings.append((time.perf_counter() - started) * 1000)
+                assert response.status_code == 200, response.content
+            close_old_connections()
+            return timings
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            results = pool.map(client_loop, range(options["concurrency"]))
+            timings = [timing for result in results for timing in result]
+        return _summary(timings, time.perf_counter() - started)
+
+    def run_asgi(self, email: str, options: dict) -> str:
+        url = reverse("user:async_obtain_token")
+
+        async def client_loop(worker: int) -> list[float]:
+            client = AsyncClient()
+            timings = []
+            for _ in range(worker, options["requests"], options["concurrency"]):
+                started = time.perf_counter()
+                response = await client.post(
+                    url, {"email": email, "password": PASSWORD}
+                )
+                timings.append((time.perf_counter() - started) * 1000)
+                assert response.status_code == 200, response.content
+            return timings
+
+        async def run() -> list[list[float]]:
+            return await asyncio.gather(
+                *(client_loop(worker) for worker in range(options["concurrency"]))
+            )
+
+        started = time.perf_counter()
+        timings = [timing for result in asyncio.run(run()) for timing in result]
+        return _summary(timings, time.perf_counter() - started)
+
+    def handle(self, *args, **options) -> None:
+        email = f"{PREFIX}login@example.com"
+        get_user_model().objects.filter(email=email).delete()
+        user = get_user_model().objects.create_user(email=email, password=PASSWORD)
+        self.stdout.write(
+            f"{get_hasher().algorithm}, {options['concurrency']} concurrent clients"
+        )
+
+        try:
+            with without_throttling(
+                (TokenObtainPairView, PasswordView)
+            ), override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+                for workers in options["workers"]:
+                    with override_settings(PASSWORD_HASHING_WORKERS=workers):
+                        self.stdout.write(
+                            self.style.MIGRATE_HEADING(f"{workers} hashing workers")
+                        )
+                        self.stdout.write("  wsgi  " + self.run_wsgi(email, options))
+                        self.stdout.write("  asgi  " + self.run_asgi(email, options))
+        finally:
+            user.delete()
@@ -2,9 +2,12 @@ from django.contrib.auth.models import (
     AbstractUser,
     BaseUserManager,
 )
+from django.conf import settings
 from django.db import models
 from django.utils.translation import gettext as _
 
+from user import passwords
+
 
 class UserManager(BaseUserManager):
     """Define a model manager for User model with no username field."""
@@ -48,3 +51,42 @@ class User(AbstractUser):
     REQUIRED_FIELDS = []
 
     objects = UserManager()
+
+    def set_password(self, raw_password) -> None:
+        """Hash the password in the password hashing pool"""
+        self.password = passwords.make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password) -> bool:
+        """Check the password in the password hashing pool.
+
+        Outdated hashes are replaced with an update rather than a save:
+        the password stays the same, so the issued tokens stay valid.
+        """
+        correct, outdated = passwords.check_password(raw_password, self.password)
+        if outdated:
+            self.password = passwords.make_password(raw_password)
+            type(self).objects.filter(pk=self.pk).update(password=self.password)
+        return correct
+
+    async def acheck_password(self, raw_password) -> bool:
+        correct, outdated = await passwords.acheck_password(raw_password, self.password)
+        if outdated:
+            self.password = await passwords.amake_password(raw_password)
+            await type(self).objects.filter(pk=self.pk).aupdate(password=self.password)
+        return correct
+
+
+class TokenVersion(models.Model):
+    """Version of the JWTs of a user; bumping it revokes all issued tokens"""
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="token_version",
+    )
+    version = models.PositiveIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"Token version of user {self.user_id}: {self.version}"
@@ -0,0 +1,76 @@
+"""Password hashing in a bounded pool of threads.
+
+Hashing a password is slow on purpose. During a burst of logins, for
+example when many access tokens expire together, every worker thread
+would hash at once and keep all cores busy, so other requests wait.
+Instead the hashing of each process runs in one pool of
+``settings.PASSWORD_HASHING_WORKERS`` threads, which bounds how many
+passwords are hashed at once. PBKDF2 and scrypt from hashlib and
+argon2-cffi release the GIL while hashing, so the threads hash in
+parallel. Async views await the pool without blocking the event loop.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+_executor = None
+_lock = threading.Lock()
+
+
+def hashing_workers() -> int:
+    return getattr(settings, "PASSWORD_HASHING_WORKERS", None) or os.cpu_count() or 1
+
+
+def executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=hashing_workers(),
+                    thread_name_prefix="password-hashing",
+                )
+    return _executor
+
+
+@receiver(setting_changed)
+def reset_executor(*, setting, **kwargs) -> None:
+    global _executor
+    if setting == "PASSWORD_HASHING_WORKERS":
+        with _lock:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = None
+
+
+def _check(password, encoded) -> tuple[bool, bool]:
+    outdated = []
+    correct = hashers.check_password(password, encoded, setter=outdated.append)
+    return correct, bool(outdated)
+
+
+def make_password(password) -> str:
+    return executor().submit(hashers.make_password, password).result()
+
+
+def check_password(password, encoded) -> tuple[bool, bool]:
+    """Whether the password matches, and whether to rehash it.
+
+    A correct password is rehashed when it was hashed by another than
+    the preferred hasher or with other parameters.
+    """
+    return executor().submit(_check, password, encoded).result()
+
+
+async def amake_password(password) -> str:
+    return await asyncio.wrap_future(executor().submit(hashers.make_password, password))
+
+
+async def acheck_password(password, encoded) -> tuple[bool, bool]:
+    return await asyncio.wrap_future(executor().submit(_check, password, encoded))
@@ -1,5 +1,10 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from user.tokens import VERSION_CLAIM, add_claims, is_current
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -22,3 +27,18 @@ class UserSerializer(serializers.ModelSerializer):
             user.save()
 
         return user
+
+
+class TokenObtainPairSerializer(jwt_serializers.TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user) -> RefreshToken:
+        """Add the claims checked by StatelessJWTAuthentication"""
+        return add_claims(super().get_token(user), user)
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    def validate(self, attrs) -> dict:
+        refresh = self.token_class(attrs["refresh"])
+        if VERSION_CLAIM in refresh and not is_current(refresh):
+            raise InvalidToken("Token has been revoked")
+        return super().validate(attrs)
@@ -0,0 +1,33 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from user.tokens import forget_token_version, revoke_tokens
+
+# Changes to these fields invalidate the tokens issued before
+TOKEN_FIELDS = ("password", "is_active", "is_staff", "is_superuser")
+
+
+@receiver(pre_save, sender=get_user_model())
+def remember_token_fields(sender, instance, update_fields=None, **kwargs) -> None:
+    instance._previous_token_fields = None
+    if update_fields is not None and not set(update_fields) & set(TOKEN_FIELDS):
+        # Such as the last_login update on every login
+        return
+    if instance.pk:
+        instance._previous_token_fields = (
+            sender.objects.filter(pk=instance.pk).values_list(*TOKEN_FIELDS).first()
+        )
+
+
+@receiver(post_save, sender=get_user_model())
+def revoke_tokens_on_change(sender, instance, created, **kwargs) -> None:
+    previous = getattr(instance, "_previous_token_fields", None)
+    current = tuple(getattr(instance, field) for field in TOKEN_FIELDS)
+    if previous is not None and previous != current:
+        revoke_tokens(instance.pk)
+
+
+@receiver(post_delete, sender=get_user_model())
+def forget_deleted_user(sender, instance, **kwargs) -> None:
+    forget_token_version(instance.pk)
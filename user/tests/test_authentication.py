@@ -0,0 +1,149 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airport.caching import response_cache
+from user.tokens import STAFF_CLAIM, VERSION_CLAIM, is_current, revoke_tokens
+
+TOKEN_URL = reverse("user:obtain_token")
+REFRESH_URL = reverse("user:refresh_token")
+ME_URL = reverse("user:manage")
+AIRPORT_URL = reverse("airport:airport-list")
+ORDER_URL = reverse("orders:orders-list")
+SEAT_HOLD_URL = reverse("orders:holds-list")
+
+
+class StatelessJWTAuthenticationTests(TestCase):
+    def setUp(self) -> None:
+        caches["default"].clear()
+        caches["shared"].clear()
+        caches["throttle"].clear()
+        response_cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="testpass",
+        )
+
+    def login(self) -> dict:
+        response = self.client.post(
+            TOKEN_URL, {"email": "user@user.com", "password": "testpass"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def use(self, access: str) -> None:
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+    def test_tokens_carry_staff_flag_and_version(self) -> None:
+        tokens = self.login()
+        access = AccessToken(tokens["access"])
+
+        self.assertIs(access[STAFF_CLAIM], False)
+        self.assertEqual(access[VERSION_CLAIM], 0)
+
+    def test_cached_version_avoids_the_user_query(self) -> None:
+        self.use(self.login()["access"])
+        self.client.get(AIRPORT_URL)
+        response_cache.clear()
+
+        with self.assertNumQueries(1):
+            # Only the airports
+            response = self.client.get(AIRPORT_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_password_change_revokes_tokens(self) -> None:
+        tokens = self.login()
+        self.use(tokens["access"])
+
+        response = self.client.patch(ME_URL, {"password": "newpass"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        for url in (AIRPORT_URL, ME_URL, ORDER_URL, SEAT_HOLD_URL):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED, url)
+        response = self.client.post(REFRESH_URL, {"refresh": tokens["refresh"]})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.credentials()
+        response = self.client.post(
+            TOKEN_URL, {"email": "user@user.com", "password": "newpass"}
+        )
+        self.use(response.data["access"])
+        self.assertEqual(self.client.get(AIRPORT_URL).status_code, status.HTTP_200_OK)
+
+    def test_staff_change_revokes_tokens(self) -> None:
+        self.use(self.login()["access"])
+        self.assertEqual(self.client.get(AIRPORT_URL).status_code, status.HTTP_200_OK)
+
+        self.user.is_staff = True
+        self.user.save()
+
+        for url in (AIRPORT_URL, ME_URL, ORDER_URL):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED, url)
+
+    def test_revocation_reaches_a_cold_cache(self) -> None:
+        access = AccessToken(self.login()["access"])
+        self.assertTrue(is_current(access))
+
+        revoke_tokens(self.user.pk)
+
+        # The cache of another process, which has not read the version yet
+        other = caches.create_connection(settings.TOKEN_VERSION_CACHE)
+        with mock.patch("user.tokens._cache", return_value=other):
+            self.assertFalse(is_current(access))
+        self.assertIsNone(caches["default"].get(f"token-version:{self.user.pk}"))
+
+    def test_login_keeps_tokens_valid(self) -> None:
+        self.use(self.login()["access"])
+        self.login()
+
+        self.assertEqual(self.client.get(AIRPORT_URL).status_code, status.HTTP_200_OK)
+
+    def test_inactive_and_deleted_users_are_rejected(self) -> None:
+        self.use(self.login()["access"])
+        self.assertEqual(self.client.get(AIRPORT_URL).status_code, status.HTTP_200_OK)
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(AIRPORT_URL)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.user.is_active = True
+        self.user.save()
+        self.use(self.login()["access"])
+        self.user.delete()
+        response = self.client.get(AIRPORT_URL)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_refresh_keeps_the_claims(self) -> None:
+        response = self.client.post(REFRESH_URL, {"refresh": self.login()["refresh"]})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(AccessToken(response.data["access"])[VERSION_CLAIM], 0)
+
+    def test_views_needing_the_user_row(self) -> None:
+        self.use(self.login()["access"])
+
+        response = self.client.get(ME_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["email"], "user@user.com")
+        self.assertEqual(self.client.get(ORDER_URL).status_code, status.HTTP_200_OK)
+
+    def test_tokens_without_claims_load_the_user(self) -> None:
+        self.use(str(AccessToken.for_user(self.user)))
+        self.assertEqual(self.client.get(AIRPORT_URL).status_code, status.HTTP_200_OK)
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(AIRPORT_URL)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,147 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.core.cache import caches
+from django.test import AsyncClient, Client, TestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from user import passwords
+from user.tokens import VERSION_CLAIM, token_version
+
+ASYNC_TOKEN_URL = reverse("user:async_obtain_token")
+ASYNC_REGISTER_URL = reverse("user:async_create_user")
+TOKEN_URL = reverse("user:obtain_token")
+
+SCRYPT_FIRST = [
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+]
+
+
+class PasswordHashingTests(TestCase):
+    def setUp(self) -> None:
+        caches["default"].clear()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="testpass",
+        )
+
+    def test_pool_size_follows_the_setting(self) -> None:
+        with override_settings(PASSWORD_HASHING_WORKERS=2):
+            self.assertEqual(passwords.executor()._max_workers, 2)
+        self.assertEqual(passwords.executor()._max_workers, passwords.hashing_workers())
+
+    def test_check_password(self) -> None:
+        self.assertTrue(self.user.check_password("testpass"))
+        self.assertFalse(self.user.check_password("wrongpass"))
+
+    @override_settings(PASSWORD_HASHERS=SCRYPT_FIRST)
+    def test_preferred_hasher_hashes_new_passwords(self) -> None:
+        self.user.set_password("newpass")
+
+        self.assertTrue(self.user.password.startswith("scrypt$"))
+        self.assertTrue(self.user.check_password("newpass"))
+
+    @override_settings(PASSWORD_HASHERS=SCRYPT_FIRST)
+    def test_outdated_hash_is_upgraded_without_revoking_tokens(self) -> None:
+        version = token_version(self.user.pk)
+
+        self.assertTrue(self.user.check_password("testpass"))
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("scrypt$"))
+        self.assertTrue(self.user.check_password("testpass"))
+        self.assertEqual(token_version(self.user.pk), version)
+
+
+class AsyncPasswordViewTests(TestCase):
+    def setUp(self) -> None:
+        caches["default"].clear()
+        caches["throttle"].clear()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="testpass",
+        )
+        self.async_client = AsyncClient(enforce_csrf_checks=True)
+
+    async def login(self, email: str, password: str):
+        return await self.async_client.post(
+            ASYNC_TOKEN_URL,
+            {"email": email, "password": password},
+            content_type="application/json",
+        )
+
+    async def test_obtain_token(self) -> None:
+        response = await self.login("user@user.com", "testpass")
+
+        self.assertEqual(response.status_code, 200)
+        access = AccessToken(response.json()["access"])
+        self.assertEqual(access["user_id"], self.user.pk)
+        self.assertEqual(access[VERSION_CLAIM], 0)
+
+    async def test_obtain_token_rejects_wrong_credentials(self) -> None:
+        for email, password in (
+            ("user@user.com", "wrongpass"),
+            ("nobody@user.com", "testpass"),
+        ):
+            response = await self.login(email, password)
+            self.assertEqual(response.status_code, 401)
+
+        response = await self.async_client.post(ASYNC_TOKEN_URL, {"email": ""})
+        self.assertEqual(set(response.json()), {"email", "password"})
+        response = await self.async_client.get(ASYNC_TOKEN_URL)
+        self.assertEqual(response.status_code, 405)
+
+    async def test_answers_like_the_drf_view(self) -> None:
+        credentials = {"email": "user@user.com", "password": "wrongpass"}
+        expected = await sync_to_async(Client().post)(TOKEN_URL, credentials)
+
+        response = await self.async_client.post(ASYNC_TOKEN_URL, credentials)
+
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.json(), expected.json())
+
+    async def test_register(self) -> None:
+        response = await self.async_client.post(
+            ASYNC_REGISTER_URL,
+            {"email": "new@USER.com", "password": "newpass"},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["email"], "new@user.com")
+        user = await get_user_model().objects.aget(email="new@user.com")
+        self.assertTrue(await user.acheck_password("newpass"))
+
+        response = await self.async_client.post(
+            ASYNC_REGISTER_URL, {"email": "new@user.com", "password": "newpass"}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("email", response.json())
+
+    @override_settings(
+        REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {"anon": "1/minute"},
+        }
+    )
+    async def test_throttled_as_anonymous_requests(self) -> None:
+        await self.login("user@user.com", "wrongpass")
+        response = await self.login("user@user.com", "testpass")
+
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+
+    @override_settings(
+        REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_CLASSES": [],
+            "DEFAULT_THROTTLE_RATES": {"anon": "1/minute"},
+        }
+    )
+    async def test_throttle_classes_follow_the_setting(self) -> None:
+        await self.login("user@user.com", "wrongpass")
+        response = await self.login("user@user.com", "testpass")
+
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,77 @@
+"""Token versions backing the stateless JWT authentication.
+
+Access and refresh tokens carry the user's ``is_staff`` flag and token
+version as claims. A token is accepted while its version matches the
+user's current one, which is cached for
+``settings.TOKEN_VERSION_CACHE_TIMEOUT`` seconds in the
+``settings.TOKEN_VERSION_CACHE`` cache. ``revoke_tokens`` bumps the
+version, invalidating every token issued so far. The cache must be
+shared by all processes, or the others accept revoked tokens, including
+their ``is_staff`` claim, until their cached version expires.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+from rest_framework_simplejwt.settings import api_settings
+
+from user.models import TokenVersion
+
+STAFF_CLAIM = "is_staff"
+VERSION_CLAIM = "ver"
+
+# Cached for users that do not exist or are inactive
+NO_USER = -1
+
+
+def _cache():
+    return caches[getattr(settings, "TOKEN_VERSION_CACHE", "default")]
+
+
+def _key(user_id) -> str:
+    return f"token-version:{user_id}"
+
+
+def token_version(user_id) -> int | None:
+    """Current token version of an active user, None for other users"""
+    version = _cache().get(_key(user_id))
+    if version is None:
+        row = (
+            get_user_model()
+            .objects.filter(pk=user_id, is_active=True)
+            .values_list("token_version__version")
+            .first()
+        )
+        version = NO_USER if row is None else row[0] or 0
+        _cache().set(
+            _key(user_id),
+            version,
+            timeout=getattr(settings, "TOKEN_VERSION_CACHE_TIMEOUT", 60),
+        )
+    return None if version == NO_USER else version
+
+
+def forget_token_version(user_id) -> None:
+    """Drop the cached version, now and once the transaction commits"""
+    _cache().delete(_key(user_id))
+    transaction.on_commit(lambda: _cache().delete(_key(user_id)))
+
+
+def revoke_tokens(user_id) -> None:
+    """Invalidate every token issued to the user so far"""
+    TokenVersion.objects.get_or_create(user_id=user_id)
+    TokenVersion.objects.filter(user_id=user_id).update(version=F("version") + 1)
+    forget_token_version(user_id)
+
+
+def add_claims(token, user):
+    token[STAFF_CLAIM] = user.is_staff
+    token[VERSION_CLAIM] = token_version(user.pk) or 0
+    return token
+
+
+def is_current(token) -> bool:
+    """Whether the token was issued to an active user since the last revocation"""
+    version = token_version(token[api_settings.USER_ID_CLAIM])
+    return version is not None and token[VERSION_CLAIM] == version
@@ -1,6 +1,7 @@
 from django.urls import path
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView, TokenVerifyView
 
+from user import async_views
 from user.views import CreateUserView, ManageUserView
 
 urlpatterns = [
@@ -9,6 +10,8 @@ urlpatterns = [
     path("token/refresh/", TokenRefreshView.as_view(), name="refresh_token"),
     path("token/verify/", TokenVerifyView.as_view(), name="verify_token"),
     path("me/", ManageUserView.as_view(), name="manage"),
+    path("async/register/", async_views.register, name="async_create_user"),
+    path("async/token/", async_views.obtain_token, name="async_obtain_token"),
 ]
 
 app_name = "user"
@@ -1,7 +1,7 @@
 from rest_framework import generics
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
+from user.authentication import UserJWTAuthentication
 from user.serializers import UserSerializer
 
 
@@ -11,7 +11,8 @@ class CreateUserView(generics.CreateAPIView):
 
 class ManageUserView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
-    authentication_classes = (TokenAuthentication,)
+    # Needs the User row rather than the user built from the token
+    authentication_classes = (UserJWTAuthentication,)
     permission_classes = (IsAuthenticated,)
 
     def get_object(self):